@@ -0,0 +1,4 @@
+"""
+Benchmark suite for the 'DCM Preparation Module' (not part of the
+distributed package).
+"""
@@ -0,0 +1,217 @@
+"""
+Performance regression gate for the 'DCM Preparation Module'.
+
+Compares benchmark results (as written by `benchmarks.run`) against a
+stored baseline. Run as
+    python -m benchmarks.compare results.json
+"""
+
+from typing import Optional
+from dataclasses import dataclass
+from pathlib import Path
+from fnmatch import fnmatch
+import argparse
+import json
+import sys
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.2
+
+# gated metrics as pairs of (benchmark-pattern, metric) and whether
+# larger values are better
+GATED_METRICS = {
+    ("import", "import_seconds"): False,
+    ("prepare/*", "throughput_bytes_per_second"): True,
+    ("prepare/*", "copy_throughput_bytes_per_second"): True,
+    ("prepare/*", "manifest_seconds"): False,
+    ("prepare/*", "peak_memory_bytes"): False,
+    ("metadata_operator/*", "operations_per_second"): True,
+    ("metadata_operator/*", "peak_memory_bytes"): False,
+}
+
+
+@dataclass
+class Comparison:
+    """
+    Result of comparing a single metric.
+
+    Keyword arguments:
+    benchmark -- benchmark identifier
+    metric -- metric name
+    baseline -- baseline value
+    current -- current value
+    change -- relative change (positive values indicate improvement)
+    tolerance -- accepted relative regression
+    """
+
+    benchmark: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    tolerance: float
+
+    @property
+    def regression(self) -> bool:
+        """Returns `True` if the change exceeds the tolerance."""
+        return self.change < -self.tolerance
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    tolerance: float = DEFAULT_TOLERANCE,
+    tolerances: Optional[dict[str, float]] = None,
+) -> tuple[list[Comparison], list[str]]:
+    """
+    Compares `results` with `baseline`. Returns a list of
+    `Comparison`s and a list of gated metrics that are missing in
+    either `results` or `baseline`.
+
+    Benchmarks that match one of the patterns listed in the baseline's
+    `ungated` (i.e., for which no baseline has been recorded yet) are
+    excluded from the gate.
+
+    Keyword arguments:
+    results -- current benchmark results
+    baseline -- baseline results
+    tolerance -- default accepted relative regression
+                 (default `DEFAULT_TOLERANCE`)
+    tolerances -- tolerances per metric name; overrides `tolerance`
+                  (default None)
+    """
+    tolerances = (baseline.get("tolerances") or {}) | (tolerances or {})
+    reference_results = baseline.get("results", {})
+    current_results = results.get("results", {})
+    ungated = baseline.get("ungated") or []
+    comparisons = []
+    missing = []
+    for benchmark in sorted(set(reference_results) | set(current_results)):
+        if any(fnmatch(benchmark, pattern) for pattern in ungated):
+            continue
+        for (pattern, metric), larger_is_better in GATED_METRICS.items():
+            if not fnmatch(benchmark, pattern):
+                continue
+            reference = reference_results.get(benchmark, {}).get(metric)
+            current = current_results.get(benchmark, {}).get(metric)
+            if reference is None and current is None:
+                continue
+            if reference is None or current is None:
+                missing.append(f"{benchmark}:{metric}")
+                continue
+            if reference == 0:
+                continue
+            change = (current - reference) / reference
+            comparisons.append(
+                Comparison(
+                    benchmark,
+                    metric,
+                    reference,
+                    current,
+                    change if larger_is_better else -change,
+                    tolerances.get(metric, tolerance),
+                )
+            )
+    return comparisons, missing
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Entry point for the regression gate. Returns 1 if any metric
+    regressed beyond its tolerance or if a gated metric is missing in
+    either results or baseline.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare benchmark results against a baseline."
+    )
+    parser.add_argument("results", type=Path, help="benchmark results")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help=f"baseline results (default: {DEFAULT_BASELINE})",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="accepted relative regression (default: "
+        + f"{DEFAULT_TOLERANCE})",
+    )
+    parser.add_argument(
+        "--metric-tolerance",
+        action="append",
+        default=[],
+        metavar="METRIC=TOLERANCE",
+        help="accepted relative regression for individual metrics",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="replace baseline with the given results instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    results = json.loads(args.results.read_text(encoding="utf-8"))
+    if args.update_baseline:
+        baseline = (
+            json.loads(args.baseline.read_text(encoding="utf-8"))
+            if args.baseline.is_file()
+            else {}
+        )
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "metadata": results.get("metadata"),
+                    "tolerances": baseline.get("tolerances", {}),
+                    "results": results.get("results", {}),
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        print(f"Updated baseline '{args.baseline}'.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    comparisons, missing = compare(
+        results,
+        baseline,
+        args.tolerance,
+        {
+            metric: float(value)
+            for metric, value in (
+                item.split("=", 1) for item in args.metric_tolerance
+            )
+        },
+    )
+    for comparison in comparisons:
+        print(
+            ("REGRESSION " if comparison.regression else "ok         ")
+            + f"{comparison.benchmark}:{comparison.metric} "
+            + f"baseline={comparison.baseline:.6g} "
+            + f"current={comparison.current:.6g} "
+            + f"change={comparison.change:+.1%} "
+            + f"(tolerance {comparison.tolerance:.0%})"
+        )
+    for item in missing:
+        print(f"MISSING    {item}")
+    for pattern in baseline.get("ungated") or []:
+        print(f"UNGATED    {pattern} (no baseline recorded)")
+    regressions = sum(comparison.regression for comparison in comparisons)
+    print(
+        f"{len(comparisons)} metric(s) compared, {regressions} regression(s), "
+        + f"{len(missing)} missing"
+    )
+    if missing:
+        print(
+            "Gated metrics are missing; run all benchmarks or record the "
+            + "baseline on the reference machine with '--update-baseline'."
+        )
+    return 1 if regressions or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Generator for synthetic BagIt-IPs of configurable shape.
+"""
+
+from typing import Optional
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from datetime import datetime
+import hashlib
+import os
+
+
+ALGORITHMS = ("sha256", "sha512")
+SIGPROP_TYPES = ("content", "context", "appearance", "behavior", "structure")
+
+
+@dataclass
+class IPShape:
+    """
+    Shape of a synthetic IP.
+
+    Keyword arguments:
+    files -- number of payload files
+    file_size -- size of individual payload files in bytes
+    depth -- directory depth of payload files below 'data/'
+    fanout -- number of subdirectories per directory level
+    baginfo_fields -- number of additional bag-info fields
+    baginfo_values -- number of values per additional bag-info field
+    sigprop_entries -- number of significant properties in
+                       'meta/significant_properties.xml'
+    """
+
+    files: int = 10
+    file_size: int = 1024
+    depth: int = 1
+    fanout: int = 2
+    baginfo_fields: int = 5
+    baginfo_values: int = 1
+    sigprop_entries: int = 5
+
+    @property
+    def payload_bytes(self) -> int:
+        """Returns the total size of the payload in bytes."""
+        return self.files * self.file_size
+
+    @property
+    def json(self) -> dict:
+        """Returns shape as dictionary."""
+        return asdict(self)
+
+
+SHAPES = {
+    "many-tiny-files": IPShape(files=5000, file_size=512, depth=2, fanout=8),
+    "few-huge-files": IPShape(files=3, file_size=256 * 1024 * 1024),
+    "deep-tree": IPShape(files=500, file_size=4096, depth=12, fanout=1),
+    "large-baginfo": IPShape(baginfo_fields=2000, baginfo_values=5),
+    "large-premis": IPShape(sigprop_entries=20000),
+    "smoke": IPShape(files=20, file_size=4096, depth=2),
+}
+
+
+def _hash_file(path: Path, algorithms=ALGORITHMS) -> dict[str, str]:
+    """Returns digests of file at `path` for `algorithms`."""
+    hashes = {alg: hashlib.new(alg) for alg in algorithms}
+    with open(path, "rb") as file:
+        while chunk := file.read(1024 * 1024):
+            for hash_ in hashes.values():
+                hash_.update(chunk)
+    return {alg: hash_.hexdigest() for alg, hash_ in hashes.items()}
+
+
+def _write_payload_file(path: Path, size: int, seed: int) -> None:
+    """Writes file with pseudo-random contents of `size` bytes."""
+    block = hashlib.sha512(str(seed).encode()).digest() * 1024
+    with open(path, "wb") as file:
+        remaining = size
+        while remaining > 0:
+            file.write(block[: min(remaining, len(block))])
+            remaining -= len(block)
+
+
+def _payload_dir(index: int, shape: IPShape) -> Path:
+    """Returns the (relative) directory of payload file `index`."""
+    parts = []
+    value = index
+    for level in range(shape.depth):
+        parts.append(f"d{level}_{value % max(shape.fanout, 1)}")
+        value //= max(shape.fanout, 1)
+    return Path("data", *parts)
+
+
+def generate_ip(
+    path: Path, shape: IPShape, algorithms: Optional[tuple[str]] = None
+) -> Path:
+    """
+    Generates a synthetic BagIt-IP of `shape` at `path` and returns
+    `path`.
+
+    Keyword arguments:
+    path -- target directory (must not exist)
+    shape -- `IPShape` of the generated IP
+    algorithms -- checksum algorithms for manifests
+                  (default `ALGORITHMS`)
+    """
+    algorithms = algorithms or ALGORITHMS
+    path.mkdir(parents=True)
+
+    # payload
+    manifests = {alg: [] for alg in algorithms}
+    for index in range(shape.files):
+        directory = path / _payload_dir(index, shape)
+        directory.mkdir(parents=True, exist_ok=True)
+        file = directory / f"file_{index}.bin"
+        _write_payload_file(file, shape.file_size, index)
+        for alg, digest in _hash_file(file, algorithms).items():
+            manifests[alg].append(
+                f"{digest}  {file.relative_to(path).as_posix()}"
+            )
+    for alg, lines in manifests.items():
+        (path / f"manifest-{alg}.txt").write_text(
+            "\n".join(lines) + "\n", encoding="utf-8"
+        )
+
+    # tag files
+    (path / "bagit.txt").write_text(
+        "BagIt-Version: 1.0\nTag-File-Character-Encoding: UTF-8\n",
+        encoding="utf-8",
+    )
+    baginfo = [
+        f"Bagging-DateTime: {datetime.now().astimezone().isoformat()}",
+        f"Payload-Oxum: {shape.payload_bytes}.{shape.files}",
+        "Source-Organization: https://d-nb.info/gnd/2047974-8",
+    ]
+    for field in range(shape.baginfo_fields):
+        for value in range(shape.baginfo_values):
+            baginfo.append(f"Field-{field}: value {field}-{value}")
+    (path / "bag-info.txt").write_text(
+        "\n".join(baginfo) + "\n", encoding="utf-8"
+    )
+    (path / "meta").mkdir()
+    (path / "meta" / "significant_properties.xml").write_text(
+        '<premis:premis xmlns:premis="http://www.loc.gov/premis/v3" '
+        + 'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        + 'version="3.0">\n'
+        + '  <premis:object xsi:type="premis:intellectualEntity">\n'
+        + "".join(
+            "    <premis:significantProperties>\n"
+            + "      <premis:significantPropertiesType>"
+            + f"{SIGPROP_TYPES[i % len(SIGPROP_TYPES)]}"
+            + "</premis:significantPropertiesType>\n"
+            + "      <premis:significantPropertiesValue>"
+            + f"value {i}"
+            + "</premis:significantPropertiesValue>\n"
+            + "    </premis:significantProperties>\n"
+            for i in range(shape.sigprop_entries)
+        )
+        + "  </premis:object>\n"
+        + "</premis:premis>\n",
+        encoding="utf-8",
+    )
+
+    # tag manifests
+    tag_files = [
+        file
+        for file in sorted(path.glob("**/*"))
+        if file.is_file()
+        and file.relative_to(path).parts[0] != "data"
+        and not file.name.startswith("tagmanifest-")
+    ]
+    for alg in algorithms:
+        (path / f"tagmanifest-{alg}.txt").write_text(
+            "\n".join(
+                f"{_hash_file(file, (alg,))[alg]}  "
+                + file.relative_to(path).as_posix()
+                for file in tag_files
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+    return path
+
+
+def count_files(path: Path) -> tuple[int, int]:
+    """Returns number of files and total bytes below `path`."""
+    files = 0
+    size = 0
+    for root, _, filenames in os.walk(path):
+        for filename in filenames:
+            files += 1
+            size += os.path.getsize(os.path.join(root, filename))
+    return files, size
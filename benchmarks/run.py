@@ -0,0 +1,357 @@
+"""
+Benchmark runner for the 'DCM Preparation Module'.
+
+Run as
+    python -m benchmarks.run --shapes smoke --output results.json
+"""
+
+from typing import Callable, Optional
+from pathlib import Path
+from time import perf_counter
+from datetime import datetime
+from importlib.metadata import version, PackageNotFoundError
+from shutil import rmtree
+import argparse
+import json
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks.generator import (
+    SHAPES,
+    SIGPROP_TYPES,
+    IPShape,
+    generate_ip,
+    count_files,
+)
+
+
+def _time(function: Callable[[], None]) -> float:
+    """Runs `function` and returns elapsed time in seconds."""
+    time0 = perf_counter()
+    function()
+    return perf_counter() - time0
+
+
+def _peak_memory(function: Callable[[], None]) -> int:
+    """
+    Runs `function` and returns peak of traced memory allocations in
+    bytes (measured in a separate pass, since tracing slows down the
+    execution considerably).
+    """
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _baginfo_operations(shape: IPShape) -> list[dict]:
+    """Returns list of bag-info operations (JSON) for `shape`."""
+    operations = [
+        {"type": "set", "targetField": "Set-Field", "value": "value"},
+        {
+            "type": "complement",
+            "targetField": "Source-Organization",
+            "value": "value",
+        },
+    ]
+    for field in range(shape.baginfo_fields):
+        operations.append(
+            {
+                "type": "findAndReplace",
+                "targetField": f"Field-{field}",
+                "items": [
+                    {"regex": r"value [0-9]+-0", "value": "replaced"},
+                    {"regex": r"v.*e [0-9]+-[1-9]", "value": "replaced"},
+                ],
+            }
+        )
+        operations.append(
+            {
+                "type": "findAndReplaceLiteral",
+                "targetField": f"Field-{field}",
+                "items": [{"literal": "replaced", "value": "final"}],
+            }
+        )
+    return operations
+
+
+def _sigprop_operations() -> list[dict]:
+    """
+    Returns list of significant-properties operations (JSON) that
+    affect all entries generated for an `IPShape`.
+    """
+    operations = []
+    for type_ in SIGPROP_TYPES:
+        operations.append(
+            {
+                "type": "findAndReplace",
+                "targetField": type_,
+                "items": [
+                    {"regex": r"value [0-9]*0", "value": "replaced"},
+                    {"regex": r"v.*e [0-9]*[1-9]", "value": "replaced"},
+                ],
+            }
+        )
+        operations.append(
+            {
+                "type": "findAndReplaceLiteral",
+                "targetField": type_,
+                "items": [{"literal": "replaced", "value": "final"}],
+            }
+        )
+    return operations
+
+
+def _preparation(ip: Path, shape: IPShape) -> dict:
+    """Returns preparation-request (JSON) for the IP at `ip`."""
+    return {
+        "target": {"path": str(ip)},
+        "bagInfoOperations": _baginfo_operations(shape),
+        "sigPropOperations": _sigprop_operations(),
+    }
+
+
+def benchmark_import() -> dict:
+    """
+    Benchmarks the import-time of the package `dcm_preparation_module`
+    (in a fresh interpreter).
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import time; t0 = time.perf_counter(); "
+            + "import dcm_preparation_module; "
+            + "print(time.perf_counter() - t0)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {"import_seconds": float(result.stdout.strip())}
+
+
+def benchmark_metadata_operator(
+    ip: Path, shape: IPShape, repeat: int = 1
+) -> dict:
+    """
+    Benchmarks `MetadataOperator.process` in isolation on the bag-info
+    and significant-properties metadata of `ip`.
+    """
+    # pylint: disable=import-outside-toplevel
+    from bagit_utils import Bag
+    from dcm_preparation_module.config import AppConfig
+    from dcm_preparation_module.models import PreparationConfig
+    from dcm_preparation_module.components import MetadataOperator
+    from dcm_preparation_module.engine import PreparationEngine
+
+    config = PreparationConfig.from_json(_preparation(ip, shape))
+    inputs = [
+        (Bag(ip).baginfo, config.baginfo_operations),
+        (
+            PreparationEngine.load_significant_properties(
+                ip / "meta" / "significant_properties.xml",
+                AppConfig.SIGPROP_PREMIS_NAMESPACE,
+            ),
+            config.sig_prop_operations,
+        ),
+    ]
+    operator = MetadataOperator()
+
+    def run(repeat_: int):
+        for _ in range(repeat_):
+            for metadata, operations in inputs:
+                operator.process(metadata, operations)
+
+    elapsed = _time(lambda: run(repeat))
+    return {
+        "seconds": elapsed,
+        "operations_per_second": sum(
+            len(operations) for _, operations in inputs
+        )
+        * repeat
+        / elapsed,
+        "peak_memory_bytes": _peak_memory(lambda: run(1)),
+    }
+
+
+def _parse_metric(metrics: str, name: str) -> Optional[float]:
+    """Returns value of sample `name` from Prometheus text or `None`."""
+    match = re.search(
+        r"^" + re.escape(name) + r" ([0-9.eE+-]+)$", metrics, re.MULTILINE
+    )
+    return None if match is None else float(match.group(1))
+
+
+def _run_prepare(
+    workdir: Path, ip: Path, shape: IPShape, trace_memory: bool = False
+) -> tuple[dict, str, Optional[int]]:
+    """
+    Runs a single preparation-job for `ip` in a new app and returns
+    the job's report, the app's metrics, and (if `trace_memory`) the
+    peak of traced memory allocations in bytes.
+    """
+    # pylint: disable=import-outside-toplevel
+    from dcm_preparation_module import app_factory
+    from dcm_preparation_module.config import AppConfig
+
+    class BenchmarkConfig(AppConfig):
+        """Benchmark-config"""
+
+        FS_MOUNT_POINT = workdir
+        ORCHESTRA_DAEMON_INTERVAL = 0.01
+        ORCHESTRA_WORKER_INTERVAL = 0.01
+        ORCHESTRA_WORKER_ARGS = {"messages_interval": 0.01}
+
+    app = app_factory(BenchmarkConfig(), block=True)
+    client = app.test_client()
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        response = client.post(
+            "/prepare", json={"preparation": _preparation(ip, shape)}
+        )
+        app.extensions["orchestra"].stop(stop_on_idle=True)
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    report = client.get(f"/report?token={response.json['value']}").json
+    if not report.get("data", {}).get("success"):
+        raise RuntimeError(f"Preparation failed: {report.get('log')}")
+    return report, client.get("/metrics").text, peak
+
+
+def benchmark_prepare(workdir: Path, ip: Path, shape: IPShape) -> dict:
+    """
+    Benchmarks `PreparationView.prepare` end-to-end (via the app and
+    orchestration) for the IP at `ip` (relative to `workdir`).
+
+    Timings are taken from the job's metrics, i.e., they do not include
+    the time spent in the orchestration (queue polling and shutdown).
+    Memory is measured in a separate job.
+    """
+    report, metrics, _ = _run_prepare(workdir, ip, shape)
+    files, size = count_files(workdir / report["data"]["path"])
+    seconds = _parse_metric(
+        metrics, "dcm_preparation_job_duration_seconds_sum"
+    )
+    copy_seconds = _parse_metric(
+        metrics,
+        'dcm_preparation_stage_duration_seconds_sum{stage="copy"}',
+    )
+    _, _, peak = _run_prepare(workdir, ip, shape, trace_memory=True)
+    return {
+        "seconds": seconds,
+        "files": files,
+        "bytes": size,
+        "throughput_bytes_per_second": size / seconds,
+        "files_per_second": files / seconds,
+        "copy_seconds": copy_seconds,
+        "copy_throughput_bytes_per_second": (
+            size / copy_seconds if copy_seconds else None
+        ),
+        "manifest_seconds": _parse_metric(
+            metrics,
+            "dcm_preparation_stage_duration_seconds_sum"
+            + '{stage="tagManifests"}',
+        ),
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_benchmarks(
+    shapes: list[str], workdir: Path, repeat: int = 1
+) -> dict:
+    """
+    Runs all benchmarks for `shapes` in `workdir` and returns results
+    as JSON.
+    """
+    try:
+        app_version = version("dcm-preparation-module")
+    except PackageNotFoundError:
+        app_version = None
+    results = {"import": benchmark_import()}
+    for name in shapes:
+        shape = SHAPES[name]
+        ip = Path("ips") / name
+        if not (workdir / ip).is_dir():
+            generate_ip(workdir / ip, shape)
+        results[f"metadata_operator/{name}"] = benchmark_metadata_operator(
+            workdir / ip, shape, repeat
+        )
+        results[f"prepare/{name}"] = benchmark_prepare(workdir, ip, shape)
+        results[f"prepare/{name}"]["shape"] = shape.json
+    return {
+        "metadata": {
+            "datetime": datetime.now().astimezone().isoformat(),
+            "version": app_version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "maxrss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point for the benchmark runner."""
+    parser = argparse.ArgumentParser(
+        description="Run benchmarks for the 'DCM Preparation Module'."
+    )
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        default=["smoke"],
+        choices=sorted(SHAPES),
+        help="IP shapes to benchmark (default: smoke)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=10,
+        help="repetitions for metadata-operator benchmarks (default: 10)",
+    )
+    parser.add_argument(
+        "--workdir",
+        type=Path,
+        default=None,
+        help="working directory (default: temporary directory)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="output file for results (default: stdout)",
+    )
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="dcm-pm-bench-"))
+    workdir = workdir.resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    try:
+        results = run_benchmarks(args.shapes, workdir, args.repeat)
+    finally:
+        if args.workdir is None:
+            rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
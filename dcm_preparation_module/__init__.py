@@ -4,18 +4,16 @@ This flask app implements the 'Preparation Module'-API (see
 `openapi.yaml` in the sibling-package `dcm_preparation_module_api`).
 """
 
+from typing import TYPE_CHECKING
 from time import time, sleep
+import weakref
 
-from flask import Flask
-from dcm_common.services import DefaultView, ReportView
-from dcm_common.services import extensions
-
-from dcm_preparation_module.config import AppConfig
-from dcm_preparation_module.views import PreparationView
+if TYPE_CHECKING:
+    from dcm_preparation_module.config import AppConfig
 
 
 def app_factory(
-    config: AppConfig,
+    config: "AppConfig",
     as_process: bool = False,
     block: bool = False,
 ):
@@ -32,6 +30,17 @@ def app_factory(
              (up to 10 seconds); only relevant if not `as_process`
              (default False)
     """
+    # imports are deferred to keep importing this package cheap
+    # pylint: disable=import-outside-toplevel
+    from flask import Flask
+    from dcm_common.services import DefaultView, ReportView
+    from dcm_common.services import extensions
+
+    from dcm_preparation_module.views import (
+        PreparationView,
+        MetricsView,
+        StatisticsView,
+    )
 
     app = Flask(__name__)
     app.config.from_object(config)
@@ -48,6 +57,28 @@ def app_factory(
         app, config, config.worker_pool, "Preparation Module", as_process
     )
 
+    # register garbage collection for output directory
+    if config.OUTPUT_GC_INTERVAL > 0:
+
+        def start_output_gc():
+            view.output_collector.start(
+                config.OUTPUT_GC_INTERVAL, on_cycle=view.collect_objects
+            )
+
+        if as_process:
+            run = app.run
+
+            def run_with_output_gc(*args, **kwargs):
+                start_output_gc()
+                run(*args, **kwargs)
+
+            app.run = run_with_output_gc
+        else:
+            start_output_gc()
+        app.extensions["output_gc"] = view.output_collector
+        # stop background task with the app (or at exit)
+        weakref.finalize(app, view.output_collector.stop, False)
+
     def ready():
         """Define condition for readiness."""
         return (
@@ -67,5 +98,12 @@ def app_factory(
     )
     app.register_blueprint(view.get_blueprint(), url_prefix="/")
     app.register_blueprint(ReportView(config).get_blueprint(), url_prefix="/")
+    app.register_blueprint(
+        MetricsView(config, view.metrics).get_blueprint(), url_prefix="/"
+    )
+    app.register_blueprint(
+        StatisticsView(config, view.resource_statistics).get_blueprint(),
+        url_prefix="/",
+    )
 
     return app
@@ -0,0 +1,303 @@
+"""
+Command-line batch preparer for the 'DCM Preparation Module'.
+
+Prepares all IPs (directories or archives) in a directory with the
+`PreparationEngine` (i.e., the same job logic as the
+`/prepare`-endpoint) but without the app and the orchestration queue.
+Jobs are distributed over a process pool. Paths are resolved relative
+to the working directory (targets have to be located therein).
+
+Run as
+    dcm-preparation-batch <targets> --config preparation.json \\
+        --output <output> --summary summary.json
+
+Prepared IPs in the tag-overlay output format are materialized as full
+bags via
+    dcm-preparation-resolve <overlay> <destination>
+"""
+
+from typing import Optional
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+from uuid import uuid4
+import argparse
+import json
+import os
+import sys
+
+
+# engine of the current worker process (see `_init_worker`)
+_ENGINE = None
+
+
+def list_targets(path: Path) -> list[Path]:
+    """
+    Returns sorted list of the targets (directories and archives) in
+    `path` (hidden entries are skipped).
+    """
+    # pylint: disable=import-outside-toplevel
+    from dcm_preparation_module.components import ArchiveReader
+
+    return sorted(
+        entry
+        for entry in path.iterdir()
+        if not entry.name.startswith(".")
+        and (entry.is_dir() or ArchiveReader.is_archive(entry))
+    )
+
+
+def _init_worker(processes: int = 1) -> None:
+    """
+    Initializes the `PreparationEngine` of a worker process (the global
+    I/O-budget `IO_RATE_LIMIT` is shared equally by all `processes`).
+    """
+    # pylint: disable=import-outside-toplevel, global-statement
+    from dcm_preparation_module.config import AppConfig
+    from dcm_preparation_module.components import TokenBucket
+    from dcm_preparation_module.engine import PreparationEngine
+
+    global _ENGINE
+    _ENGINE = PreparationEngine(
+        AppConfig,
+        io_bucket=(
+            TokenBucket(AppConfig.IO_RATE_LIMIT / processes)
+            if AppConfig.IO_RATE_LIMIT > 0
+            else None
+        ),
+    )
+
+
+def _prepare(target: str, preparation: dict, output: Path) -> dict:
+    """
+    Runs the preparation job for `target` in a worker process and
+    returns the result for the summary.
+    """
+    # pylint: disable=import-outside-toplevel
+    from dcm_common import LoggingContext
+
+    from dcm_preparation_module.models import PreparationConfig, Report
+    from dcm_preparation_module.components import ProgressPublisher
+
+    token = str(uuid4())
+    report = Report(host="", args={"preparation": preparation})
+    report.log.set_default_origin("Preparation Module")
+    time0 = perf_counter()
+    try:
+        _ENGINE.prepare(
+            PreparationConfig.from_json(preparation),
+            output,
+            token=token,
+            progress=ProgressPublisher(None, report),
+        )
+    # pylint: disable=broad-exception-caught
+    except Exception as exc_info:
+        report.data.success = False
+        report.log.log(
+            LoggingContext.ERROR,
+            body=f"Unexpected error during preparation: {exc_info}",
+        )
+    errors = report.log.json.get(LoggingContext.ERROR.name, [])
+    return {
+        "target": target,
+        "token": token,
+        "success": bool(report.data.success),
+        "path": None if report.data.path is None else str(report.data.path),
+        "seconds": perf_counter() - time0,
+        "errors": [error["body"] for error in errors],
+        "resources": (
+            None
+            if report.data.resources is None
+            else report.data.resources.json
+        ),
+    }
+
+
+def run_batch(
+    targets: list[Path],
+    preparation: dict,
+    output: Path,
+    workers: Optional[int] = None,
+    progress: bool = True,
+) -> dict:
+    """
+    Prepares `targets` in a process pool and returns the summary.
+
+    Keyword arguments:
+    targets -- list of target paths
+    preparation -- JSON of the `PreparationConfig` that is applied to
+                   all targets (the property 'target' is ignored)
+    output -- output directory for prepared IPs
+    workers -- number of worker processes
+               (default None; uses the number of CPUs)
+    progress -- whether to print progress to stderr
+                (default True)
+    """
+    # pylint: disable=import-outside-toplevel
+    from data_plumber_http.settings import Responses
+
+    from dcm_preparation_module.models import ResourceUsage
+    from dcm_preparation_module.components import ResourceStatistics
+    from dcm_preparation_module.handlers import get_preparation_handler
+
+    time0 = perf_counter()
+    handler = get_preparation_handler(cwd=Path.cwd())
+    results = []
+
+    # validate request bodies
+    jobs = {}
+    for target in targets:
+        validation = handler.run(
+            json={
+                "preparation": preparation
+                | {"target": {"path": str(target)}}
+            }
+        )
+        if validation.last_status != Responses.GOOD.status:
+            results.append(
+                {
+                    "target": str(target),
+                    "token": None,
+                    "success": False,
+                    "path": None,
+                    "seconds": 0.0,
+                    "errors": [validation.last_message],
+                    "resources": None,
+                }
+            )
+            continue
+        jobs[str(target)] = validation.data.value["preparation"].json
+
+    # run jobs
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(workers or os.cpu_count() or 1,),
+    ) as executor:
+        futures = [
+            executor.submit(_prepare, target, job, output)
+            for target, job in jobs.items()
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if progress:
+                print(
+                    f"[{len(results)}/{len(targets)}] "
+                    + ("ok" if results[-1]["success"] else "failed")
+                    + f" '{results[-1]['target']}'"
+                    + (
+                        f" -> '{results[-1]['path']}'"
+                        if results[-1]["success"]
+                        else ""
+                    ),
+                    file=sys.stderr,
+                    flush=True,
+                )
+
+    results.sort(key=lambda result: result["target"])
+    succeeded = sum(result["success"] for result in results)
+    statistics = ResourceStatistics()
+    for result in results:
+        if result["resources"] is not None:
+            statistics.add(ResourceUsage.from_json(result["resources"]))
+    return {
+        "targets": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "seconds": perf_counter() - time0,
+        "resources": statistics.json,
+        "results": results,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point of the batch preparer."""
+    parser = argparse.ArgumentParser(
+        description="Prepare all IPs (directories or archives) in a "
+        + "directory without the app and the orchestration queue.",
+    )
+    parser.add_argument(
+        "targets", type=Path, help="directory containing the target IPs"
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        help="path to JSON-file with the 'PreparationConfig' (without "
+        + "target; default: no operations)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path(os.environ.get("PREPARED_IP_OUTPUT") or "pip"),
+        help="output directory for prepared IPs (default: "
+        + "PREPARED_IP_OUTPUT or 'pip')",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--summary",
+        type=Path,
+        help="write summary (JSON) to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="do not print progress"
+    )
+    args = parser.parse_args(argv)
+
+    preparation = {}
+    if args.config is not None:
+        preparation = json.loads(args.config.read_text(encoding="utf-8"))
+    preparation.pop("target", None)
+
+    summary = run_batch(
+        list_targets(args.targets),
+        preparation,
+        args.output.resolve(),
+        workers=args.workers,
+        progress=not args.quiet,
+    )
+    if args.summary is None:
+        print(json.dumps(summary, indent=2))
+    else:
+        args.summary.write_text(
+            json.dumps(summary, indent=2), encoding="utf-8"
+        )
+    return 0 if summary["failed"] == 0 else 1
+
+
+def resolve_main(argv: Optional[list[str]] = None) -> int:
+    """Entry point of the tag-overlay resolver."""
+    # pylint: disable=import-outside-toplevel
+    from dcm_preparation_module.components import OverlayResolver
+
+    parser = argparse.ArgumentParser(
+        description="Materialize a prepared IP in the tag-overlay output "
+        + "format as full bag.",
+    )
+    parser.add_argument("overlay", type=Path, help="path to the tag-overlay")
+    parser.add_argument(
+        "destination", type=Path, help="output directory for the bag"
+    )
+    args = parser.parse_args(argv)
+
+    if not OverlayResolver.is_overlay(args.overlay):
+        print(f"'{args.overlay}' is not a tag-overlay.", file=sys.stderr)
+        return 1
+    try:
+        statistics = OverlayResolver().resolve(args.overlay, args.destination)
+    except (OSError, ValueError) as exc_info:
+        print(
+            f"Unable to resolve '{args.overlay}': {exc_info}",
+            file=sys.stderr,
+        )
+        return 1
+    print(json.dumps(statistics.json, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
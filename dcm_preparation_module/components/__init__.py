@@ -1,6 +1,61 @@
 from .metadata_operator import MetadataOperator, ProcessResult
+from .progress import ProgressPublisher, ProgressBroker
+from .checkpoint import CopyCheckpoint
+from .copier import CopyAborted, CopyStatistics, Copier
+from .archive import ArchiveWriter, ArchiveReader
+from .overlay import OverlayResolver
+from .hasher import MultiHasher
+from .throttle import TokenBucket, IOThrottle
+from .verifier import FixityVerifier
+from .resources import (
+    ResourceMonitor,
+    TrackedThreadPoolExecutor,
+    ResourceStatistics,
+)
+from .cancellation import CancellationRegistry
+from .staging import OutputStaging
+from .object_store import ObjectStore
+from .collector import OutputCollector
+from .output_selector import OutputSelector
+from .callbacks import CallbackDispatcher
+from .admission import AdmissionController
+from .metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    ServiceMetrics,
+)
 
 __all__ = [
     "MetadataOperator",
     "ProcessResult",
+    "ProgressPublisher",
+    "ProgressBroker",
+    "CopyCheckpoint",
+    "CopyAborted",
+    "CopyStatistics",
+    "Copier",
+    "ArchiveWriter",
+    "ArchiveReader",
+    "OverlayResolver",
+    "MultiHasher",
+    "TokenBucket",
+    "IOThrottle",
+    "FixityVerifier",
+    "ResourceMonitor",
+    "TrackedThreadPoolExecutor",
+    "ResourceStatistics",
+    "CancellationRegistry",
+    "OutputStaging",
+    "ObjectStore",
+    "OutputCollector",
+    "OutputSelector",
+    "CallbackDispatcher",
+    "AdmissionController",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "ServiceMetrics",
 ]
@@ -0,0 +1,182 @@
+"""
+This module defines the `AdmissionController` component
+of the Preparation Module-app.
+"""
+
+from typing import Callable, Optional
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+import os
+import re
+import shutil
+
+
+class AdmissionController:
+    """
+    An `AdmissionController` decides whether new jobs are accepted based
+    on the free space in the output directory (minus the space that is
+    reserved for in-flight jobs) and the number of queued jobs.
+
+    Reservations are made on admission and shrink while a job writes
+    its output. They are released when the job is completed or, since
+    jobs may be executed by another service instance, after
+    `reservation_ttl` seconds at the latest.
+
+    Keyword arguments:
+    path -- (default) output directory
+    min_free_space -- number of bytes that should remain free
+                      (default 0)
+    max_queue -- maximum number of queued jobs; 0 corresponds to
+                 unlimited
+                 (default 0)
+    retry_after -- value for the 'Retry-After'-header of rejections in
+                   seconds
+                   (default 60)
+    reservation_ttl -- lifetime of reservations in seconds
+                       (default 86400)
+    queue_depth -- callable that returns the current number of queued
+                   jobs
+                   (default None)
+    """
+
+    _OXUM = re.compile(
+        r"^Payload-Oxum\s*:\s*([0-9]+)\.([0-9]+)\s*$",
+        re.IGNORECASE | re.MULTILINE,
+    )
+
+    def __init__(
+        self,
+        path: Path,
+        min_free_space: int = 0,
+        max_queue: int = 0,
+        retry_after: int = 60,
+        reservation_ttl: float = 86400.0,
+        queue_depth: Optional[Callable[[], int]] = None,
+    ) -> None:
+        self.path = path
+        self.min_free_space = min_free_space
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.reservation_ttl = reservation_ttl
+        self.queue_depth = queue_depth
+        self._lock = Lock()
+        # token -> [size, written, expiration, path]
+        self._reservations: dict[str, list] = {}
+
+    @classmethod
+    def estimate(cls, path: Path) -> Optional[int]:
+        """
+        Returns the estimated size in bytes of the IP at `path` (or
+        `None` if it cannot be estimated without scanning the IP).
+
+        For directories, the payload size is taken from the
+        'Payload-Oxum' in 'bag-info.txt' and the sizes of the top-level
+        tag files are added (tag directories are not scanned). For
+        archive files, the size of the archive is returned.
+        """
+        if path.is_file():
+            return path.stat().st_size
+        try:
+            match = cls._OXUM.search(
+                (path / "bag-info.txt").read_text(encoding="utf-8")
+            )
+        except (OSError, UnicodeDecodeError):
+            match = None
+        if match is None:
+            return None
+        size = int(match.group(1))
+        with os.scandir(path) as items:
+            for item in items:
+                if item.is_file(follow_symlinks=False):
+                    size += item.stat(follow_symlinks=False).st_size
+        return size
+
+    def free_space(self, path: Optional[Path] = None) -> int:
+        """
+        Returns free space in bytes for the output directory `path`
+        (default `self.path`).
+        """
+        path = path or self.path
+        while not path.exists() and path != path.parent:
+            path = path.parent
+        return shutil.disk_usage(path).free
+
+    def _reserved(self, path: Optional[Path] = None) -> int:
+        """
+        Removes expired reservations and returns the number of reserved
+        bytes (in `path` or in total; requires lock).
+        """
+        now = monotonic()
+        for token in [
+            token
+            for token, (_, _, expiration, _) in self._reservations.items()
+            if expiration < now
+        ]:
+            del self._reservations[token]
+        return sum(
+            max(size - written, 0)
+            for size, written, _, path_ in self._reservations.values()
+            if path is None or path_ == path
+        )
+
+    @property
+    def reserved(self) -> int:
+        """Returns the number of currently reserved bytes."""
+        with self._lock:
+            return self._reserved()
+
+    def reserved_for(self, path: Path) -> int:
+        """
+        Returns the number of currently reserved bytes in the output
+        directory `path`.
+        """
+        with self._lock:
+            return self._reserved(path)
+
+    def admit(
+        self, token: str, size: int, path: Optional[Path] = None
+    ) -> Optional[tuple[int, str]]:
+        """
+        Reserves `size` bytes for the job `token` in the output
+        directory `path` (default `self.path`). Returns `None` if the
+        job is admitted or a tuple of HTTP-status (429 if the queue is
+        full, 503 if the space is insufficient) and reason otherwise.
+        """
+        path = path or self.path
+        if (
+            self.max_queue > 0
+            and self.queue_depth is not None
+            and self.queue_depth() >= self.max_queue
+        ):
+            return 429, f"Queue is full ({self.max_queue} jobs)."
+        free_space = self.free_space(path) - self.min_free_space
+        with self._lock:
+            reserved = self._reserved(path)
+            if size > free_space - reserved:
+                return (
+                    503,
+                    f"Insufficient storage (requires {size} bytes, "
+                    + f"{max(free_space - reserved, 0)} bytes available).",
+                )
+            self._reservations[token] = [
+                size,
+                0,
+                monotonic() + self.reservation_ttl,
+                path,
+            ]
+        return None
+
+    def update(self, token: str, written: int) -> None:
+        """
+        Updates the number of bytes that have already been written by
+        the job `token`.
+        """
+        with self._lock:
+            if token in self._reservations:
+                self._reservations[token][1] = written
+
+    def release(self, token: str) -> None:
+        """Releases the reservation of the job `token`."""
+        with self._lock:
+            self._reservations.pop(token, None)
@@ -0,0 +1,378 @@
+"""
+This module defines the `ArchiveWriter` and `ArchiveReader` components
+of the Preparation Module-app.
+"""
+
+from typing import Any, BinaryIO, Callable, Optional
+from pathlib import Path
+from time import time, localtime, mktime
+import os
+import posixpath
+import tarfile
+import zipfile
+import io
+
+from .copier import CopyAborted, CopyStatistics
+
+
+class _Reader:
+    """
+    File-wrapper that checks for cancellation and updates the
+    statistics of an `ArchiveWriter` on every read.
+    """
+
+    def __init__(self, file, writer: "ArchiveWriter") -> None:
+        self.file = file
+        self.writer = writer
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads and returns up to `size` bytes."""
+        # pylint: disable=protected-access
+        self.writer._check_cancelled()
+        if size is None or size < 0 or size > self.writer.chunk_size:
+            size = self.writer.chunk_size
+        chunk = self.file.read(size)
+        self.writer.statistics.bytes_ += len(chunk)
+        if self.writer.on_progress is not None:
+            self.writer.on_progress(self.writer.statistics)
+        return chunk
+
+
+class ArchiveWriter:
+    """
+    An `ArchiveWriter` streams files into an (uncompressed) tar- or
+    zip-archive in a single pass while keeping track of the number of
+    written files and bytes (as `CopyStatistics`).
+
+    Keyword arguments:
+    path -- path of the archive file
+    format_ -- archive format; one of `FORMATS`
+    chunk_size -- size of the chunks in bytes
+                  (default 8 MiB)
+    on_progress -- optional callback that is executed with the current
+                   `CopyStatistics` after every chunk
+                   (default None)
+    cancelled -- optional callable that is checked before every file
+                 and chunk; if it returns `True`, writing is stopped by
+                 raising a `CopyAborted`-exception
+                 (default None)
+    """
+
+    FORMATS = ["tar", "zip"]
+
+    def __init__(
+        self,
+        path: Path,
+        format_: str,
+        chunk_size: int = 8 * 1024 * 1024,
+        on_progress: Optional[Callable[[CopyStatistics], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        if format_ not in self.FORMATS:
+            raise ValueError(
+                f"Unknown archive format '{format_}' (expected one of "
+                + f"{self.FORMATS})."
+            )
+        self.path = path
+        self.format_ = format_
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.cancelled = cancelled
+        self.statistics = CopyStatistics()
+        self._archive = None
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self.open()
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def open(self) -> "ArchiveWriter":
+        """Opens archive file for writing."""
+        if self.format_ == "tar":
+            # pylint: disable=consider-using-with
+            self._archive = tarfile.open(
+                self.path, "w", format=tarfile.PAX_FORMAT
+            )
+            self._archive.copybufsize = self.chunk_size
+        else:
+            self._archive = zipfile.ZipFile(
+                self.path, "w", compression=zipfile.ZIP_STORED
+            )
+        return self
+
+    def close(self) -> None:
+        """Finalizes and closes the archive file."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def _check_cancelled(self) -> None:
+        """Raises `CopyAborted` if writing has been cancelled."""
+        if self.cancelled is not None and self.cancelled():
+            raise CopyAborted("Writing archive has been cancelled.")
+
+    def add_bytes(
+        self, name: str, data: bytes, mtime: Optional[float] = None
+    ) -> None:
+        """Adds a file with content `data` as `name` to the archive."""
+        self._check_cancelled()
+        mtime = time() if mtime is None else mtime
+        if self.format_ == "tar":
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = mtime
+            info.mode = 0o644
+            self._archive.addfile(info, io.BytesIO(data))
+        else:
+            info = zipfile.ZipInfo(name, self._zip_date_time(mtime))
+            info.external_attr = 0o644 << 16
+            self._archive.writestr(info, data)
+        self.statistics.files += 1
+        self.statistics.bytes_ += len(data)
+        if self.on_progress is not None:
+            self.on_progress(self.statistics)
+
+    def _add(self, info: Any, file: BinaryIO) -> None:
+        """Streams `file` as member `info` into the archive."""
+        reader = _Reader(file, self)
+        if self.format_ == "tar":
+            self._archive.addfile(info, reader)
+        else:
+            with self._archive.open(info, "w", force_zip64=True) as dst:
+                while chunk := reader.read(self.chunk_size):
+                    dst.write(chunk)
+        self.statistics.files += 1
+        if self.on_progress is not None:
+            self.on_progress(self.statistics)
+
+    def add_file(self, name: str, src: Path) -> None:
+        """Streams the file `src` as `name` into the archive."""
+        self._check_cancelled()
+        with open(src, "rb") as file:
+            if self.format_ == "tar":
+                info = self._archive.gettarinfo(fileobj=file, arcname=name)
+            else:
+                info = zipfile.ZipInfo.from_file(src, name)
+            self._add(info, file)
+
+    def add_fileobj(
+        self, name: str, file: BinaryIO, size: int, mtime: float
+    ) -> None:
+        """
+        Streams `size` bytes from the file-object `file` as `name` into
+        the archive.
+        """
+        self._check_cancelled()
+        if self.format_ == "tar":
+            info = tarfile.TarInfo(name)
+            info.size = size
+            info.mtime = mtime
+            info.mode = 0o644
+        else:
+            info = zipfile.ZipInfo(name, self._zip_date_time(mtime))
+            info.external_attr = 0o644 << 16
+            info.file_size = size
+        self._add(info, file)
+
+    def add_tree(
+        self, name: str, src: Path, exclude: Optional[list[str]] = None
+    ) -> None:
+        """
+        Streams all files in `src` (sorted by path) into the archive
+        below `name`.
+
+        Keyword arguments:
+        name -- name of the directory in the archive
+        src -- source directory
+        exclude -- list of paths (relative to `src`) that are skipped
+                   (default None)
+        """
+        exclude = set(exclude or [])
+        for file in sorted(src.glob("**/*")):
+            if not file.is_file():
+                continue
+            path = file.relative_to(src).as_posix()
+            if path in exclude:
+                continue
+            self.add_file(f"{name}/{path}", file)
+
+    @staticmethod
+    def _zip_date_time(mtime: float) -> tuple:
+        """Returns zip-compatible date-time tuple for `mtime`."""
+        return tuple(max(localtime(mtime)[:6], (1980, 1, 1, 0, 0, 0)))
+
+
+class ArchiveReader:
+    """
+    An `ArchiveReader` provides access to a bag that is packed into a
+    tar- (optionally compressed) or zip-archive without extracting the
+    archive first. The bag is either located at the top level of the
+    archive or in a single top-level directory. Member names are given
+    relative to the bag.
+
+    Keyword arguments:
+    path -- path of the archive file
+    chunk_size -- size of the chunks in bytes
+                  (default 8 MiB)
+    on_progress -- optional callback that is executed with the current
+                   `CopyStatistics` after every chunk during `extract`
+                   (default None)
+    cancelled -- optional callable that is checked before every file
+                 and chunk during `extract`; if it returns `True`,
+                 extraction is stopped by raising a
+                 `CopyAborted`-exception
+                 (default None)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        chunk_size: int = 8 * 1024 * 1024,
+        on_progress: Optional[Callable[[CopyStatistics], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.cancelled = cancelled
+        self.statistics = CopyStatistics()
+        self._archive = None
+        self._members: dict[str, Any] = {}
+
+    @staticmethod
+    def is_archive(path: Path) -> bool:
+        """Returns `True` if `path` is a tar- or zip-archive."""
+        return path.is_file() and (
+            zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+        )
+
+    def __enter__(self) -> "ArchiveReader":
+        return self.open()
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        """
+        Returns normalized member name. Raises `ValueError` for names
+        that point outside of the archive.
+        """
+        path = posixpath.normpath(name)
+        if path.startswith("/") or path == ".." or path.startswith("../"):
+            raise ValueError(f"Unsafe member name '{name}' in archive.")
+        return path
+
+    def open(self) -> "ArchiveReader":
+        """
+        Opens archive file for reading and locates the bag. Raises
+        `ValueError` if the archive does not contain a bag.
+        """
+        if zipfile.is_zipfile(self.path):
+            self._archive = zipfile.ZipFile(self.path)
+            members = [
+                (info.filename, info)
+                for info in self._archive.infolist()
+                if not info.is_dir()
+            ]
+        else:
+            # pylint: disable=consider-using-with
+            self._archive = tarfile.open(self.path, "r:*")
+            members = [
+                (info.name, info)
+                for info in self._archive.getmembers()
+                if info.isfile()
+            ]
+        try:
+            members = [
+                (self._normalize(name), info) for name, info in members
+            ]
+            names = {name for name, _ in members}
+            prefixes = {name.split("/", 1)[0] for name in names}
+            if "bagit.txt" in names:
+                root = ""
+            elif len(prefixes) == 1 and f"{min(prefixes)}/bagit.txt" in names:
+                root = f"{min(prefixes)}/"
+            else:
+                raise ValueError(
+                    f"Archive '{self.path}' does not contain a bag."
+                )
+        except ValueError:
+            self.close()
+            raise
+        # keep order of archive (allows sequential reads)
+        self._members = {
+            name.removeprefix(root): info
+            for name, info in members
+            if name.startswith(root)
+        }
+        return self
+
+    def close(self) -> None:
+        """Closes the archive file."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    @property
+    def names(self) -> list[str]:
+        """Returns names of all files of the bag (in archive order)."""
+        return list(self._members)
+
+    def size(self, name: str) -> int:
+        """Returns size of the file `name` in bytes."""
+        info = self._members[name]
+        if isinstance(info, tarfile.TarInfo):
+            return info.size
+        return info.file_size
+
+    def mtime(self, name: str) -> float:
+        """Returns modification time of the file `name`."""
+        info = self._members[name]
+        if isinstance(info, tarfile.TarInfo):
+            return info.mtime
+        return mktime(info.date_time + (0, 0, -1))
+
+    def open_file(self, name: str) -> BinaryIO:
+        """Returns (binary) file-object for reading the file `name`."""
+        info = self._members[name]
+        if isinstance(info, tarfile.TarInfo):
+            return self._archive.extractfile(info)
+        return self._archive.open(info)
+
+    def read(self, name: str) -> bytes:
+        """Returns contents of the file `name`."""
+        with self.open_file(name) as file:
+            return file.read()
+
+    def _check_cancelled(self) -> None:
+        """Raises `CopyAborted` if extraction has been cancelled."""
+        if self.cancelled is not None and self.cancelled():
+            raise CopyAborted("Extracting archive has been cancelled.")
+
+    def extract(self, dst: Path) -> CopyStatistics:
+        """
+        Extracts the bag into the directory `dst` (in a single pass over
+        the archive) and returns the `CopyStatistics`.
+        """
+        for name in self._members:
+            self._check_cancelled()
+            target = dst / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with self.open_file(name) as src, open(target, "wb") as file:
+                while True:
+                    self._check_cancelled()
+                    chunk = src.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    file.write(chunk)
+                    self.statistics.bytes_ += len(chunk)
+                    if self.on_progress is not None:
+                        self.on_progress(self.statistics)
+            mtime = self.mtime(name)
+            os.utime(target, (mtime, mtime))
+            self.statistics.files += 1
+            if self.on_progress is not None:
+                self.on_progress(self.statistics)
+        return self.statistics
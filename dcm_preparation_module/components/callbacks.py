@@ -0,0 +1,156 @@
+"""
+This module defines the `CallbackDispatcher` component
+of the Preparation Module-app.
+"""
+
+from typing import Any, Callable, Optional
+from threading import Thread, Lock, local
+from queue import Queue, Full
+from time import sleep
+import sys
+import traceback
+
+import requests
+
+from dcm_preparation_module.models import CallbackStatus
+
+
+class CallbackDispatcher:
+    """
+    A `CallbackDispatcher` delivers callbacks asynchronously.
+
+    Requests are collected in a bounded queue and served by a small
+    pool of daemon-threads (started on first use). Every thread keeps
+    its own `requests.Session` so that connections are kept alive.
+    Failed deliveries are retried with exponential backoff. Hooks
+    passed to `submit` are executed with the final `CallbackStatus`
+    (also for unexpected errors during delivery).
+
+    Keyword arguments:
+    workers -- number of delivery threads
+               (default 2)
+    queue_size -- maximum number of pending callbacks
+                  (default 1000)
+    max_retries -- maximum number of retries after a failed attempt
+                   (default 3)
+    backoff -- base delay in seconds between attempts; the delay is
+               doubled after every failed attempt
+               (default 1.0)
+    timeout -- timeout of individual requests in seconds
+               (default 10.0)
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        queue_size: int = 1000,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        timeout: float = 10.0,
+    ) -> None:
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._queue = Queue(maxsize=queue_size)
+        self._threads: list[Thread] = []
+        self._lock = Lock()
+        self._local = local()
+
+    @property
+    def pending(self) -> int:
+        """Returns the approximate number of pending callbacks."""
+        return self._queue.qsize()
+
+    def _start(self) -> None:
+        """Starts delivery threads (if not running)."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = Thread(
+                    target=self._work,
+                    name=f"callback-dispatcher-{i}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _session(self) -> requests.Session:
+        """Returns the thread-local session."""
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def deliver(self, url: str, json: Any) -> CallbackStatus:
+        """Delivers callback synchronously and returns status."""
+        status = CallbackStatus(url)
+        while True:
+            status.attempts += 1
+            try:
+                response = self._session().post(
+                    url, json=json, timeout=self.timeout
+                )
+                response.raise_for_status()
+            except requests.RequestException as exc_info:
+                status.error = str(exc_info)
+                if status.attempts > self.max_retries:
+                    status.status = "failed"
+                    return status
+                sleep(self.backoff * 2 ** (status.attempts - 1))
+                continue
+            status.status = "delivered"
+            status.error = None
+            return status
+
+    def _work(self) -> None:
+        """Delivery loop of a single thread."""
+        while True:
+            url, json, on_done = self._queue.get()
+            try:
+                try:
+                    status = self.deliver(url, json)
+                # pylint: disable=broad-exception-caught
+                except Exception as exc_info:
+                    self._log_error(f"Failed to deliver callback to '{url}'")
+                    status = CallbackStatus(
+                        url, status="failed", attempts=1, error=str(exc_info)
+                    )
+                if on_done is not None:
+                    try:
+                        on_done(status)
+                    # pylint: disable=broad-exception-caught
+                    except Exception:
+                        self._log_error(
+                            f"Error in hook for callback to '{url}'"
+                        )
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _log_error(message: str) -> None:
+        """Writes `message` and the current traceback to stderr."""
+        print(f"{message}:\n{traceback.format_exc()}", file=sys.stderr)
+
+    def submit(
+        self,
+        url: str,
+        json: Any,
+        on_done: Optional[Callable[[CallbackStatus], None]] = None,
+    ) -> bool:
+        """
+        Enqueues a callback. Returns `False` if the queue is full.
+
+        Keyword arguments:
+        url -- callback url
+        json -- request body
+        on_done -- optional hook that is executed with the final
+                   `CallbackStatus` after delivery
+                   (default None)
+        """
+        self._start()
+        try:
+            self._queue.put_nowait((url, json, on_done))
+        except Full:
+            return False
+        return True
@@ -0,0 +1,175 @@
+"""
+This module defines the `CancellationRegistry` component
+of the Preparation Module-app.
+"""
+
+from typing import Optional
+import os
+from pathlib import Path
+from threading import Event, Lock
+from time import monotonic, time
+
+from .staging import OutputStaging
+
+
+class CancellationRegistry:
+    """
+    A `CancellationRegistry` manages cancellation-flags (as
+    `threading.Event`s) of the jobs that run in this process.
+
+    If `roots` are given, cancellations of shared jobs are additionally
+    recorded as marker files in these (shared) output directories such
+    that jobs that run in other processes or service instances are
+    cancelled as well (see `cancel` and `is_cancelled`). Markers are
+    named like staging directories (see `OutputStaging`). They are
+    removed when the job is released and, if the job is never run,
+    after `ttl` seconds (see `purge`).
+
+    Keyword arguments:
+    roots -- list of shared output directories for cancellation-markers
+             (default None)
+    interval -- minimum interval in seconds between two checks for
+                markers of the same job
+                (default 1.0)
+    ttl -- time in seconds after the last modification of a marker
+           after which it is considered stale
+           (default 86400.0)
+    """
+
+    SUFFIX = ".cancel"
+
+    def __init__(
+        self,
+        roots: Optional[list[Path]] = None,
+        interval: float = 1.0,
+        ttl: float = 86400.0,
+    ) -> None:
+        self.roots = roots or []
+        self.interval = interval
+        self.ttl = ttl
+        self._lock = Lock()
+        self._events: dict[str, Event] = {}
+        self._checked: dict[str, float] = {}
+        self._purged = monotonic()
+
+    @classmethod
+    def marker(cls, root: Path, token: str) -> Optional[Path]:
+        """
+        Returns path of the cancellation-marker for `token` in `root`
+        (or `None` if `token` is not a valid file name).
+        """
+        if not token or token in (".", "..") or Path(token).name != token:
+            return None
+        return root / f"{OutputStaging.PREFIX}{token}{cls.SUFFIX}"
+
+    def _markers(self, token: str) -> list[Path]:
+        """Returns paths of all cancellation-markers for `token`."""
+        return [
+            marker
+            for marker in (self.marker(root, token) for root in self.roots)
+            if marker is not None
+        ]
+
+    def register(self, token: str) -> Event:
+        """Returns the (new or existing) cancellation-flag for `token`."""
+        with self._lock:
+            return self._events.setdefault(token, Event())
+
+    def purge(self, force: bool = False) -> int:
+        """
+        Removes cancellation-markers that have not been modified for
+        `ttl` seconds from all `roots` and returns their number. Unless
+        `force`, this is done at most every `ttl / 24` seconds.
+        """
+        now = monotonic()
+        with self._lock:
+            if not force and now - self._purged < self.ttl / 24:
+                return 0
+            self._purged = now
+        deadline = time() - self.ttl
+        purged = 0
+        for root in self.roots:
+            try:
+                with os.scandir(root) as entries:
+                    for entry in entries:
+                        if not (
+                            entry.name.startswith(OutputStaging.PREFIX)
+                            and entry.name.endswith(self.SUFFIX)
+                        ):
+                            continue
+                        try:
+                            if (
+                                entry.is_file(follow_symlinks=False)
+                                and entry.stat(
+                                    follow_symlinks=False
+                                ).st_mtime < deadline
+                            ):
+                                os.unlink(entry.path)
+                                purged += 1
+                        except OSError:
+                            pass
+            except OSError:
+                pass
+        return purged
+
+    def cancel(self, token: str, shared: bool = True) -> bool:
+        """
+        Sets the cancellation-flag for `token`. If `shared`, the
+        cancellation is also recorded in all `roots`; this should only
+        be requested for jobs that are known to be queued or running.
+        Returns `False` if no job with `token` is registered in this
+        process.
+        """
+        if shared:
+            for marker in self._markers(token):
+                try:
+                    marker.touch()
+                except OSError:
+                    pass
+            self.purge()
+        with self._lock:
+            event = self._events.get(token)
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    def is_cancelled(self, token: str) -> bool:
+        """
+        Returns `True` if the job `token` has been cancelled, either in
+        this process or via a marker (checked at most every
+        `interval` seconds).
+        """
+        event = self.register(token)
+        if event.is_set():
+            return True
+        if not self.roots:
+            return False
+        now = monotonic()
+        with self._lock:
+            if now - self._checked.get(token, -self.interval) < self.interval:
+                return False
+            self._checked[token] = now
+        if any(marker.exists() for marker in self._markers(token)):
+            event.set()
+            return True
+        return False
+
+    def __contains__(self, token: str) -> bool:
+        with self._lock:
+            return token in self._events
+
+    def release(self, token: str) -> None:
+        """
+        Removes the cancellation-flag and cancellation-markers for
+        `token`.
+        """
+        with self._lock:
+            self._events.pop(token, None)
+            self._checked.pop(token, None)
+        for marker in self._markers(token):
+            try:
+                marker.unlink(missing_ok=True)
+            except OSError:
+                pass
+        self.purge()
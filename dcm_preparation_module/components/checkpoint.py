@@ -0,0 +1,103 @@
+"""
+This module defines the `CopyCheckpoint` component
+of the Preparation Module-app.
+"""
+
+from typing import Optional
+from pathlib import Path
+from threading import Lock
+import json
+import os
+
+
+class CopyCheckpoint:
+    """
+    A `CopyCheckpoint` records the files that have been copied
+    completely (in an append-only JSON-lines file). It is used to
+    resume an interrupted copy without transferring these files again.
+
+    Every entry contains the relative path, size and modification time
+    (in ns) of the source file as well as an optional digest of the
+    copied data.
+
+    Keyword arguments:
+    path -- path of the checkpoint file
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = Lock()
+        self._entries: dict[str, dict] = {}
+        self._file = None
+        self.load()
+
+    def load(self) -> None:
+        """(Re-)Loads entries from file (if existing)."""
+        self._entries = {}
+        if not self.path.is_file():
+            return
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # incomplete line after crash
+                    continue
+                self._entries[entry["path"]] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str) -> Optional[dict]:
+        """Returns entry for `path` or `None`."""
+        return self._entries.get(path)
+
+    def is_complete(self, path: str, src: Path, dst: Path) -> bool:
+        """
+        Returns `True` if the file at `path` (relative) has been copied
+        from `src` to `dst` completely, i.e., there is an entry that
+        matches the current size and modification time of `src` and
+        `dst`.
+        """
+        entry = self._entries.get(path)
+        if entry is None:
+            return False
+        try:
+            src_stat = src.stat()
+            dst_stat = dst.stat()
+        except OSError:
+            return False
+        return (
+            entry["size"] == src_stat.st_size == dst_stat.st_size
+            and entry["mtime"] == src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+        )
+
+    def add(
+        self, path: str, size: int, mtime: int, digest: Optional[str] = None
+    ) -> None:
+        """Records a completely copied file."""
+        entry = {"path": path, "size": size, "mtime": mtime}
+        if digest is not None:
+            entry["digest"] = digest
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # pylint: disable=consider-using-with
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            self._entries[path] = entry
+
+    def close(self) -> None:
+        """Flushes checkpoint to disk and closes file."""
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def remove(self) -> None:
+        """Closes and removes checkpoint file."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self._entries = {}
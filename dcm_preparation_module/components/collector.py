@@ -0,0 +1,240 @@
+"""
+This module defines the `OutputCollector` component
+of the Preparation Module-app.
+"""
+
+from typing import Callable, Optional
+from pathlib import Path
+from threading import Event, Thread
+from time import monotonic, time
+import os
+import re
+import sys
+
+from .staging import OutputStaging
+
+
+class OutputCollector:
+    """
+    An `OutputCollector` removes orphaned staging directories (left
+    behind by crashed jobs, including their copy-checkpoints) and
+    prepared IPs that exceed their retention from output directories.
+
+    Only entries that are named like outputs of jobs (job token,
+    optionally with an archive-suffix; see `OUTPUT_PATTERN`) or like
+    staging directories are considered; other entries of the output
+    directories (as well as `exclude`d paths, e.g., an object store)
+    are never removed.
+
+    Deletions are rate-limited in order to not compete with running
+    jobs for I/O.
+
+    Running jobs of any service instance keep the modification time of
+    their staging directories up to date (see
+    `OutputStaging.heartbeat`), i.e., `staging_retention` has to exceed
+    the heartbeat interval.
+
+    Keyword arguments:
+    roots -- list of output directories
+    retention -- retention time for prepared IPs in seconds; `None`
+                 corresponds to indefinitely
+                 (default None)
+    staging_retention -- time in seconds after the last modification
+                         of a staging directory (or its checkpoint)
+                         after which it is considered orphaned
+                         (default 86400)
+    rate -- maximum number of deleted filesystem entries per second; 0
+            corresponds to unlimited
+            (default 1000)
+    is_active -- optional callable that returns `True` if the job
+                 associated with the given token is running in this
+                 process (staging directories of these jobs are never
+                 removed)
+                 (default None)
+    exclude -- optional list of paths that are never removed
+               (default None)
+    """
+
+    OUTPUT_PATTERN = re.compile(
+        r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+        + r"(\.(tar|zip))?",
+        re.IGNORECASE,
+    )
+
+    def __init__(
+        self,
+        roots: list[Path],
+        retention: Optional[float] = None,
+        staging_retention: float = 86400.0,
+        rate: int = 1000,
+        is_active: Optional[Callable[[str], bool]] = None,
+        exclude: Optional[list[Path]] = None,
+    ) -> None:
+        self.roots = roots
+        self.retention = retention
+        self.staging_retention = staging_retention
+        self.rate = rate
+        self.is_active = is_active
+        self.exclude = [os.path.realpath(path) for path in (exclude or [])]
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self._next = 0.0
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[float]:
+        """Returns modification time of `path` or `None`."""
+        try:
+            return path.lstat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _expired(self, path: Path, now: float) -> bool:
+        """Returns `True` if `path` should be removed."""
+        if os.path.realpath(path) in self.exclude:
+            return False
+        if not OutputStaging.is_staging(path):
+            if (
+                self.retention is None
+                or self.OUTPUT_PATTERN.fullmatch(path.name) is None
+            ):
+                return False
+            mtime = self._mtime(path)
+            return mtime is not None and now - mtime > self.retention
+
+        # staging directory or checkpoint
+        staging = (
+            path.with_name(path.name.removesuffix(".checkpoint"))
+            if path.name.endswith(".checkpoint")
+            else path
+        )
+        token = staging.name.removeprefix(OutputStaging.PREFIX).split(
+            ".", 1
+        )[0]
+        if self.is_active is not None and self.is_active(token):
+            return False
+        mtimes = [
+            mtime
+            for mtime in (
+                self._mtime(staging),
+                self._mtime(OutputStaging.checkpoint(staging)),
+            )
+            if mtime is not None
+        ]
+        return (
+            len(mtimes) > 0 and now - max(mtimes) > self.staging_retention
+        )
+
+    def _throttle(self) -> bool:
+        """
+        Blocks until the next deletion is allowed. Returns `False` if
+        the collector has been stopped in the meantime.
+        """
+        if self.rate > 0:
+            delay = self._next - monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                return False
+            self._next = max(self._next, monotonic()) + 1 / self.rate
+        return not self._stop.is_set()
+
+    def _remove(self, path: Path) -> int:
+        """
+        Removes `path` (rate-limited) and returns the number of deleted
+        entries.
+        """
+        removed = 0
+        if path.is_dir() and not path.is_symlink():
+            for directory, dirs, files in os.walk(path, topdown=False):
+                # symlinks to directories are listed in `dirs`
+                for name in files + [
+                    d
+                    for d in dirs
+                    if os.path.islink(os.path.join(directory, d))
+                ]:
+                    if not self._throttle():
+                        return removed
+                    try:
+                        os.unlink(os.path.join(directory, name))
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+                if not self._throttle():
+                    return removed
+                try:
+                    os.rmdir(directory)
+                    removed += 1
+                except OSError:
+                    pass
+            return removed
+        if not self._throttle():
+            return removed
+        path.unlink(missing_ok=True)
+        return removed + 1
+
+    def collect(self) -> tuple[int, int]:
+        """
+        Runs a single collection. Returns a tuple of the number of
+        removed outputs (directories and checkpoints) and the number of
+        deleted filesystem entries.
+        """
+        outputs = 0
+        entries = 0
+        now = time()
+        candidates = []
+        for root in self.roots:
+            if not root.is_dir():
+                continue
+            with os.scandir(root) as it:
+                candidates.extend(Path(entry.path) for entry in it)
+        for path in candidates:
+            if self._stop.is_set():
+                break
+            if not self._expired(path, now):
+                continue
+            entries += self._remove(path)
+            outputs += 1
+        return outputs, entries
+
+    @property
+    def running(self) -> bool:
+        """Returns `True` if the background collection is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(
+        self, interval: float, on_cycle: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Starts periodic collection in a background thread (the first
+        collection is run after `interval` seconds).
+
+        Keyword arguments:
+        interval -- interval between collections in seconds
+        on_cycle -- optional callable that is executed after every
+                    collection
+                    (default None)
+        """
+        if self.running:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.collect()
+                    if on_cycle is not None:
+                        on_cycle()
+                # pylint: disable=broad-exception-caught
+                except Exception as exc_info:
+                    print(
+                        f"Output garbage collection failed: {exc_info}",
+                        file=sys.stderr,
+                    )
+
+        self._thread = Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def stop(self, block: bool = True) -> None:
+        """Stops background collection."""
+        self._stop.set()
+        if block and self._thread is not None:
+            self._thread.join()
+        self._thread = None
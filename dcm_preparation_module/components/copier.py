@@ -0,0 +1,281 @@
+"""
+This module defines the `Copier` component
+of the Preparation Module-app.
+"""
+
+from typing import Callable, Optional
+from dataclasses import dataclass
+from pathlib import Path
+from shutil import copystat, copytree
+import hashlib
+import os
+
+from dcm_common.models import DataModel
+
+from .checkpoint import CopyCheckpoint
+from .object_store import ObjectStore
+
+
+class CopyAborted(Exception):
+    """Raised if a copy-operation has been cancelled."""
+
+
+@dataclass
+class CopyStatistics(DataModel):
+    """
+    Data model for the byte- and file-counters of a `Copier`.
+
+    Keyword arguments:
+    files -- number of files copied
+    bytes_ -- number of bytes copied
+    skipped_files -- number of files skipped (already copied)
+    skipped_bytes -- number of bytes skipped (already copied)
+    linked_files -- number of files linked from an `ObjectStore`
+    linked_bytes -- number of bytes linked from an `ObjectStore`
+    """
+
+    files: int = 0
+    bytes_: int = 0
+    skipped_files: int = 0
+    skipped_bytes: int = 0
+    linked_files: int = 0
+    linked_bytes: int = 0
+
+    @DataModel.serialization_handler("bytes_", "bytes")
+    @classmethod
+    def bytes__serialization_handler(cls, value):
+        """Handles `bytes_`-serialization."""
+        return value
+
+    @DataModel.deserialization_handler("bytes_", "bytes")
+    @classmethod
+    def bytes__deserialization_handler(cls, value):
+        """Handles `bytes_`-deserialization."""
+        return value
+
+    @DataModel.serialization_handler("skipped_files", "skippedFiles")
+    @classmethod
+    def skipped_files_serialization_handler(cls, value):
+        """Handles `skipped_files`-serialization."""
+        return value
+
+    @DataModel.deserialization_handler("skipped_files", "skippedFiles")
+    @classmethod
+    def skipped_files_deserialization_handler(cls, value):
+        """Handles `skipped_files`-deserialization."""
+        return value
+
+    @DataModel.serialization_handler("skipped_bytes", "skippedBytes")
+    @classmethod
+    def skipped_bytes_serialization_handler(cls, value):
+        """Handles `skipped_bytes`-serialization."""
+        return value
+
+    @DataModel.deserialization_handler("skipped_bytes", "skippedBytes")
+    @classmethod
+    def skipped_bytes_deserialization_handler(cls, value):
+        """Handles `skipped_bytes`-deserialization."""
+        return value
+
+    @DataModel.serialization_handler("linked_files", "linkedFiles")
+    @classmethod
+    def linked_files_serialization_handler(cls, value):
+        """Handles `linked_files`-serialization."""
+        return value
+
+    @DataModel.deserialization_handler("linked_files", "linkedFiles")
+    @classmethod
+    def linked_files_deserialization_handler(cls, value):
+        """Handles `linked_files`-deserialization."""
+        return value
+
+    @DataModel.serialization_handler("linked_bytes", "linkedBytes")
+    @classmethod
+    def linked_bytes_serialization_handler(cls, value):
+        """Handles `linked_bytes`-serialization."""
+        return value
+
+    @DataModel.deserialization_handler("linked_bytes", "linkedBytes")
+    @classmethod
+    def linked_bytes_deserialization_handler(cls, value):
+        """Handles `linked_bytes`-deserialization."""
+        return value
+
+
+class Copier:
+    """
+    A `Copier` copies directory trees chunk-wise while keeping track of
+    the number of copied files and bytes.
+
+    Where available, chunks are transferred via `os.sendfile` (i.e.,
+    without copying data into user space).
+
+    Keyword arguments:
+    chunk_size -- size of the chunks in bytes
+                  (default 8 MiB)
+    on_progress -- optional callback that is executed with the current
+                   `CopyStatistics` after every chunk
+                   (default None)
+    cancelled -- optional callable that is checked before every file
+                 and chunk; if it returns `True`, the copy is stopped by
+                 raising a `CopyAborted`-exception
+                 (default None)
+    checkpoint -- optional `CopyCheckpoint`; files that are recorded as
+                  completely copied are skipped and newly copied files
+                  are recorded
+                  (default None)
+    digest -- optional hash algorithm; if set, a digest of the copied
+              data is calculated during the copy and recorded in the
+              checkpoint (this disables `os.sendfile`)
+              (default None)
+    store -- optional `ObjectStore`; files listed in `manifest` are
+             linked from the store if the store has verified the
+             (unchanged) source file before; otherwise, they are copied
+             and, if the copied data matches the manifest-digest, added
+             to (or linked from) the store
+             (default None)
+    manifest -- mapping of relative file paths to object keys (see
+                `ObjectStore.load_manifest`)
+                (default None)
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 8 * 1024 * 1024,
+        on_progress: Optional[Callable[[CopyStatistics], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+        checkpoint: Optional[CopyCheckpoint] = None,
+        digest: Optional[str] = None,
+        store: Optional[ObjectStore] = None,
+        manifest: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.cancelled = cancelled
+        self.checkpoint = checkpoint
+        self.digest = digest
+        self.store = store
+        self.manifest = manifest or {}
+        self.statistics = CopyStatistics()
+        self._src_root: Optional[Path] = None
+
+    def _check_cancelled(self) -> None:
+        """Raises `CopyAborted` if the copy has been cancelled."""
+        if self.cancelled is not None and self.cancelled():
+            raise CopyAborted("Copy has been cancelled.")
+
+    def _transfer(self, fsrc, fdst, size: int, hash_=None) -> None:
+        """
+        Transfers `size` bytes chunk-wise from `fsrc` to `fdst` (and
+        updates `hash_` if given).
+        """
+        use_sendfile = hasattr(os, "sendfile") and hash_ is None
+        offset = 0
+        while offset < size:
+            self._check_cancelled()
+            count = min(self.chunk_size, size - offset)
+            sent = 0
+            if use_sendfile:
+                try:
+                    sent = os.sendfile(
+                        fdst.fileno(), fsrc.fileno(), offset, count
+                    )
+                except OSError:
+                    use_sendfile = False
+            if not use_sendfile:
+                fsrc.seek(offset)
+                chunk = fsrc.read(count)
+                if hash_ is not None:
+                    hash_.update(chunk)
+                sent = fdst.write(chunk)
+            if sent == 0:
+                break
+            offset += sent
+            self.statistics.bytes_ += sent
+            if self.on_progress is not None:
+                self.on_progress(self.statistics)
+
+    def copy_file(self, src: str | Path, dst: str | Path) -> str | Path:
+        """
+        Copies a single file including its metadata (like
+        `shutil.copy2`). Returns `dst`.
+        """
+        self._check_cancelled()
+        path = None
+        if self._src_root is not None:
+            path = Path(src).relative_to(self._src_root).as_posix()
+        if (
+            path is not None
+            and self.checkpoint is not None
+            and self.checkpoint.is_complete(path, Path(src), Path(dst))
+        ):
+            self.statistics.skipped_files += 1
+            self.statistics.skipped_bytes += Path(src).stat().st_size
+            if self.on_progress is not None:
+                self.on_progress(self.statistics)
+            return dst
+
+        key = None
+        if self.store is not None and path is not None:
+            key = self.manifest.get(path)
+        if key is not None and self.store.link(key, Path(dst), Path(src)):
+            self.statistics.linked_files += 1
+            self.statistics.linked_bytes += Path(dst).stat().st_size
+            if self.on_progress is not None:
+                self.on_progress(self.statistics)
+            return dst
+
+        algorithm = self.digest if key is None else key.split(":")[0]
+        hash_ = None if algorithm is None else hashlib.new(algorithm)
+        # never write into an existing file (that may be a link into an
+        # `ObjectStore`)
+        Path(dst).unlink(missing_ok=True)
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            stat = os.fstat(fsrc.fileno())
+            self._transfer(fsrc, fdst, stat.st_size, hash_)
+        copystat(src, dst)
+        digest = (
+            None if hash_ is None else f"{algorithm}:{hash_.hexdigest()}"
+        )
+        if (
+            key is not None
+            and digest == key
+            and not self.store.add(key, Path(dst), stat)
+        ):
+            # object exists already (with the same, verified content)
+            self.store.link(key, Path(dst))
+        if path is not None and self.checkpoint is not None:
+            self.checkpoint.add(path, stat.st_size, stat.st_mtime_ns, digest)
+        self.statistics.files += 1
+        if self.on_progress is not None:
+            self.on_progress(self.statistics)
+        return dst
+
+    def copy(
+        self,
+        src: Path,
+        dst: Path,
+        ignore: Optional[Callable[[str, list[str]], list[str]]] = None,
+    ) -> CopyStatistics:
+        """
+        Copies the directory tree `src` into `dst` and returns the
+        accumulated `CopyStatistics`. Entries can be excluded via
+        `ignore` (see `shutil.copytree`).
+
+        Raises `CopyAborted` if the copy has been cancelled (leaving a
+        partial copy in `dst`).
+        """
+        self._src_root = Path(src)
+        try:
+            copytree(
+                src,
+                dst,
+                dirs_exist_ok=True,
+                copy_function=self.copy_file,
+                ignore=ignore,
+            )
+        finally:
+            self._src_root = None
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+        return self.statistics
@@ -0,0 +1,168 @@
+"""
+This module defines the `MultiHasher` component
+of the Preparation Module-app.
+"""
+
+from typing import BinaryIO, Callable, Optional, TypeVar
+from pathlib import Path
+from functools import partial
+import hashlib
+import mmap
+
+from .resources import TrackedThreadPoolExecutor
+
+
+K = TypeVar("K")
+
+
+class MultiHasher:
+    """
+    A `MultiHasher` calculates digests for multiple hash algorithms in
+    a single pass, i.e., every file is read only once and all digests
+    are updated from the same buffer.
+
+    Multiple files are hashed concurrently in threads (`hashlib`
+    releases the GIL while hashing larger buffers).
+
+    The methods for hashing files accept an optional `throttle`, a
+    callable that is executed with the number of bytes of every chunk
+    that is read (e.g., `IOThrottle.consume`).
+
+    Keyword arguments:
+    workers -- number of threads for `hash_all`
+               (default 4)
+    buffer_size -- size of the read buffer in bytes
+                   (default 1 MiB)
+    mmap_threshold -- files of at least this size (in bytes) are read
+                      via `mmap`; 0 disables `mmap`
+                      (default 0)
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        buffer_size: int = 1024 * 1024,
+        mmap_threshold: int = 0,
+    ) -> None:
+        self.workers = workers
+        self.buffer_size = buffer_size
+        self.mmap_threshold = mmap_threshold
+
+    def _hash_buffer(
+        self,
+        hashes: list,
+        buffer,
+        throttle: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Updates all `hashes` with `buffer` chunk-wise."""
+        view = memoryview(buffer)
+        for offset in range(0, len(view), self.buffer_size):
+            chunk = view[offset:offset + self.buffer_size]
+            if throttle is not None:
+                throttle(len(chunk))
+            for hash_ in hashes:
+                hash_.update(chunk)
+
+    def hash_fileobj(
+        self,
+        file: BinaryIO,
+        algorithms: list[str],
+        throttle: Optional[Callable[[int], None]] = None,
+    ) -> dict[str, str]:
+        """
+        Returns a mapping of algorithms and hex-digests for the contents
+        of `file`.
+        """
+        hashes = [hashlib.new(a) for a in algorithms]
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        while size := file.readinto(buffer):
+            if throttle is not None:
+                throttle(size)
+            chunk = view[:size]
+            for hash_ in hashes:
+                hash_.update(chunk)
+        return {a: h.hexdigest() for a, h in zip(algorithms, hashes)}
+
+    def hash(
+        self,
+        content: "Path | bytes",
+        algorithms: list[str],
+        throttle: Optional[Callable[[int], None]] = None,
+    ) -> dict[str, str]:
+        """
+        Returns a mapping of algorithms and hex-digests for `content`
+        (path of a file or contents; only files are throttled).
+        """
+        if not isinstance(content, Path):
+            hashes = [hashlib.new(a) for a in algorithms]
+            self._hash_buffer(hashes, content)
+            return {a: h.hexdigest() for a, h in zip(algorithms, hashes)}
+        with open(content, "rb", buffering=0) as file:
+            size = content.stat().st_size
+            if 0 < self.mmap_threshold <= size:
+                hashes = [hashlib.new(a) for a in algorithms]
+                with mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as buffer:
+                    self._hash_buffer(hashes, buffer, throttle)
+                return {a: h.hexdigest() for a, h in zip(algorithms, hashes)}
+            return self.hash_fileobj(file, algorithms, throttle)
+
+    @staticmethod
+    def _throttled(
+        function: Callable[["Path | bytes", list[str]], dict[str, str]],
+        throttle: Callable[[int], None],
+        content: "Path | bytes",
+        algorithms: list[str],
+    ) -> dict[str, str]:
+        """Calls `function` after throttling the size of `content`."""
+        if isinstance(content, Path):
+            throttle(content.stat().st_size)
+        return function(content, algorithms)
+
+    def hash_all(
+        self,
+        contents: dict[K, "Path | bytes"],
+        algorithms: list[str],
+        function: Optional[
+            Callable[["Path | bytes", list[str]], dict[str, str]]
+        ] = None,
+        throttle: Optional[Callable[[int], None]] = None,
+    ) -> dict[K, dict[str, str]]:
+        """
+        Returns the digests (see `hash`) for all `contents`; items are
+        hashed concurrently.
+
+        Keyword arguments:
+        contents -- mapping of keys (e.g., file names) and contents
+                    (path of a file or contents)
+        algorithms -- list of hash algorithms
+        function -- optional replacement for `hash`
+                    (default None)
+        throttle -- optional callable for limiting I/O; for a custom
+                    `function`, it is executed with the size of a file
+                    before hashing
+                    (default None)
+        """
+        if function is None:
+            function = partial(self.hash, throttle=throttle)
+        elif throttle is not None:
+            function = partial(self._throttled, function, throttle)
+        if self.workers <= 1 or len(contents) <= 1:
+            return {
+                key: function(content, algorithms)
+                for key, content in contents.items()
+            }
+        with TrackedThreadPoolExecutor(
+            max_workers=self.workers
+        ) as executor:
+            return dict(
+                zip(
+                    contents.keys(),
+                    executor.map(
+                        lambda content: function(content, algorithms),
+                        contents.values(),
+                    ),
+                )
+            )
@@ -3,8 +3,9 @@ This module defines the `BagInfoOperator` component
 of the Preparation Module-app.
 """
 
-from typing import Optional
+from typing import Callable, Optional
 from copy import deepcopy
+from time import perf_counter
 import re
 from dataclasses import dataclass
 
@@ -41,6 +42,12 @@ class MetadataOperator:
     """
     A `MetadataOperator` can be used to process the source metadata of
     an IP based on a series of operations.
+
+    Keyword arguments:
+    on_regex_evaluation -- optional hook that is executed with the
+                           duration (in seconds) of the regex
+                           evaluation of every `FindAndReplaceOperation`
+                           (default None)
     """
 
     TAG: str = "Metadata Operator"
@@ -53,6 +60,11 @@ class MetadataOperator:
         + "value of '{pre}'."
     )
 
+    def __init__(
+        self, on_regex_evaluation: Optional[Callable[[float], None]] = None
+    ) -> None:
+        self.on_regex_evaluation = on_regex_evaluation
+
     @staticmethod
     def _convert_field_str_to_list(
         metadata: dict[str, str | list[str]], target_field: str
@@ -117,6 +129,7 @@ class MetadataOperator:
 
         self._convert_field_str_to_list(metadata, operation.target_field)
 
+        time0 = perf_counter()
         metadata[operation.target_field] = list(
             map(
                 lambda field_value: next(
@@ -130,6 +143,8 @@ class MetadataOperator:
                 metadata[operation.target_field],
             )
         )
+        if self.on_regex_evaluation is not None:
+            self.on_regex_evaluation(perf_counter() - time0)
 
     def _find_and_replace_literal(
         self,
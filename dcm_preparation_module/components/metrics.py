@@ -0,0 +1,358 @@
+"""
+This module defines the metrics-components of the Preparation
+Module-app.
+"""
+
+from typing import Callable, Iterable, Optional
+from abc import ABC, abstractmethod
+from threading import Lock
+from time import monotonic
+from bisect import bisect_left
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    """Returns labels formatted as in the Prometheus text format."""
+    if not labels:
+        return ""
+    return (
+        "{"
+        + ",".join(
+            key + '="' + str(value).replace('"', '\\"') + '"'
+            for key, value in labels
+        )
+        + "}"
+    )
+
+
+class Metric(ABC):
+    """
+    Base class for metrics.
+
+    Keyword arguments:
+    name -- metric name
+    help_ -- description of the metric
+    """
+
+    TYPE: str
+
+    def __init__(self, name: str, help_: str) -> None:
+        self.name = name
+        self.help = help_
+        self._lock = Lock()
+
+    @abstractmethod
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        """
+        Returns iterable of samples as tuples of name, formatted
+        labels, and value.
+        """
+
+    def render(self) -> str:
+        """Returns metric in the Prometheus text format."""
+        return (
+            f"# HELP {self.name} {self.help}\n"
+            + f"# TYPE {self.name} {self.TYPE}\n"
+            + "".join(
+                f"{name}{labels} {value}\n"
+                for name, labels, value in self.samples()
+            )
+        )
+
+
+class Counter(Metric):
+    """Monotonically increasing counter (optionally labeled)."""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, help_: str) -> None:
+        super().__init__(name, help_)
+        self._values: dict[tuple[tuple[str, str], ...], float] = {}
+
+    def inc(self, value: float = 1, **labels) -> None:
+        """Increments counter by `value`."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def get(self, **labels) -> float:
+        """Returns current value."""
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items()) or [((), 0)]
+        for labels, value in values:
+            yield self.name, _format_labels(labels), value
+
+
+class Gauge(Metric):
+    """
+    Gauge that is either set explicitly or evaluated via `function`.
+    """
+
+    TYPE = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_: str,
+        function: Optional[Callable[[], float]] = None,
+    ) -> None:
+        super().__init__(name, help_)
+        self.function = function
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        """Sets gauge to `value`."""
+        self._value = value
+
+    def inc(self, value: float = 1) -> None:
+        """Increments gauge by `value`."""
+        with self._lock:
+            self._value += value
+
+    def dec(self, value: float = 1) -> None:
+        """Decrements gauge by `value`."""
+        self.inc(-value)
+
+    def get(self) -> float:
+        """Returns current value."""
+        if self.function is not None:
+            return self.function()
+        return self._value
+
+    def samples(self):
+        yield self.name, "", self.get()
+
+
+class Histogram(Metric):
+    """Histogram with cumulative buckets (optionally labeled)."""
+
+    TYPE = "histogram"
+    DEFAULT_BUCKETS = (
+        0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600
+    )
+
+    def __init__(
+        self,
+        name: str,
+        help_: str,
+        buckets: Optional[Iterable[float]] = None,
+    ) -> None:
+        super().__init__(name, help_)
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+        self._values: dict[tuple[tuple[str, str], ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Adds observation `value`."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, [[0] * (len(self.buckets) + 1), 0.0]
+            )
+            counts[bisect_left(self.buckets, value)] += 1
+            self._values[key][1] = total + value
+
+    def count(self, **labels) -> int:
+        """Returns number of observations."""
+        values = self._values.get(tuple(sorted(labels.items())))
+        return 0 if values is None else sum(values[0])
+
+    def sum(self, **labels) -> float:
+        """Returns sum of observations."""
+        values = self._values.get(tuple(sorted(labels.items())))
+        return 0.0 if values is None else values[1]
+
+    def samples(self):
+        with self._lock:
+            values = [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._values.items()
+            ]
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    _format_labels(labels + (("le", str(bound)),)),
+                    cumulative,
+                )
+            yield f"{self.name}_sum", _format_labels(labels), total
+            yield f"{self.name}_count", _format_labels(labels), cumulative
+
+
+class MetricsRegistry:
+    """
+    A `MetricsRegistry` collects metrics and renders them in the
+    Prometheus text format.
+
+    Keyword arguments:
+    prefix -- prefix for all metric names
+              (default "")
+    """
+
+    def __init__(self, prefix: str = "") -> None:
+        self.prefix = prefix
+        self._metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_: str) -> Counter:
+        """Registers and returns new `Counter`."""
+        return self._register(Counter(self.prefix + name, help_))
+
+    def gauge(
+        self,
+        name: str,
+        help_: str,
+        function: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        """Registers and returns new `Gauge`."""
+        return self._register(Gauge(self.prefix + name, help_, function))
+
+    def histogram(
+        self,
+        name: str,
+        help_: str,
+        buckets: Optional[Iterable[float]] = None,
+    ) -> Histogram:
+        """Registers and returns new `Histogram`."""
+        return self._register(Histogram(self.prefix + name, help_, buckets))
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text format."""
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+class ServiceMetrics:
+    """
+    Collection of the service-level metrics of the Preparation
+    Module-app.
+
+    The queue depth is given by the jobs that have been submitted to
+    but neither started nor aborted by this instance (see `queued`,
+    `dequeued`). Since jobs may be executed by another service
+    instance, queued jobs are discarded after `queue_ttl` seconds.
+
+    Keyword arguments:
+    queue_ttl -- time in seconds after which queued jobs are no longer
+                 counted
+                 (default 86400)
+    """
+
+    def __init__(self, queue_ttl: float = 86400.0) -> None:
+        self.queue_ttl = queue_ttl
+        self._queue_lock = Lock()
+        # token -> expiration
+        self._queue: dict[str, float] = {}
+        self.registry = MetricsRegistry(prefix="dcm_preparation_")
+        r = self.registry
+        # jobs
+        self.jobs_submitted = r.counter(
+            "jobs_submitted_total", "Number of accepted job submissions."
+        )
+        self.lane_submissions = r.counter(
+            "lane_submissions_total",
+            "Number of accepted job submissions per lane.",
+        )
+        self.jobs_rejected = r.counter(
+            "jobs_rejected_total", "Number of rejected job submissions."
+        )
+        self.jobs_started = r.counter(
+            "jobs_started_total", "Number of started jobs."
+        )
+        self.jobs_succeeded = r.counter(
+            "jobs_succeeded_total", "Number of successful jobs."
+        )
+        self.jobs_failed = r.counter(
+            "jobs_failed_total", "Number of failed jobs."
+        )
+        self.jobs_running = r.gauge(
+            "jobs_running", "Number of currently running jobs."
+        )
+        self.queue_depth = r.gauge(
+            "queue_depth",
+            "Number of jobs submitted to but not yet started or aborted "
+            + "by this instance.",
+            self._queue_depth,
+        )
+        self.job_duration = r.histogram(
+            "job_duration_seconds", "Duration of jobs."
+        )
+        self.stage_duration = r.histogram(
+            "stage_duration_seconds", "Duration of individual job stages."
+        )
+        # copy
+        self.copied_bytes = r.counter(
+            "copied_bytes_total", "Number of bytes copied."
+        )
+        self.copied_files = r.counter(
+            "copied_files_total", "Number of files copied."
+        )
+        self.linked_bytes = r.counter(
+            "linked_bytes_total",
+            "Number of bytes linked from the object store.",
+        )
+        self.linked_files = r.counter(
+            "linked_files_total",
+            "Number of files linked from the object store.",
+        )
+        self.reserved_bytes = r.gauge(
+            "reserved_bytes",
+            "Number of bytes reserved for in-flight jobs.",
+        )
+        # hashing
+        self.hashed_bytes = r.counter(
+            "hashed_bytes_total", "Number of bytes hashed."
+        )
+        self.hash_duration = r.histogram(
+            "hash_duration_seconds", "Duration of hashing-operations."
+        )
+        # metadata
+        self.regex_duration = r.histogram(
+            "regex_evaluation_seconds",
+            "Duration of regex evaluations in find-and-replace operations.",
+            (0.00001, 0.0001, 0.001, 0.01, 0.1, 1, 10),
+        )
+        # callbacks
+        self.callback_duration = r.histogram(
+            "callback_latency_seconds",
+            "Latency of callback delivery (from job completion).",
+        )
+        self.callbacks_pending = r.gauge(
+            "callbacks_pending", "Number of pending callbacks."
+        )
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text format."""
+        return self.registry.render()
+
+    def queued(self, token: str) -> None:
+        """Registers the submitted job `token` as queued."""
+        with self._queue_lock:
+            self._queue[token] = monotonic() + self.queue_ttl
+
+    def dequeued(self, token: str) -> bool:
+        """
+        Removes the job `token` from the queue (when started or
+        aborted). Returns `True` if the job has been queued.
+        """
+        with self._queue_lock:
+            return self._queue.pop(token, None) is not None
+
+    def _queue_depth(self) -> int:
+        """Returns the number of queued jobs."""
+        now = monotonic()
+        with self._queue_lock:
+            for token in [
+                token
+                for token, expiration in self._queue.items()
+                if expiration <= now
+            ]:
+                del self._queue[token]
+            return len(self._queue)
@@ -0,0 +1,234 @@
+"""
+This module defines the `ObjectStore` component
+of the Preparation Module-app.
+"""
+
+from typing import Optional
+from pathlib import Path
+from uuid import uuid4
+import os
+import re
+
+
+class ObjectStore:
+    """
+    An `ObjectStore` is a content-addressed store for payload files.
+    Objects are keyed by a digest (formatted as '<algorithm>:<value>',
+    e.g., taken from a bag's manifest) and are shared with prepared IPs
+    via hard links. Only collision-resistant algorithms (sha256 and
+    sha512) are accepted for keys.
+
+    Objects are only linked in place of a source file if this exact
+    file (identified by device, inode, size, and modification and
+    change time) has been verified against the key before (see `add`),
+    i.e., the digests claimed by a manifest are never trusted on their
+    own.
+
+    The number of hard links of an object serves as reference count:
+    objects that are no longer linked by any prepared IP (i.e., with a
+    link count of one) are removed by `collect`.
+
+    Note that all hard links of an object share their content and
+    metadata. Linked files must therefore not be modified in place.
+
+    Keyword arguments:
+    root -- root directory of the store; needs to be located on the
+            same filesystem as the prepared IPs
+    """
+
+    _KEY = re.compile(r"^(?:sha256:[0-9a-f]{64}|sha512:[0-9a-f]{128})$")
+    MANIFEST_ALGORITHMS = ["sha512", "sha256"]
+    # directory for records of verified source files
+    SOURCES = "sources"
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @staticmethod
+    def _identity(stat: os.stat_result) -> str:
+        """Returns an identifier for the file-version given by `stat`."""
+        return (
+            f"{stat.st_dev}-{stat.st_ino}-{stat.st_size}-"
+            + f"{stat.st_mtime_ns}-{stat.st_ctime_ns}"
+        )
+
+    def _record(self, stat: os.stat_result) -> Path:
+        """Returns path of the record for the source file `stat`."""
+        return self.root / self.SOURCES / self._identity(stat)
+
+    def verified(self, src: Path) -> Optional[str]:
+        """
+        Returns the key that has been verified for the (unchanged) file
+        `src` via `add` or `None` if not available.
+        """
+        try:
+            key = self._record(src.stat()).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        return key if self.is_key(key) else None
+
+    @classmethod
+    def is_key(cls, key: str) -> bool:
+        """Returns `True` if `key` is a valid object key."""
+        return cls._KEY.match(key) is not None
+
+    def path(self, key: str) -> Path:
+        """
+        Returns path of the object for `key`. Raises `ValueError` for
+        invalid keys.
+        """
+        if not self.is_key(key):
+            raise ValueError(f"Invalid object key '{key}'.")
+        algorithm, value = key.split(":")
+        return self.root / algorithm / value[:2] / value
+
+    def refcount(self, key: str) -> int:
+        """Returns number of links to the object for `key`."""
+        try:
+            return self.path(key).stat().st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def link(self, key: str, dst: Path, src: Optional[Path] = None) -> bool:
+        """
+        Replaces `dst` by a hard link to the object for `key`. Returns
+        `False` if the object does not exist or cannot be linked (e.g.,
+        if `dst` is located on a different filesystem).
+
+        If `src` is given, the object is only linked if `src` has been
+        verified against `key` (see `verified`) and the sizes match.
+        """
+        if src is not None:
+            try:
+                if (
+                    self.verified(src) != key
+                    or self.path(key).stat().st_size != src.stat().st_size
+                ):
+                    return False
+            except OSError:
+                return False
+        tmp = dst.with_name(f".{dst.name}.{uuid4().hex}")
+        try:
+            os.link(self.path(key), tmp)
+        except OSError:
+            return False
+        try:
+            os.replace(tmp, dst)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return False
+        return True
+
+    def add(
+        self,
+        key: str,
+        src: Path,
+        source: Optional[os.stat_result] = None,
+    ) -> bool:
+        """
+        Adds the file `src` as object for `key` by creating a hard link
+        (the content of `src` is expected to have been verified against
+        `key`). Returns `False` if the object already exists or cannot
+        be linked.
+
+        Keyword arguments:
+        key -- object key
+        src -- file that is added
+        source -- `os.stat_result` of the original file that `src` has
+                  been copied from; if given, the original file is
+                  recorded as verified for `key` (also if the object
+                  already exists)
+                  (default None)
+        """
+        path = self.path(key)
+        if source is not None:
+            record = self._record(source)
+            try:
+                record.parent.mkdir(parents=True, exist_ok=True)
+                tmp = record.with_name(f".{record.name}.{uuid4().hex}")
+                tmp.write_text(key, encoding="utf-8")
+                os.replace(tmp, record)
+            except OSError:
+                pass
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.link(src, path)
+        except OSError:
+            return False
+        return True
+
+    def collect(self) -> tuple[int, int]:
+        """
+        Removes all objects that are not linked by any prepared IP.
+        Returns a tuple of the number of removed objects and bytes.
+        """
+        objects = 0
+        size = 0
+        if not self.root.is_dir():
+            return objects, size
+        for directory in self.root.glob("*/*"):
+            if not directory.is_dir():
+                continue
+            for file in directory.iterdir():
+                try:
+                    stat = file.stat()
+                except FileNotFoundError:
+                    continue
+                if stat.st_nlink > 1:
+                    continue
+                file.unlink(missing_ok=True)
+                objects += 1
+                size += stat.st_size
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+        # remove records of sources whose object no longer exists
+        sources = self.root / self.SOURCES
+        if sources.is_dir():
+            for record in sources.iterdir():
+                try:
+                    key = record.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    continue
+                if not self.is_key(key) or not self.path(key).is_file():
+                    record.unlink(missing_ok=True)
+        return objects, size
+
+    @classmethod
+    def load_manifest(
+        cls, bag: Path, algorithms: Optional[list[str]] = None
+    ) -> dict[str, str]:
+        """
+        Returns a mapping of payload-paths (relative to `bag`) to object
+        keys based on the first existing payload manifest of `bag`.
+
+        Keyword arguments:
+        bag -- path to a bag
+        algorithms -- preferred algorithms in descending order; other
+                      algorithms than those in `MANIFEST_ALGORITHMS`
+                      are ignored
+                      (default `MANIFEST_ALGORITHMS`)
+        """
+        for algorithm in algorithms or cls.MANIFEST_ALGORITHMS:
+            if algorithm not in cls.MANIFEST_ALGORITHMS:
+                continue
+            manifest = bag / f"manifest-{algorithm}.txt"
+            if not manifest.is_file():
+                continue
+            keys = {}
+            for line in manifest.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                value, _, path = line.partition(" ")
+                key = f"{algorithm}:{value.lower()}"
+                if not cls.is_key(key):
+                    continue
+                keys[
+                    path.lstrip()
+                    .replace("%0A", "\n")
+                    .replace("%0D", "\r")
+                    .replace("%25", "%")
+                ] = key
+            return keys
+        return {}
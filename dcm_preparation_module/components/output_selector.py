@@ -0,0 +1,90 @@
+"""
+This module defines the `OutputSelector` component
+of the Preparation Module-app.
+"""
+
+from typing import Callable, Optional
+from pathlib import Path
+import shutil
+
+
+class OutputSelector:
+    """
+    An `OutputSelector` chooses the output directory for a job from a
+    list of output roots. Roots are ranked by
+    1. whether the available space (free space minus the space that is
+       reserved for in-flight jobs) suffices for the job,
+    2. whether the root is located on the same filesystem as the
+       target IP (which enables hard links), and
+    3. the available space.
+
+    Keyword arguments:
+    roots -- list of output directories
+    cwd -- working directory for relative paths
+           (default None; uses the process' working directory)
+    reserved -- optional callable that returns the number of bytes
+                reserved for in-flight jobs in a given root
+                (default None)
+    """
+
+    def __init__(
+        self,
+        roots: list[Path],
+        cwd: Optional[Path] = None,
+        reserved: Optional[Callable[[Path], int]] = None,
+    ) -> None:
+        if len(roots) == 0:
+            raise ValueError("At least one output root is required.")
+        self.roots = roots
+        self.cwd = cwd
+        self.reserved = reserved
+
+    def _resolve(self, path: Path) -> Path:
+        """
+        Returns the nearest existing path for `path` (relative to
+        `cwd`).
+        """
+        if self.cwd is not None:
+            path = self.cwd / path
+        while not path.exists() and path != path.parent:
+            path = path.parent
+        return path
+
+    def device(self, path: Path) -> Optional[int]:
+        """Returns the device-id of the filesystem of `path`."""
+        try:
+            return self._resolve(path).stat().st_dev
+        except OSError:
+            return None
+
+    def available(self, root: Path) -> int:
+        """Returns the available space in bytes in `root`."""
+        try:
+            free = shutil.disk_usage(self._resolve(root)).free
+        except OSError:
+            return 0
+        return free - (0 if self.reserved is None else self.reserved(root))
+
+    def select(self, target: Optional[Path] = None, size: int = 0) -> Path:
+        """
+        Returns the output root for a job.
+
+        Keyword arguments:
+        target -- path of the target IP
+                  (default None)
+        size -- estimated size of the prepared IP in bytes
+                (default 0)
+        """
+        if len(self.roots) == 1:
+            return self.roots[0]
+        device = None if target is None else self.device(target)
+
+        def rank(root: Path) -> tuple[bool, bool, int]:
+            available = self.available(root)
+            return (
+                available >= size,
+                device is not None and self.device(root) == device,
+                available,
+            )
+
+        return max(self.roots, key=rank)
@@ -0,0 +1,124 @@
+"""
+This module defines the `OverlayResolver` component
+of the Preparation Module-app.
+"""
+
+from typing import Callable, Optional
+from pathlib import Path
+import hashlib
+import json
+
+from .copier import CopyStatistics, Copier
+
+
+class OverlayResolver:
+    """
+    An `OverlayResolver` materializes prepared IPs in the tag-overlay
+    output format as full bags.
+
+    A tag-overlay contains only the tag files of a prepared IP (i.e.,
+    without 'data/') and a reference file (`REFERENCE`) with the path of
+    the source IP as well as digests of its payload-manifests. On
+    resolution, the payload is taken from the source IP (after checking
+    that its payload-manifests are unchanged).
+
+    Keyword arguments:
+    cwd -- directory relative to which source-references are resolved
+           (default None; uses the working directory)
+    chunk_size -- size of the chunks in bytes
+                  (default 8 MiB)
+    on_progress -- optional callback that is executed with the current
+                   `CopyStatistics` after every chunk
+                   (default None)
+    cancelled -- optional callable that is checked before every file
+                 and chunk (see `Copier`)
+                 (default None)
+    """
+
+    REFERENCE = "overlay.json"
+    DIGEST = "sha256"
+
+    def __init__(
+        self,
+        cwd: Optional[Path] = None,
+        chunk_size: int = 8 * 1024 * 1024,
+        on_progress: Optional[Callable[[CopyStatistics], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.cwd = cwd
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.cancelled = cancelled
+
+    @classmethod
+    def is_overlay(cls, path: Path) -> bool:
+        """Returns `True` if `path` is a tag-overlay."""
+        return (path / cls.REFERENCE).is_file()
+
+    @classmethod
+    def _manifest_digests(cls, source: Path) -> dict[str, str]:
+        """Returns digests of the payload-manifests in `source`."""
+        return {
+            file.name: f"{cls.DIGEST}:"
+            + hashlib.new(cls.DIGEST, file.read_bytes()).hexdigest()
+            for file in sorted(source.glob("manifest-*.txt"))
+        }
+
+    @classmethod
+    def write_reference(cls, path: Path, source: Path) -> None:
+        """
+        Writes the reference file of the tag-overlay at `path` for the
+        source IP `source`.
+        """
+        (path / cls.REFERENCE).write_text(
+            json.dumps(
+                {
+                    "source": str(source),
+                    "manifests": cls._manifest_digests(source),
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load_reference(cls, path: Path) -> dict:
+        """Returns the reference of the tag-overlay at `path`."""
+        return json.loads((path / cls.REFERENCE).read_text(encoding="utf-8"))
+
+    def source(self, path: Path) -> Path:
+        """
+        Returns the path of the source IP of the tag-overlay at `path`.
+
+        Raises `ValueError` if the payload-manifests of the source IP
+        have changed since the overlay has been written.
+        """
+        reference = self.load_reference(path)
+        source = Path(reference["source"])
+        if self.cwd is not None:
+            source = self.cwd / source
+        if self._manifest_digests(source) != reference["manifests"]:
+            raise ValueError(
+                f"Payload-manifests of source IP '{source}' do not match "
+                + f"the tag-overlay at '{path}'."
+            )
+        return source
+
+    def resolve(self, path: Path, dst: Path) -> CopyStatistics:
+        """
+        Materializes the tag-overlay at `path` as full bag in `dst` and
+        returns the `CopyStatistics`.
+
+        Raises `ValueError` if the source IP has changed (see `source`)
+        and `CopyAborted` if the copy has been cancelled.
+        """
+        source = self.source(path)
+        copier = Copier(self.chunk_size, self.on_progress, self.cancelled)
+        copier.copy(source / "data", dst / "data")
+        return copier.copy(
+            path,
+            dst,
+            ignore=lambda directory, names: (
+                [self.REFERENCE] if Path(directory) == path else []
+            ),
+        )
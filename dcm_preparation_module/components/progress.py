@@ -0,0 +1,269 @@
+"""
+This module defines the `ProgressPublisher` and `ProgressBroker`
+components of the Preparation Module-app.
+"""
+
+from typing import Any, Callable, Optional
+from time import monotonic
+from threading import Lock
+from queue import Queue, Full, Empty
+
+from dcm_common import LoggingContext, Logger
+from dcm_common.orchestra import JobContext
+
+from dcm_preparation_module.models import Report
+
+
+class ProgressPublisher:
+    """
+    A `ProgressPublisher` coalesces the progress-updates of a job.
+
+    Pushes of the `Report` to the orchestra-controller serialize the
+    entire report (including the log), i.e., their cost grows with the
+    log; the `JobContext` does not support incremental updates. Hence,
+    only their frequency is reduced: regular calls to `push` are
+    rate-limited by `interval` and only forwarded if either the
+    interval has passed or the push is forced (e.g., at stage
+    boundaries). Subscribers (see `subscribe`) are not sent the report
+    but only the log entries that have been added via this publisher
+    since their previous message. They are subject to the same
+    rate-limit, i.e., log entries and data of non-forwarded pushes are
+    coalesced into the next forwarded push.
+
+    Keyword arguments:
+    context -- `JobContext` of the job; `None` if the report is not
+               pushed to a controller (e.g., when using the
+               `PreparationEngine` as library)
+    report -- `Report` of the job
+    interval -- minimum interval between two pushes to the controller
+                and subscribers in seconds
+                (default 1.0)
+    clock -- clock used for rate-limiting
+             (default `time.monotonic`)
+    """
+
+    def __init__(
+        self,
+        context: Optional[JobContext],
+        report: Report,
+        interval: float = 1.0,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.context = context
+        self.report = report
+        self.interval = interval
+        self._clock = clock
+        self._last_push: Optional[float] = None
+        self._delta: list[dict[str, str]] = []
+        self._data: dict[str, Any] = {}
+        self._subscribers: list[Callable[[dict[str, Any]], None]] = []
+
+    def subscribe(self, subscriber: Callable[[dict[str, Any]], None]) -> None:
+        """
+        Registers `subscriber` to be called with progress-deltas. A
+        delta is a dictionary with keys
+        * "progress": current `report.progress.verbose`,
+        * "log": log entries added since the previous delta, and
+        * "data": additional data passed to `push` since the previous
+          delta (latest value per key).
+        """
+        self._subscribers.append(subscriber)
+
+    def log(
+        self,
+        context: LoggingContext,
+        body: str,
+        origin: Optional[str] = None,
+    ) -> None:
+        """Adds a log message to the report and records it as delta."""
+        self.report.log.log(context, body=body, origin=origin)
+        # record the entry as created by the logger
+        self._delta.append(
+            {"context": context.name} | self.report.log[context][-1].json
+        )
+
+    def merge(self, log: Logger) -> None:
+        """Merges `log` into the report and records it as delta."""
+        self.report.log.merge(log)
+        for context, messages in log.json.items():
+            for message in messages:
+                self._delta.append({"context": context} | message)
+
+    def push(self, force: bool = False, **data) -> bool:
+        """
+        Publishes delta to subscribers and pushes the report to the
+        controller if either `force` is set or the minimum interval has
+        passed since the last push. Returns `True` if the push has been
+        forwarded.
+
+        Keyword arguments:
+        force -- whether to ignore rate-limiting
+                 (default False)
+        data -- additional data that is passed on to subscribers
+        """
+        self._data.update(data)
+        now = self._clock()
+        if (
+            not force
+            and self._last_push is not None
+            and now - self._last_push < self.interval
+        ):
+            return False
+
+        delta, self._delta = self._delta, []
+        data, self._data = self._data, {}
+        if self._subscribers:
+            message = {
+                "progress": self.report.progress.verbose,
+                "log": delta,
+                "data": data,
+            }
+            for subscriber in self._subscribers:
+                subscriber(message)
+        if self.context is not None:
+            self.context.push()
+        self._last_push = now
+        return True
+
+    def flush(self, **data) -> None:
+        """Forces a push (shorthand for `push(force=True)`)."""
+        self.push(force=True, **data)
+
+
+class ProgressBroker:
+    """
+    A `ProgressBroker` distributes progress-deltas (as generated by a
+    `ProgressPublisher`) of running jobs to an arbitrary number of
+    subscribers (e.g., event streams).
+
+    Every subscriber is served by a bounded queue; if a subscriber
+    falls behind, the oldest messages are dropped. A new subscriber
+    receives the latest known progress-state first.
+
+    Channels that have not received a message for `max_idle` seconds
+    (e.g., of jobs that have been interrupted without closing their
+    channel) are closed by `expire`, which is also run whenever a
+    channel is opened or subscribed.
+
+    Keyword arguments:
+    queue_size -- maximum number of buffered messages per subscriber
+                  (default 1000)
+    max_idle -- maximum time in seconds without messages before a
+                channel expires
+                (default 3600.0)
+    clock -- clock used for expiration
+             (default `time.monotonic`)
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 1000,
+        max_idle: float = 3600.0,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.queue_size = queue_size
+        self.max_idle = max_idle
+        self._clock = clock
+        self._lock = Lock()
+        self._channels: dict[str, dict[str, Any]] = {}
+
+    @staticmethod
+    def _put(queue: Queue, message: dict[str, Any]) -> None:
+        """Puts `message` into `queue`, dropping the oldest if full."""
+        while True:
+            try:
+                queue.put_nowait(message)
+                return
+            except Full:
+                try:
+                    queue.get_nowait()
+                except Empty:
+                    pass
+
+    def _close(
+        self, token: str, message: Optional[dict[str, Any]] = None
+    ) -> None:
+        """Implementation of `close` (requires lock)."""
+        channel = self._channels.pop(token, None)
+        if channel is None:
+            return
+        for queue in channel["subscribers"]:
+            if message is not None:
+                self._put(queue, message)
+            self._put(queue, None)
+
+    def _expire(self) -> None:
+        """Implementation of `expire` (requires lock)."""
+        now = self._clock()
+        for token in [
+            token
+            for token, channel in self._channels.items()
+            if now - channel["active"] > self.max_idle
+        ]:
+            self._close(token)
+
+    def expire(self) -> None:
+        """Closes all channels that have been idle for `max_idle`."""
+        with self._lock:
+            self._expire()
+
+    def open(self, token: str) -> None:
+        """Opens a channel for `token` (if not already existing)."""
+        with self._lock:
+            self._expire()
+            self._channels.setdefault(
+                token,
+                {"state": None, "subscribers": [], "active": self._clock()},
+            )
+
+    def publish(self, token: str, message: dict[str, Any]) -> None:
+        """
+        Publishes `message` to all subscribers of `token` (ignored if
+        there is no open channel).
+        """
+        with self._lock:
+            channel = self._channels.get(token)
+            if channel is None:
+                return
+            channel["active"] = self._clock()
+            channel["state"] = {
+                "progress": message.get("progress"),
+                "log": [],
+                "data": (channel["state"] or {}).get("data", {})
+                | message.get("data", {}),
+            }
+            for queue in channel["subscribers"]:
+                self._put(queue, message)
+
+    def close(
+        self, token: str, message: Optional[dict[str, Any]] = None
+    ) -> None:
+        """
+        Closes the channel for `token` (if open). Subscribers receive
+        `message` followed by `None` as end-of-stream marker.
+        """
+        with self._lock:
+            self._close(token, message)
+
+    def subscribe(self, token: str) -> Optional[Queue]:
+        """
+        Returns a new subscription-queue for `token` or `None` if there
+        is no open channel.
+        """
+        with self._lock:
+            self._expire()
+            channel = self._channels.get(token)
+            if channel is None:
+                return None
+            queue = Queue(maxsize=self.queue_size)
+            if channel["state"] is not None:
+                queue.put_nowait(channel["state"])
+            channel["subscribers"].append(queue)
+            return queue
+
+    def unsubscribe(self, token: str, queue: Queue) -> None:
+        """Removes the subscription-`queue` for `token`."""
+        with self._lock:
+            channel = self._channels.get(token)
+            if channel is not None and queue in channel["subscribers"]:
+                channel["subscribers"].remove(queue)
@@ -0,0 +1,243 @@
+"""
+This module defines the `ResourceMonitor`, `TrackedThreadPoolExecutor`,
+and `ResourceStatistics` components of the Preparation Module-app.
+"""
+
+from typing import Any, Callable, Optional
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from threading import Lock, local
+from time import perf_counter
+import sys
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from dcm_preparation_module.models import ResourceUsage
+from .copier import CopyStatistics
+
+
+class ResourceMonitor:
+    """
+    A `ResourceMonitor` measures the resources used by a job between
+    `start` and `stop` (both have to be called from the thread that
+    runs the job).
+
+    CPU time and I/O are collected per thread (`resource.RUSAGE_THREAD`
+    and the `io`-file of the thread in procfs) for the thread that runs
+    the job and for all tasks that are executed on its behalf in a
+    `TrackedThreadPoolExecutor` (see `track`), i.e., other jobs that
+    run concurrently in the same process are not included. The peak
+    resident set size can only be determined for the entire process.
+    Values that are not available on the current platform are `None`.
+
+    Keyword arguments:
+    io -- path to the I/O-statistics of the current thread
+          (default Path("/proc/thread-self/io"))
+    """
+
+    IO = Path("/proc/thread-self/io")
+    _local = local()
+
+    def __init__(self, io: Optional[Path] = None) -> None:
+        self.io = io or self.IO
+        self._lock = Lock()
+        self._start: Optional[dict[str, Any]] = None
+        self._previous: Optional["ResourceMonitor"] = None
+        self._values: dict[str, Any] = {}
+
+    @classmethod
+    def current(cls) -> Optional["ResourceMonitor"]:
+        """
+        Returns the `ResourceMonitor` of the job that is run by the
+        current thread (or `None`).
+        """
+        return getattr(cls._local, "monitor", None)
+
+    def _read_io(self) -> Optional[dict[str, int]]:
+        """
+        Returns bytes read and written by the current thread via system
+        calls (or `None` if not available).
+        """
+        try:
+            lines = self.io.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return None
+        io = {}
+        for line in lines:
+            key, _, value = line.partition(":")
+            if value.strip().isdigit():
+                io[key.strip()] = int(value)
+        if "rchar" not in io or "wchar" not in io:
+            return None
+        return io
+
+    def _sample(self) -> dict[str, Any]:
+        """Returns current resource usage of the current thread."""
+        return {
+            "rusage": (
+                resource.getrusage(resource.RUSAGE_THREAD)
+                if hasattr(resource, "RUSAGE_THREAD")
+                else None
+            ),
+            "io": self._read_io(),
+        }
+
+    def _add(self, start: dict[str, Any], end: dict[str, Any]) -> None:
+        """Adds the difference between two samples of a thread."""
+        with self._lock:
+            if start["rusage"] is not None and end["rusage"] is not None:
+                for name, field in (
+                    ("cpu_user", "ru_utime"),
+                    ("cpu_system", "ru_stime"),
+                ):
+                    self._values[name] = self._values.get(name, 0) + (
+                        getattr(end["rusage"], field)
+                        - getattr(start["rusage"], field)
+                    )
+            if start["io"] is not None and end["io"] is not None:
+                for name, field in (
+                    ("read_bytes", "rchar"),
+                    ("write_bytes", "wchar"),
+                ):
+                    self._values[name] = self._values.get(name, 0) + (
+                        end["io"][field] - start["io"][field]
+                    )
+
+    def track(self, function: Callable) -> Callable:
+        """
+        Returns a wrapper for `function` that adds the resources used
+        by a call to this measurement (the call is expected to run in
+        a thread other than the one that runs the job).
+        """
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            previous = self.current()
+            self._local.monitor = self
+            start = self._sample()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._add(start, self._sample())
+                self._local.monitor = previous
+
+        return wrapper
+
+    def start(self) -> None:
+        """Starts the measurement."""
+        self._previous = self.current()
+        self._local.monitor = self
+        self._values = {"time": perf_counter()}
+        self._start = self._sample()
+
+    def stop(
+        self, statistics: Optional[CopyStatistics] = None
+    ) -> ResourceUsage:
+        """
+        Returns the `ResourceUsage` since `start` (including the copy
+        counters of `statistics` if given).
+        """
+        if self._start is None:
+            raise RuntimeError("Measurement has not been started.")
+        self._add(self._start, self._sample())
+        self._local.monitor = self._previous
+        with self._lock:
+            values = self._values.copy()
+        usage = ResourceUsage(
+            duration=perf_counter() - values["time"],
+            cpu_user=values.get("cpu_user"),
+            cpu_system=values.get("cpu_system"),
+            read_bytes=values.get("read_bytes"),
+            write_bytes=values.get("write_bytes"),
+        )
+        if resource is not None:
+            # ru_maxrss is given in kilobytes (bytes on macOS)
+            usage.max_rss = resource.getrusage(
+                resource.RUSAGE_SELF
+            ).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+        if statistics is not None:
+            usage.files = statistics.files
+            usage.bytes_ = statistics.bytes_
+        return usage
+
+
+class TrackedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    A `ThreadPoolExecutor` that adds the resources used by its tasks
+    to the `ResourceMonitor` of the submitting thread (if any; see
+    `ResourceMonitor.track`).
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        monitor = ResourceMonitor.current()
+        if monitor is not None:
+            fn = monitor.track(fn)
+        return super().submit(fn, *args, **kwargs)
+
+
+class ResourceStatistics:
+    """
+    Thread-safe aggregation of the `ResourceUsage` of completed jobs
+    (number of jobs as well as total, mean, and maximum per value).
+
+    Since `max_rss` is a peak value of the process, only its maximum
+    is given.
+    """
+
+    # fields of `ResourceUsage` and their keys in `json`
+    FIELDS = {
+        "duration": "duration",
+        "cpu_user": "cpuUser",
+        "cpu_system": "cpuSystem",
+        "max_rss": "maxRss",
+        "read_bytes": "readBytes",
+        "write_bytes": "writeBytes",
+        "files": "files",
+        "bytes_": "bytes",
+    }
+    # fields of `ResourceUsage` for which only the maximum is given
+    PEAK_FIELDS = ("max_rss",)
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.jobs = 0
+        self._values: dict[str, dict[str, float]] = {}
+
+    def add(self, usage: ResourceUsage) -> None:
+        """Adds `usage` of a completed job."""
+        with self._lock:
+            self.jobs += 1
+            for name in self.FIELDS:
+                value = getattr(usage, name)
+                if value is None:
+                    continue
+                values = self._values.setdefault(
+                    name, {"count": 0, "total": 0, "max": value}
+                )
+                values["count"] += 1
+                values["total"] += value
+                values["max"] = max(values["max"], value)
+
+    @property
+    def json(self) -> dict[str, Any]:
+        """
+        Returns the aggregated statistics (values that have not been
+        recorded for any job are omitted).
+        """
+        with self._lock:
+            return {"jobs": self.jobs} | {
+                self.FIELDS[name]: (
+                    {"max": values["max"]}
+                    if name in self.PEAK_FIELDS
+                    else {
+                        "total": values["total"],
+                        "mean": values["total"] / values["count"],
+                        "max": values["max"],
+                    }
+                )
+                for name, values in self._values.items()
+            }
@@ -0,0 +1,146 @@
+"""
+This module defines the `OutputStaging` component
+of the Preparation Module-app.
+"""
+
+from typing import Iterator, Optional
+from pathlib import Path
+from shutil import rmtree
+from uuid import uuid4
+from threading import Event, Thread
+from contextlib import contextmanager
+import os
+
+
+class OutputStaging:
+    """
+    An `OutputStaging` manages hidden staging directories (or files)
+    in an output directory. Results are written into a staging
+    directory and published by a single (atomic) `rename` into their
+    final location in the same directory (and hence on the same
+    filesystem).
+
+    Keyword arguments:
+    root -- output directory
+    """
+
+    PREFIX = ".staging-"
+    HEARTBEAT_INTERVAL = 60.0
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @classmethod
+    def is_staging(cls, path: Path) -> bool:
+        """Returns `True` if `path` is a staging directory (or file)."""
+        return path.name.startswith(cls.PREFIX)
+
+    def create(self, name: Optional[str] = None) -> tuple[Path, Path]:
+        """
+        Creates a staging directory and returns a tuple of the staging
+        directory and the (not yet existing) target directory.
+
+        Keyword arguments:
+        name -- name of the target directory; generated if omitted
+                (an existing staging directory of the same name is
+                reused)
+                (default None)
+        """
+        name = name or str(uuid4())
+        staging = self.root / f"{self.PREFIX}{name}"
+        staging.mkdir(parents=True, exist_ok=True)
+        return staging, self.root / name
+
+    def create_file(
+        self, name: Optional[str] = None, suffix: str = ""
+    ) -> tuple[Path, Path]:
+        """
+        Returns a tuple of the (not yet existing) path of a staging
+        file and the target file (creates the output directory if
+        needed).
+
+        Keyword arguments:
+        name -- name of the target file (without suffix); generated if
+                omitted
+                (default None)
+        suffix -- file suffix like '.tar'
+                  (default "")
+        """
+        name = name or str(uuid4())
+        self.root.mkdir(parents=True, exist_ok=True)
+        return (
+            self.root / f"{self.PREFIX}{name}{suffix}",
+            self.root / f"{name}{suffix}",
+        )
+
+    def publish(self, staging: Path, target: Path) -> Path:
+        """
+        Atomically moves `staging` to `target` and returns `target`.
+        Raises `OSError` if `target` already exists (and is not an
+        empty directory).
+        """
+        if staging.is_dir():
+            os.rename(staging, target)
+        else:
+            # `rename` would replace an existing file
+            os.link(staging, target)
+            staging.unlink()
+        self.checkpoint(staging).unlink(missing_ok=True)
+        # persist directory entry
+        try:
+            fd = os.open(self.root, os.O_RDONLY)
+        except OSError:
+            return target
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+        return target
+
+    @staticmethod
+    def checkpoint(staging: Path) -> Path:
+        """
+        Returns path of the copy-checkpoint file associated with
+        `staging` (located next to the staging directory).
+        """
+        return staging.with_name(staging.name + ".checkpoint")
+
+    @classmethod
+    @contextmanager
+    def heartbeat(
+        cls, staging: Path, interval: Optional[float] = None
+    ) -> Iterator[None]:
+        """
+        Context manager that updates the modification time of `staging`
+        every `interval` seconds (default `HEARTBEAT_INTERVAL`) in a
+        background thread. This marks the staging directory (or file)
+        as active for the `OutputCollector` of every service instance
+        that shares the output directory.
+        """
+        stop = Event()
+
+        def run():
+            while not stop.wait(interval or cls.HEARTBEAT_INTERVAL):
+                try:
+                    os.utime(staging)
+                except OSError:
+                    pass
+
+        thread = Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    @classmethod
+    def discard(cls, staging: Path) -> None:
+        """Removes `staging` and its copy-checkpoint."""
+        if staging.is_dir():
+            rmtree(staging, ignore_errors=True)
+        else:
+            staging.unlink(missing_ok=True)
+        cls.checkpoint(staging).unlink(missing_ok=True)
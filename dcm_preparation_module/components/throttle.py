@@ -0,0 +1,141 @@
+"""
+This module defines the `TokenBucket` and `IOThrottle` components of
+the Preparation Module-app.
+"""
+
+from typing import Callable, Optional
+from collections import deque
+from threading import Lock
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    """
+    A thread-safe `TokenBucket` limits the rate of an arbitrary quantity
+    (like bytes read from storage).
+
+    Tokens are refilled continuously at `rate` per second up to
+    `burst`. Requests larger than the available tokens are granted but
+    put the bucket into debt, i.e., the caller has to wait until the
+    debt has been refilled (see `reserve`). Concurrent consumers
+    therefore share the rate in the order of their requests.
+
+    Keyword arguments:
+    rate -- refill rate in tokens per second
+    burst -- capacity of the bucket
+             (default None; corresponds to one second at `rate`)
+    clock -- clock used for refilling
+             (default `time.monotonic`)
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"Rate has to be positive (got {rate}).")
+        self.rate = rate
+        self.burst = rate if burst is None else burst
+        self._clock = clock
+        self._lock = Lock()
+        self._tokens = self.burst
+        self._last = clock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Takes `amount` tokens from the bucket and returns the time in
+        seconds that the caller has to wait before using them.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class IOThrottle:
+    """
+    An `IOThrottle` limits the I/O of a single job by a combination of
+    `TokenBucket`s (e.g., one shared by all jobs of the service and one
+    for the job itself) and keeps track of the effective rate.
+
+    Keyword arguments:
+    buckets -- list of `TokenBucket`s that all have to grant a request;
+               `None`-entries are ignored
+    window -- length of the time window in seconds over which the
+              effective rate is calculated
+              (default 5.0)
+    clock -- clock used for the effective rate
+             (default `time.monotonic`)
+    sleep_ -- function used to wait for tokens
+              (default `time.sleep`)
+    """
+
+    def __init__(
+        self,
+        buckets: list[Optional[TokenBucket]],
+        window: float = 5.0,
+        clock: Callable[[], float] = monotonic,
+        sleep_: Callable[[float], None] = sleep,
+    ) -> None:
+        self.buckets = [bucket for bucket in buckets if bucket is not None]
+        self.window = window
+        self._clock = clock
+        self._sleep = sleep_
+        self._lock = Lock()
+        self._start = clock()
+        self._history: deque[tuple[float, int]] = deque()
+        self._total = 0
+
+    @property
+    def limit(self) -> Optional[float]:
+        """Returns the lowest configured rate (`None` if unlimited)."""
+        return min((bucket.rate for bucket in self.buckets), default=None)
+
+    def consume(self, amount: int) -> None:
+        """Blocks until `amount` bytes can be read or written."""
+        if amount <= 0:
+            return
+        wait = max(
+            (bucket.reserve(amount) for bucket in self.buckets),
+            default=0.0,
+        )
+        if wait > 0:
+            self._sleep(wait)
+        with self._lock:
+            now = self._clock()
+            self._history.append((now, amount))
+            self._total += amount
+            self._discard(now)
+
+    def _discard(self, now: float) -> None:
+        """Removes entries older than `window` from the history."""
+        while self._history and self._history[0][0] < now - self.window:
+            self._total -= self._history.popleft()[1]
+
+    @property
+    def rate(self) -> float:
+        """Returns the effective rate in bytes per second."""
+        with self._lock:
+            now = self._clock()
+            self._discard(now)
+            elapsed = min(self.window, now - self._start)
+            if elapsed <= 0:
+                return 0.0
+            return self._total / elapsed
+
+    @property
+    def json(self) -> dict:
+        """Returns effective rate and limit in bytes per second."""
+        limit = self.limit
+        return {
+            "rate": int(self.rate),
+            "limit": None if limit is None else int(limit),
+        }
@@ -0,0 +1,159 @@
+"""
+This module defines the `FixityVerifier` component
+of the Preparation Module-app.
+"""
+
+from typing import Callable, Optional
+from pathlib import Path
+import hashlib
+import os
+import re
+
+from dcm_preparation_module.models import VerificationResult
+from .hasher import MultiHasher
+
+
+class FixityVerifier:
+    """
+    A `FixityVerifier` checks that the payload of a (copied) bag is
+    complete and intact.
+
+    Two levels are supported:
+    * "oxum": the number of payload files and bytes (as collected from
+      the filesystem) is compared with the expected Payload-Oxum (fast,
+      detects missing and truncated files) and
+    * "full": in addition, all files are hashed (concurrently and for
+      all algorithms in a single pass) and compared with the
+      payload-manifests of the bag.
+
+    Keyword arguments:
+    hasher -- `MultiHasher` used for the manifest verification
+              (default None; uses a `MultiHasher` with default settings)
+    max_errors -- maximum number of individual errors that are reported
+                  (default 100)
+    """
+
+    _OXUM = re.compile(r"^\s*([0-9]+)\.([0-9]+)\s*$")
+
+    def __init__(
+        self, hasher: Optional[MultiHasher] = None, max_errors: int = 100
+    ) -> None:
+        self.hasher = hasher or MultiHasher()
+        self.max_errors = max_errors
+
+    @classmethod
+    def parse_oxum(cls, value: Optional[str]) -> Optional[tuple[int, int]]:
+        """
+        Returns tuple of bytes and files for the Payload-Oxum `value` or
+        `None` if not valid.
+        """
+        if value is None:
+            return None
+        match = cls._OXUM.match(value)
+        if match is None:
+            return None
+        return int(match.group(1)), int(match.group(2))
+
+    @staticmethod
+    def list_payload(path: Path) -> dict[str, int]:
+        """
+        Returns a mapping of relative paths (like 'data/file.txt') and
+        sizes of all payload files in the bag at `path`.
+        """
+        payload = {}
+        for directory, _, files in os.walk(path / "data"):
+            for file in files:
+                file_path = os.path.join(directory, file)
+                payload[
+                    Path(file_path).relative_to(path).as_posix()
+                ] = os.lstat(file_path).st_size
+        return payload
+
+    @staticmethod
+    def load_manifest(path: Path) -> dict[str, str]:
+        """
+        Returns a mapping of relative paths and digests for the manifest
+        file at `path`.
+        """
+        manifest = {}
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line.strip() == "":
+                continue
+            digest, name = line.split(maxsplit=1)
+            manifest[
+                name.strip()
+                .replace("%0A", "\n")
+                .replace("%0D", "\r")
+                .replace("%25", "%")
+            ] = digest.lower()
+        return manifest
+
+    def verify(
+        self,
+        path: Path,
+        level: str,
+        expected_oxum: Optional[tuple[int, int]],
+        throttle: Optional[Callable[[int], None]] = None,
+    ) -> VerificationResult:
+        """
+        Verifies the payload of the bag at `path` and returns the
+        `VerificationResult`.
+
+        Keyword arguments:
+        path -- path to the bag
+        level -- verification level ("oxum" or "full")
+        expected_oxum -- tuple of expected payload bytes and files;
+                         `None` skips the comparison
+        throttle -- optional callable for limiting the I/O of the
+                    manifest verification (see `MultiHasher`)
+                    (default None)
+        """
+        errors = []
+        payload = self.list_payload(path)
+        oxum = (sum(payload.values()), len(payload))
+        if expected_oxum is not None and oxum != expected_oxum:
+            errors.append(
+                "Payload-Oxum mismatch (expected "
+                + f"'{expected_oxum[0]}.{expected_oxum[1]}', found "
+                + f"'{oxum[0]}.{oxum[1]}')."
+            )
+
+        algorithms = None
+        if level == "full":
+            manifests = {
+                file.name[9:-4]: self.load_manifest(file)
+                for file in sorted(path.glob("manifest-*.txt"))
+                if file.name[9:-4] in hashlib.algorithms_available
+            }
+            algorithms = list(manifests)
+            if not manifests:
+                errors.append("No supported payload-manifest found.")
+            listed = set().union(*manifests.values())
+            for name in sorted(listed - payload.keys()):
+                errors.append(f"Missing payload file '{name}'.")
+            if manifests:
+                for name in sorted(payload.keys() - listed):
+                    errors.append(f"Payload file '{name}' is not listed.")
+            digests = self.hasher.hash_all(
+                {name: path / name for name in sorted(listed & set(payload))},
+                algorithms,
+                throttle=throttle,
+            )
+            for name, digest in digests.items():
+                for algorithm, manifest in manifests.items():
+                    if manifest.get(name) not in (None, digest[algorithm]):
+                        errors.append(
+                            f"Bad {algorithm}-checksum for '{name}'."
+                        )
+
+        if len(errors) > self.max_errors:
+            errors = errors[: self.max_errors] + [
+                f"({len(errors) - self.max_errors} more errors)"
+            ]
+        return VerificationResult(
+            level,
+            len(errors) == 0,
+            payload_oxum=f"{oxum[0]}.{oxum[1]}",
+            algorithms=algorithms,
+            errors=errors or None,
+        )
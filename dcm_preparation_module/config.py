@@ -1,14 +1,106 @@
 """Configuration module for the 'Preparation Module'-app."""
 
 import os
+from typing import Optional
 from pathlib import Path
 from importlib.metadata import version
+from functools import lru_cache
+import json
 
-import yaml
 import dcm_preparation_module_api
 from dcm_common.services import FSConfig, OrchestratedAppConfig
 
 
+def _is_private(path: Path) -> bool:
+    """
+    Returns `True` if `path` is owned by the current user and not
+    writable by others.
+    """
+    stat = path.stat()
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+@lru_cache
+def load_api_document(path: Path, cache: Optional[Path] = None) -> dict:
+    """
+    Returns the parsed API document at `path`.
+
+    Results are cached in-process. If `cache` is given, a pre-parsed
+    (JSON) form of the document is stored in (and loaded from) that
+    file; the cache is invalidated if the document's size or
+    modification time changes. The cache is only used if both file
+    and directory are owned by the current user and not writable by
+    others.
+    """
+    stat = path.stat()
+    key = [str(path), stat.st_size, stat.st_mtime_ns]
+    if cache is not None:
+        try:
+            if _is_private(cache.parent) and _is_private(cache):
+                cached = json.loads(cache.read_text(encoding="utf-8"))
+                if cached["key"] == key:
+                    return cached["document"]
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+
+    # pylint: disable=import-outside-toplevel
+    import yaml
+
+    document = yaml.load(
+        path.read_text(encoding="utf-8"),
+        Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader),
+    )
+    if cache is not None:
+        try:
+            cache.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if _is_private(cache.parent):
+                data = json.dumps({"key": key, "document": document})
+                tmp = cache.with_name(f"{cache.name}.{os.getpid()}")
+                with os.fdopen(
+                    os.open(
+                        tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+                    ),
+                    "w",
+                    encoding="utf-8",
+                ) as file:
+                    file.write(data)
+                tmp.replace(cache)
+        except (OSError, ValueError, TypeError):
+            pass
+    return document
+
+
+def _default_api_document_cache() -> Optional[Path]:
+    """
+    Returns the default location of the API-document cache in the
+    user's cache directory (or `None` if not available).
+    """
+    if os.environ.get("XDG_CACHE_HOME"):
+        return (
+            Path(os.environ["XDG_CACHE_HOME"])
+            / "dcm-preparation-module"
+            / "openapi.json"
+        )
+    try:
+        return (
+            Path.home() / ".cache" / "dcm-preparation-module" / "openapi.json"
+        )
+    except (RuntimeError, KeyError):
+        return None
+
+
+class _LazyAPIDocument:
+    """
+    Descriptor for lazily loading the API document of a config class
+    (based on the attributes `API_DOCUMENT` and `API_DOCUMENT_CACHE`).
+    """
+
+    def __get__(self, instance, owner) -> dict:
+        return load_api_document(
+            owner.API_DOCUMENT, owner.API_DOCUMENT_CACHE
+        )
+
+
 class AppConfig(FSConfig, OrchestratedAppConfig):
     """
     Configuration for the 'Preparation Module'-app.
@@ -16,6 +108,74 @@ class AppConfig(FSConfig, OrchestratedAppConfig):
 
     # ------ PREPARE ------
     PREPARED_IP_OUTPUT = Path(os.environ.get("PREPARED_IP_OUTPUT") or "pip")
+    PREPARED_IP_OUTPUT_ROOTS = (
+        [Path(p) for p in os.environ["PREPARED_IP_OUTPUT_ROOTS"].split(",")]
+        if os.environ.get("PREPARED_IP_OUTPUT_ROOTS")
+        else None
+    )
+    PROGRESS_PUSH_INTERVAL = float(
+        os.environ.get("PROGRESS_PUSH_INTERVAL") or 1.0
+    )
+    PROGRESS_STREAM_HEARTBEAT = float(
+        os.environ.get("PROGRESS_STREAM_HEARTBEAT") or 15.0
+    )
+    PROGRESS_CHANNEL_MAX_IDLE = float(
+        os.environ.get("PROGRESS_CHANNEL_MAX_IDLE") or 3600.0
+    )
+    PROGRESS_MAX_STREAMS = int(os.environ.get("PROGRESS_MAX_STREAMS") or 2)
+    PROGRESS_STREAM_MAX_DURATION = float(
+        os.environ.get("PROGRESS_STREAM_MAX_DURATION") or 600.0
+    )
+    COPY_CHUNK_SIZE = int(
+        os.environ.get("COPY_CHUNK_SIZE") or 8 * 1024 * 1024
+    )
+    CHECKPOINT_DIGEST = os.environ.get("CHECKPOINT_DIGEST")
+    HASH_WORKERS = int(os.environ.get("HASH_WORKERS") or 4)
+    HASH_BUFFER_SIZE = int(os.environ.get("HASH_BUFFER_SIZE") or 1024 * 1024)
+    HASH_MMAP_THRESHOLD = int(os.environ.get("HASH_MMAP_THRESHOLD") or 0)
+    VERIFICATION_LEVEL = os.environ.get("VERIFICATION_LEVEL") or "none"
+    IO_RATE_LIMIT = int(os.environ.get("IO_RATE_LIMIT") or 0)
+    IO_RATE_LIMIT_JOB = int(os.environ.get("IO_RATE_LIMIT_JOB") or 0)
+    PREPARED_IP_STORE = (
+        Path(os.environ["PREPARED_IP_STORE"])
+        if os.environ.get("PREPARED_IP_STORE")
+        else None
+    )
+    PREPARED_IP_STORE_GC_INTERVAL = float(
+        os.environ.get("PREPARED_IP_STORE_GC_INTERVAL") or 3600.0
+    )
+    PREPARED_IP_RETENTION = (
+        float(os.environ["PREPARED_IP_RETENTION"])
+        if os.environ.get("PREPARED_IP_RETENTION")
+        else None
+    )
+    OUTPUT_GC_INTERVAL = float(os.environ.get("OUTPUT_GC_INTERVAL") or 0)
+    OUTPUT_GC_RATE = int(os.environ.get("OUTPUT_GC_RATE") or 1000)
+    OUTPUT_STAGING_RETENTION = float(
+        os.environ.get("OUTPUT_STAGING_RETENTION") or 86400.0
+    )
+    PREPARATION_LANES = (
+        os.environ["PREPARATION_LANES"].split(",")
+        if os.environ.get("PREPARATION_LANES")
+        else ["small"]
+    )
+    PREPARATION_LANE_THRESHOLD = int(
+        os.environ.get("PREPARATION_LANE_THRESHOLD") or 0
+    )
+    ADMISSION_CONTROL = (int(os.environ.get("ADMISSION_CONTROL") or 0)) == 1
+    ADMISSION_MIN_FREE_SPACE = int(
+        os.environ.get("ADMISSION_MIN_FREE_SPACE") or 0
+    )
+    ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE") or 0)
+    ADMISSION_RETRY_AFTER = int(os.environ.get("ADMISSION_RETRY_AFTER") or 60)
+    ADMISSION_RESERVATION_TTL = float(
+        os.environ.get("ADMISSION_RESERVATION_TTL") or 86400.0
+    )
+    CALLBACK_WORKERS = int(os.environ.get("CALLBACK_WORKERS") or 2)
+    CALLBACK_QUEUE_SIZE = int(os.environ.get("CALLBACK_QUEUE_SIZE") or 1000)
+    CALLBACK_MAX_RETRIES = int(os.environ.get("CALLBACK_MAX_RETRIES") or 3)
+    CALLBACK_BACKOFF = float(os.environ.get("CALLBACK_BACKOFF") or 1.0)
+    CALLBACK_TIMEOUT = float(os.environ.get("CALLBACK_TIMEOUT") or 10.0)
     SIGPROP_FILE_PATH = Path("meta/significant_properties.xml")
     SIGPROP_PREMIS_NAMESPACE = "{http://www.loc.gov/premis/v3}"  # parsing only
     SIGPROP_PREMIS_TEMPLATE = """<premis:premis xmlns:premis="http://www.loc.gov/premis/v3" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://www.loc.gov/premis/v3 https://www.loc.gov/standards/premis/premis.xsd" version="3.0">
@@ -47,9 +207,12 @@ class AppConfig(FSConfig, OrchestratedAppConfig):
     API_DOCUMENT = (
         Path(dcm_preparation_module_api.__file__).parent / "openapi.yaml"
     )
-    API = yaml.load(
-        API_DOCUMENT.read_text(encoding="utf-8"), Loader=yaml.SafeLoader
+    API_DOCUMENT_CACHE = (
+        Path(os.environ["API_DOCUMENT_CACHE"])
+        if os.environ.get("API_DOCUMENT_CACHE")
+        else _default_api_document_cache()
     )
+    API = _LazyAPIDocument()
 
     def set_identity(self) -> None:
         super().set_identity()
@@ -0,0 +1,1361 @@
+"""
+This module defines the `PreparationEngine` of the Preparation
+Module-app.
+
+The engine contains the complete preparation logic (copy, metadata
+operations, tag-manifests, and publication) independently of the
+app and the orchestration. It can be embedded as a library:
+    engine = PreparationEngine(AppConfig)
+    outcome = engine.prepare(
+        PreparationConfig(Target(Path("ip"))), Path("pip")
+    )
+"""
+
+from typing import Callable, Optional, TYPE_CHECKING
+from pathlib import Path
+from dataclasses import dataclass, field
+from functools import partial
+from contextlib import contextmanager
+from time import perf_counter
+from threading import Event
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from dcm_common import LoggingContext, Logger
+
+from dcm_preparation_module.models import (
+    PreparationConfig,
+    PreparationResult,
+    OutputFormat,
+    VerificationLevel,
+    Report,
+)
+from dcm_preparation_module.components import (
+    MetadataOperator,
+    ProcessResult,
+    ProgressPublisher,
+    CopyAborted,
+    CopyStatistics,
+    CopyCheckpoint,
+    Copier,
+    ServiceMetrics,
+    OutputStaging,
+    ObjectStore,
+    ArchiveWriter,
+    ArchiveReader,
+    OverlayResolver,
+    MultiHasher,
+    FixityVerifier,
+    TokenBucket,
+    IOThrottle,
+    ResourceMonitor,
+    TrackedThreadPoolExecutor,
+)
+
+if TYPE_CHECKING:
+    from lxml import etree as ET
+    from bagit_utils import Bag
+
+
+# signature of copy-strategies: (source, destination, on_progress,
+# cancelled) -> statistics
+CopyStrategy = Callable[
+    [Path, Path, Callable[[CopyStatistics], None], Callable[[], bool]],
+    CopyStatistics,
+]
+# signature of hash-strategies: (content, algorithms) -> mapping of
+# algorithms and hex-digests; content is either the path of a file or
+# its contents
+HashStrategy = Callable[["Path | bytes", list[str]], dict[str, str]]
+
+
+@dataclass
+class PreparationOutcome:
+    """
+    Outcome of `PreparationEngine.prepare`.
+
+    Keyword arguments:
+    result -- `PreparationResult` of the job (path of the prepared IP,
+              success, and bag-info)
+    log -- log of the job
+    statistics -- `CopyStatistics` of the copy (or archive) stage;
+                  `None` if the job did not get that far
+                  (default None)
+    timings -- durations of the job-stages in seconds
+               (default {})
+    """
+
+    result: PreparationResult
+    log: Logger
+    statistics: Optional[CopyStatistics] = None
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def success(self) -> bool:
+        """Returns `True` if the preparation succeeded."""
+        return bool(self.result.success)
+
+
+class PreparationEngine:
+    """
+    A `PreparationEngine` prepares IPs (directories or archives) based
+    on a `PreparationConfig`. Paths are resolved relative to the
+    working directory.
+
+    Keyword arguments:
+    config -- app config (class or instance) derived from `AppConfig`
+    metrics -- `ServiceMetrics` that are updated during preparation
+               (default None; uses private metrics)
+    metadata_operator -- `MetadataOperator` for the metadata-stages
+                         (default None; uses a new instance)
+    object_store -- optional `ObjectStore` for payload files
+                    (default None)
+    copy_strategy -- optional callable that replaces the default copy
+                     of directory-targets (see `CopyStrategy`)
+                     (default None; uses a `Copier` with
+                     copy-checkpoint and `object_store`)
+    hash_strategy -- optional callable that calculates the digests for
+                     tag-manifests (see `HashStrategy`)
+                     (default None; uses `MultiHasher.hash`)
+    hasher -- `MultiHasher` that distributes hashing over threads
+              (default None; uses a `MultiHasher` configured via
+              `HASH_WORKERS`, `HASH_BUFFER_SIZE`, and
+              `HASH_MMAP_THRESHOLD`)
+    io_bucket -- `TokenBucket` that limits the copy- and hash-I/O of
+                 all jobs of this engine (see `throttle`)
+                 (default None; uses a `TokenBucket` with rate
+                 `IO_RATE_LIMIT` if set)
+    """
+
+    def __init__(
+        self,
+        config,
+        metrics: Optional[ServiceMetrics] = None,
+        metadata_operator: Optional[MetadataOperator] = None,
+        object_store: Optional[ObjectStore] = None,
+        copy_strategy: Optional[CopyStrategy] = None,
+        hash_strategy: Optional[HashStrategy] = None,
+        hasher: Optional[MultiHasher] = None,
+        io_bucket: Optional[TokenBucket] = None,
+    ) -> None:
+        self.config = config
+        self.metrics = metrics or ServiceMetrics()
+        self.metadata_operator = metadata_operator or MetadataOperator(
+            on_regex_evaluation=self.metrics.regex_duration.observe
+        )
+        self.object_store = object_store
+        self.copy_strategy = copy_strategy or self.copy_tree
+        self.hasher = hasher or MultiHasher(
+            workers=config.HASH_WORKERS,
+            buffer_size=config.HASH_BUFFER_SIZE,
+            mmap_threshold=config.HASH_MMAP_THRESHOLD,
+        )
+        self.hash_strategy = hash_strategy or self.hasher.hash
+        self.verifier = FixityVerifier(self.hasher)
+        self.verification = VerificationLevel(config.VERIFICATION_LEVEL)
+        self.io_bucket = io_bucket or (
+            TokenBucket(config.IO_RATE_LIMIT)
+            if config.IO_RATE_LIMIT > 0
+            else None
+        )
+
+    def throttle(self) -> Optional[IOThrottle]:
+        """
+        Returns a new `IOThrottle` for a job that combines `io_bucket`
+        and a `TokenBucket` with rate `IO_RATE_LIMIT_JOB` (or `None` if
+        both are not set).
+        """
+        job_bucket = (
+            TokenBucket(self.config.IO_RATE_LIMIT_JOB)
+            if self.config.IO_RATE_LIMIT_JOB > 0
+            else None
+        )
+        if self.io_bucket is None and job_bucket is None:
+            return None
+        return IOThrottle([self.io_bucket, job_bucket])
+
+    @staticmethod
+    def list_tag_files(path: Path) -> list[Path]:
+        """
+        Returns list of all files in the bag at `path` that are not
+        part of the payload (i.e., not located in 'data/').
+        """
+        files = []
+        for entry in path.iterdir():
+            if entry.name == "data":
+                continue
+            if entry.is_file():
+                files.append(entry)
+            else:
+                files.extend(
+                    file for file in entry.glob("**/*") if file.is_file()
+                )
+        return files
+
+    @staticmethod
+    def load_baginfo(bag: "Bag") -> dict:
+        """
+        Returns contents of 'bag-info.txt'.
+        """
+        return bag.baginfo
+
+    def apply_baginfo(
+        self, bag: "Bag", result: ProcessResult, write_to_disk: bool = True
+    ) -> dict:
+        """
+        Updates contents of `bag.info` (and writes 'bag-info.txt' if
+        `write_to_disk`).
+        """
+        bag.set_baginfo(result.metadata, write_to_disk)
+
+    @staticmethod
+    def serialize_baginfo(baginfo: dict) -> bytes:
+        """
+        Returns contents of 'bag-info.txt' for `baginfo` (formatted
+        like `Bag.set_baginfo`).
+        """
+        # pylint: disable=import-outside-toplevel, protected-access
+        from bagit_utils import Bag
+
+        return "\n".join(
+            [
+                "\n".join(
+                    [Bag._format_baginfo_multiline(k, v_) for v_ in v]
+                )
+                for k, v in baginfo.items()
+                if len(v) > 0
+            ]
+            + [""]
+        ).encode("utf-8")
+
+    @staticmethod
+    def parse_baginfo(data: bytes) -> dict:
+        """
+        Returns bag-info for the contents `data` of 'bag-info.txt'
+        (parsed like `Bag.load_baginfo`).
+        """
+        lines = []
+        for line in data.decode("utf-8").strip().splitlines():
+            if line.strip() == "":
+                continue
+            if line[0] in [" ", "\t"] and lines:
+                # recombine lines with break
+                lines[-1] = lines[-1] + " " + line.lstrip()
+            else:
+                lines.append(line)
+        baginfo = {}
+        for line in lines:
+            key, value = line.split(":", 1)
+            baginfo.setdefault(key.strip(), []).append(value.strip())
+        return baginfo
+
+    @classmethod
+    def load_significant_properties(cls, path: Path, ns: str) -> dict:
+        """
+        Returns existing 'significant_properties.xml'-metadata as dictionary or
+        an empty dict if not existing.
+        """
+
+        # check conditions
+        if not path.is_file():
+            return {}
+
+        # pylint: disable=import-outside-toplevel
+        from lxml import etree as ET
+
+        # parse
+        et = ET.fromstring(path.read_text(encoding="utf-8"))
+        return cls.load_significant_properties_from_tree(et, ns)
+
+    @staticmethod
+    def load_significant_properties_from_tree(
+        sig_prop_et: "ET._Element", ns: str
+    ) -> dict:
+        """
+        Returns 'significant_properties.xml'-metadata as dictionary.
+        """
+        # parse
+        try:
+            significant_properties = sig_prop_et.find(f"{ns}object").findall(
+                f"{ns}significantProperties"
+            )
+        except AttributeError:
+            return {}
+        result = {}
+        for p in significant_properties:
+            type_ = p.find(f"{ns}significantPropertiesType")
+            value = p.find(f"{ns}significantPropertiesValue")
+            if type_ is None or value is None:
+                continue
+            result[type_.text] = value.text
+        return result
+
+    def apply_significant_properties(
+        self,
+        path: Optional[Path],
+        sig_prop_et: "ET._Element",
+        ns: str,
+        result: ProcessResult
+    ) -> None:
+        """
+        Updates significant properties metadata and writes the xml file
+        (skipped if `path` is `None`).
+        """
+        # pylint: disable=import-outside-toplevel
+        from lxml import etree as ET
+
+        # check conditions
+        if not result.metadata:
+            return
+
+        # replace values for existing types
+        existing_types = []
+        for p in sig_prop_et.find(f"{ns}object").findall(
+            f"{ns}significantProperties"
+        ):
+            type_ = p.find(f"{ns}significantPropertiesType")
+            value = p.find(f"{ns}significantPropertiesValue")
+            if type_ is None or value is None:
+                continue
+            existing_types.append(type_.text)
+            value.text = (
+                result.metadata[type_.text]
+                if isinstance(result.metadata[type_.text], str)
+                else result.metadata[type_.text][0]
+            )
+
+        # add values for new types
+        new_types = list(
+            filter(
+                lambda x: x in result.metadata and x not in existing_types,
+                self.config.SIGPROP_TYPES,
+            )
+        )
+        if new_types:
+            # find the parent and add new elements
+            if (parent_el := sig_prop_et.find(
+                f"{ns}{self.config.SIGPROP_PREMIS_SIGNIFICANT_PROPERTY_PARENT}"
+            )) is not None:
+                # --- Adjust indentation after manually adding elements ---
+                # lxml does not automatically reindent when elements are
+                # appended to an existing tree. This ensures pretty-printed
+                # structure for the new elements when the tree is serialized.
+
+                def set_indent(
+                    target_el: "ET._Element",
+                    depth: int,
+                    in_text: bool = False,
+                ):
+                    """
+                    Set indentation for XML nodes by inserting line breaks and
+                    spaces using `.text` and `.tail`.
+
+                    Keyword arguments:
+                    target_el -- target element to set indentation on
+                    depth -- indentation depth
+                    in_text -- If True, set the `.text` attribute.
+                               Otherwise set the `.tail` attribute.
+                               (default False)
+                    """
+                    indent = "\n" + "  " * depth
+                    if in_text:
+                        target_el.text = indent
+                    else:
+                        target_el.tail = indent
+
+                # determine parent depth (number of ancestor levels)
+                depth = len(parent_el.xpath("ancestor::*"))
+                # --- Fix indentation for the opening tag ---
+                if len(siblings := parent_el.getchildren()) > 0:
+                    # in the tail of the last existing sibling
+                    set_indent(siblings[-1], depth + 1)
+                else:
+                    # in the text of the parent element (no prior siblings)
+                    set_indent(parent_el, depth + 1, in_text=True)
+                # create and append new elements
+                template = (
+                    self.config.SIGPROP_PREMIS_SIGNIFICANT_PROPERTY_TEMPLATE
+                )
+                last_index = len(new_types) - 1
+                for i, type_ in enumerate(new_types):
+                    # create new element from XML string template
+                    new_element_str = template.format(
+                        type_=type_,
+                        value=(
+                            result.metadata[type_]
+                            if isinstance(result.metadata[type_], str)
+                            else result.metadata[type_][0]
+                        ),
+                    )
+                    # parse string into an ET._Element
+                    new_element = ET.fromstring(new_element_str)
+                    # --- Fix indentation after each new element ---
+                    # Use deeper indent if another element follows,
+                    # otherwise apply parent-level indent.
+                    set_indent(
+                        new_element, depth + (0 if (i == last_index) else 1)
+                    )
+                    # append element
+                    parent_el.append(new_element)
+
+        # write to file
+        if path is None:
+            return
+        path.write_text(
+            ET.tostring(sig_prop_et, pretty_print=True).decode("utf-8"),
+            encoding="utf-8",
+        )
+
+    def copy_tree(
+        self,
+        src: Path,
+        dst: Path,
+        on_progress: Callable[[CopyStatistics], None],
+        cancelled: Callable[[], bool],
+        checkpoint: Optional[CopyCheckpoint] = None,
+    ) -> CopyStatistics:
+        """
+        Default copy-strategy for directory-targets (resumable via
+        copy-checkpoint, payload files are linked from the object store
+        if available).
+        """
+        return Copier(
+            self.config.COPY_CHUNK_SIZE,
+            on_progress,
+            cancelled,
+            checkpoint or CopyCheckpoint(OutputStaging.checkpoint(dst)),
+            self.config.CHECKPOINT_DIGEST,
+            self.object_store,
+            (
+                None
+                if self.object_store is None
+                else ObjectStore.load_manifest(src)
+            ),
+        ).copy(src, dst)
+
+    def copy_tags(
+        self,
+        src: Path,
+        dst: Path,
+        on_progress: Callable[[CopyStatistics], None],
+        cancelled: Callable[[], bool],
+    ) -> CopyStatistics:
+        """
+        Copy-strategy for the tag-overlay output format (copies all
+        files except the payload).
+        """
+        return Copier(
+            self.config.COPY_CHUNK_SIZE, on_progress, cancelled
+        ).copy(
+            src,
+            dst,
+            ignore=lambda directory, names: (
+                ["data"] if Path(directory) == Path(src) else []
+            ),
+        )
+
+    def tag_manifests(
+        self,
+        tag_files: dict[str, "Path | bytes"],
+        throttle: Optional[IOThrottle] = None,
+    ) -> dict[str, bytes]:
+        """
+        Returns tag-manifests (file name and contents) for `tag_files`
+        (names relative to the bag and either paths or contents). The
+        algorithms are chosen like in `Bag.set_tag_manifests`, i.e.,
+        those of the existing payload-manifests or the strongest
+        available algorithm. Reading files is limited by `throttle`.
+        """
+        # pylint: disable=import-outside-toplevel
+        from bagit_utils import Bag
+
+        algorithms = [
+            a
+            for a in Bag.CHECKSUM_ALGORITHMS
+            if f"manifest-{a}.txt" in tag_files
+        ] or [Bag.CHECKSUM_ALGORITHMS[-1]]
+        # every file is read once for all algorithms
+        time0 = perf_counter()
+        digests = self.hasher.hash_all(
+            tag_files,
+            algorithms,
+            self.hash_strategy,
+            None if throttle is None else throttle.consume,
+        )
+        tag_manifests = {
+            f"tagmanifest-{a}.txt": (
+                "\n".join(
+                    f"{digests[name][a]} {name}" for name in sorted(tag_files)
+                )
+                + "\n"
+            ).encode("utf-8")
+            for a in algorithms
+        }
+        self.metrics.hash_duration.observe(perf_counter() - time0)
+        self.metrics.hashed_bytes.inc(
+            len(algorithms)
+            * sum(
+                (
+                    content.stat().st_size
+                    if isinstance(content, Path)
+                    else len(content)
+                )
+                for content in tag_files.values()
+            )
+        )
+        return tag_manifests
+
+    @contextmanager
+    def _measure(self, stage: str, timings: dict[str, float]):
+        """Context manager for measuring the duration of a job-stage."""
+        time0 = perf_counter()
+        try:
+            yield
+        finally:
+            duration = perf_counter() - time0
+            timings[stage] = timings.get(stage, 0.0) + duration
+            self.metrics.stage_duration.observe(duration, stage=stage)
+
+    def prepare(
+        self,
+        preparation_config: PreparationConfig,
+        output: Path,
+        token: Optional[str] = None,
+        progress: Optional[ProgressPublisher] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> PreparationOutcome:
+        """
+        Prepares the IP given by `preparation_config` in the output
+        directory `output` and returns the `PreparationOutcome`. The
+        resources used by the job (see `ResourceMonitor`) are recorded
+        in its result.
+
+        Keyword arguments:
+        preparation_config -- `PreparationConfig` of the job
+        output -- output directory
+        token -- name of the prepared IP (and its staging directory)
+                 (default None; generates a random name)
+        progress -- `ProgressPublisher` for progress-updates; its
+                    report collects log and result
+                    (default None; uses a publisher without context)
+        cancelled -- optional callable that is checked regularly
+                     during copy; if it returns `True`, the job is
+                     aborted
+                     (default None)
+        """
+        token = token or str(uuid4())
+        throttle = self.throttle()
+        monitor = ResourceMonitor()
+        monitor.start()
+        if progress is None:
+            progress = ProgressPublisher(None, Report(host=""))
+            progress.report.log.set_default_origin("Preparation Module")
+        cancelled = cancelled or (lambda: False)
+        report = progress.report
+        timings = {}
+        statistics = None
+
+        def outcome() -> PreparationOutcome:
+            report.data.resources = monitor.stop(statistics)
+            return PreparationOutcome(
+                report.data, report.log, statistics, timings
+            )
+
+        # set progress info
+        report.progress.verbose = (
+            f"preparing IP from '{preparation_config.target.path}'"
+        )
+        progress.log(
+            LoggingContext.INFO,
+            body=f"Preparing IP from '{preparation_config.target.path}'.",
+        )
+        if (
+            preparation_config.output_format
+            not in (None, OutputFormat.DIRECTORY)
+            and (preparation_config.verification or self.verification)
+            is not VerificationLevel.NONE
+        ):
+            progress.log(
+                LoggingContext.WARNING,
+                body="Fixity verification is not supported for output "
+                + f"format '{preparation_config.output_format.value}' "
+                + "and is skipped.",
+            )
+        progress.flush()
+
+        # Create staging directory for the prepared IP or exit if not
+        # successful
+        staging = OutputStaging(output)
+        archive_format = (
+            preparation_config.output_format.value
+            if preparation_config.output_format
+            in (OutputFormat.TAR, OutputFormat.ZIP)
+            else None
+        )
+        try:
+            if archive_format is None:
+                # staging directory is derived from the job token so that
+                # a re-run after a crashed worker can resume the copy
+                staging_path, target = staging.create(token)
+            else:
+                staging_path, target = staging.create_file(
+                    token, f".{archive_format}"
+                )
+        except OSError as exc_info:
+            report.data.success = False
+            progress.log(
+                LoggingContext.ERROR,
+                body="Unable to generate output directory in "
+                + f"'{staging.root.resolve()}': {exc_info}",
+            )
+            progress.flush()
+            return outcome()
+        report.progress.verbose = f"copying IP to '{staging_path}'"
+        progress.log(
+            LoggingContext.INFO,
+            body=f"Preparing IP at '{target}' (staging in '{staging_path}').",
+        )
+        progress.flush()
+
+        try:
+            # mark staging as active for all instances
+            with staging.heartbeat(staging_path):
+                if preparation_config.output_format is OutputFormat.OVERLAY:
+                    statistics = self._prepare_overlay(
+                        preparation_config,
+                        staging_path,
+                        progress,
+                        cancelled,
+                        timings,
+                        throttle,
+                    )
+                elif archive_format is None:
+                    statistics = self._prepare_staged(
+                        preparation_config,
+                        staging_path,
+                        progress,
+                        cancelled,
+                        timings,
+                        throttle,
+                    )
+                else:
+                    statistics = self._prepare_archive(
+                        preparation_config,
+                        staging_path,
+                        archive_format,
+                        progress,
+                        cancelled,
+                        timings,
+                        throttle,
+                    )
+        except Exception:
+            # remove partial output of failed job
+            staging.discard(staging_path)
+            raise
+        except BaseException:
+            # keep staging directory and copy-checkpoint of an
+            # interrupted job (e.g., if the worker is shut down) such
+            # that a re-run can resume the copy (orphans are removed by
+            # the `OutputCollector`); other outputs and cancelled jobs
+            # are not resumed
+            if (
+                archive_format is not None
+                or preparation_config.output_format is OutputFormat.OVERLAY
+                or cancelled()
+            ):
+                staging.discard(staging_path)
+            raise
+
+        if statistics is None or not report.data.success:
+            staging.discard(staging_path)
+            progress.flush()
+            return outcome()
+
+        # publish prepared IP
+        try:
+            report.data.path = staging.publish(staging_path, target)
+        except OSError as exc_info:
+            staging.discard(staging_path)
+            report.data.success = False
+            progress.log(
+                LoggingContext.ERROR,
+                body=f"Unable to publish prepared IP at '{target}': "
+                + f"{exc_info}",
+            )
+            progress.flush()
+            return outcome()
+
+        # log success
+        progress.log(
+            LoggingContext.INFO,
+            body=f"Successfully prepared IP at '{report.data.path}'.",
+        )
+        progress.flush()
+        return outcome()
+
+    @staticmethod
+    def _copy_progress(
+        verb: str,
+        output: Path,
+        progress: ProgressPublisher,
+        throttle: Optional[IOThrottle],
+    ) -> Callable[[CopyStatistics], None]:
+        """
+        Returns `on_progress`-callback for the copy- (or archive-)stage
+        that publishes the `CopyStatistics` and limits the copied bytes
+        via `throttle` (the copy is paused inside the callback).
+        """
+        copied = 0
+
+        def on_progress(statistics: CopyStatistics) -> None:
+            nonlocal copied
+            if throttle is None:
+                progress.report.progress.verbose = (
+                    f"{verb} IP to '{output}' ({statistics.files} files, "
+                    + f"{statistics.bytes_} bytes)"
+                )
+                progress.push(copy=statistics.json)
+                return
+            throttle.consume(statistics.bytes_ - copied)
+            copied = statistics.bytes_
+            progress.report.progress.verbose = (
+                f"{verb} IP to '{output}' ({statistics.files} files, "
+                + f"{statistics.bytes_} bytes, {int(throttle.rate)} "
+                + "bytes/s)"
+            )
+            progress.push(copy=statistics.json, throttle=throttle.json)
+
+        return on_progress
+
+    def _process_stage(
+        self,
+        stage: str,
+        src_md: dict,
+        operations: list,
+        timings: dict[str, float],
+        failed: Event,
+    ) -> ProcessResult:
+        """
+        Processes a single metadata-stage (executed in a worker thread).
+        Sets `failed` if the stage did not succeed.
+        """
+        try:
+            with self._measure(stage, timings):
+                result = self.metadata_operator.process(
+                    source_metadata=src_md,
+                    operations=operations,
+                )
+        except BaseException:
+            failed.set()
+            raise
+        if LoggingContext.ERROR in result.log:
+            failed.set()
+        return result
+
+    def _submit_stages(
+        self,
+        executor: ThreadPoolExecutor,
+        stages: list[tuple],
+        timings: dict[str, float],
+        failed: Event,
+    ) -> list[tuple]:
+        """
+        Submits the metadata-stages `stages` (given as tuples of stage
+        name, source metadata, operations, and apply-callable) to
+        `executor`. Returns list of tuples of stage name, future, and
+        apply-callable (stages without operations are omitted).
+        """
+        return [
+            (
+                stage,
+                executor.submit(
+                    self._process_stage,
+                    stage,
+                    src_md,
+                    operations,
+                    timings,
+                    failed,
+                ),
+                apply,
+            )
+            for stage, src_md, operations, apply in stages
+            if operations
+        ]
+
+    def _complete_stages(
+        self,
+        preparation_config: PreparationConfig,
+        progress: ProgressPublisher,
+        stages: list[tuple],
+    ) -> bool:
+        """
+        Waits for the submitted metadata-stages `stages` (see
+        `_submit_stages`) in order, merges their logs, and applies their
+        results. Returns `False` if a stage failed.
+        """
+        report = progress.report
+        for stage, future, apply in stages:
+            if not future.done():
+                report.progress.verbose = f"running stage '{stage}'"
+                progress.flush()
+            operator_result = future.result()
+            progress.merge(operator_result.log)
+            progress.push()
+
+            # exit if preparation failed
+            if LoggingContext.ERROR in report.log:
+                report.data.success = False
+                progress.log(
+                    LoggingContext.ERROR,
+                    body="Preparing IP from "
+                    + f"'{preparation_config.target.path}'"
+                    + f" failed during stage '{stage}'.",
+                )
+                return False
+
+            apply(operator_result)
+        return True
+
+    def _load_sig_prop_et(self, content: Optional["Path | bytes"]):
+        """
+        Returns significant properties ET for the contents of an
+        existing file or from template (if `content` is `None`).
+        """
+        # pylint: disable=import-outside-toplevel
+        from lxml import etree as ET
+
+        if content is None:
+            # create empty tree from template
+            return ET.fromstring(self.config.SIGPROP_PREMIS_TEMPLATE)
+        # parse existing file
+        return ET.fromstring(
+            content.read_text(encoding="utf-8")
+            if isinstance(content, Path)
+            else content.decode("utf-8")
+        )
+
+    def _prepare_staged(
+        self,
+        preparation_config: PreparationConfig,
+        output: Path,
+        progress: ProgressPublisher,
+        cancelled: Callable[[], bool],
+        timings: dict[str, float],
+        throttle: Optional[IOThrottle] = None,
+    ) -> Optional[CopyStatistics]:
+        """
+        Prepares IP in the staging directory `output`. Returns the
+        `CopyStatistics` or `None` if the copy has been aborted. The
+        result is indicated by `progress.report.data.success`.
+
+        The metadata-stages are run on the tag files of the target
+        concurrently with the copy; their results are written to
+        `output` once the copy is complete.
+        """
+        verification = preparation_config.verification or self.verification
+        # archive-targets are extracted into `output` (copy-checkpoints
+        # and the object store only apply to directories)
+        if preparation_config.target.path.is_file():
+            with ArchiveReader(
+                preparation_config.target.path, self.config.COPY_CHUNK_SIZE
+            ) as reader:
+                return self._copy_and_process(
+                    preparation_config,
+                    reader,
+                    output,
+                    progress,
+                    cancelled,
+                    timings,
+                    verification=verification,
+                    throttle=throttle,
+                )
+        return self._copy_and_process(
+            preparation_config,
+            None,
+            output,
+            progress,
+            cancelled,
+            timings,
+            verification=verification,
+            throttle=throttle,
+        )
+
+    def _copy_and_process(
+        self,
+        preparation_config: PreparationConfig,
+        reader: Optional[ArchiveReader],
+        output: Path,
+        progress: ProgressPublisher,
+        cancelled: Callable[[], bool],
+        timings: dict[str, float],
+        copy: Optional[CopyStrategy] = None,
+        verification: VerificationLevel = VerificationLevel.NONE,
+        throttle: Optional[IOThrottle] = None,
+    ) -> Optional[CopyStatistics]:
+        """
+        Implementation of `_prepare_staged` for a directory-target
+        (`reader` is `None`; copied via `copy` or `copy_strategy`) or an
+        archive-target (read via `reader`). The copied payload is
+        verified according to `verification`.
+        """
+        # heavy imports are deferred until the first job
+        # pylint: disable=import-outside-toplevel
+        from bagit_utils import Bag
+
+        report = progress.report
+        src = preparation_config.target.path
+        sig_prop_name = Path(self.config.SIGPROP_FILE_PATH).as_posix()
+
+        # load metadata from the target
+        if reader is None:
+            src_baginfo = self.load_baginfo(Bag(src))
+            sig_prop_et = self._load_sig_prop_et(
+                src / sig_prop_name
+                if (src / sig_prop_name).is_file()
+                else None
+            )
+        else:
+            src_baginfo = self.parse_baginfo(
+                reader.read("bag-info.txt")
+                if "bag-info.txt" in reader.names
+                else b""
+            )
+            sig_prop_et = self._load_sig_prop_et(
+                reader.read(sig_prop_name)
+                if sig_prop_name in reader.names
+                else None
+            )
+        bag = Bag(output)
+
+        # copy target IP to output path
+        on_copy_progress = self._copy_progress(
+            "copying", output, progress, throttle
+        )
+
+        # a failed metadata-stage aborts the copy as well
+        failed = Event()
+
+        def abort() -> bool:
+            return failed.is_set() or cancelled()
+
+        copy = copy or self.copy_strategy
+        if reader is None and copy == self.copy_tree:
+            checkpoint = CopyCheckpoint(OutputStaging.checkpoint(output))
+            copy = partial(self.copy_tree, checkpoint=checkpoint)
+            if len(checkpoint) > 0:
+                progress.log(
+                    LoggingContext.INFO,
+                    body=f"Resuming copy into '{output}' ({len(checkpoint)} "
+                    + "files already copied).",
+                )
+                progress.flush()
+        with TrackedThreadPoolExecutor(max_workers=2) as executor:
+            stages = self._submit_stages(
+                executor,
+                [
+                    (
+                        "bagInfoOperations",
+                        src_baginfo,
+                        preparation_config.baginfo_operations,
+                        partial(self.apply_baginfo, bag),
+                    ),
+                    (
+                        "sigPropOperations",
+                        self.load_significant_properties_from_tree(
+                            sig_prop_et,
+                            self.config.SIGPROP_PREMIS_NAMESPACE,
+                        ),
+                        preparation_config.sig_prop_operations,
+                        partial(
+                            self.apply_significant_properties,
+                            output / sig_prop_name,
+                            sig_prop_et,
+                            self.config.SIGPROP_PREMIS_NAMESPACE,
+                        ),
+                    ),
+                ],
+                timings,
+                failed,
+            )
+            try:
+                with self._measure("copy", timings):
+                    if reader is not None:
+                        reader.on_progress = on_copy_progress
+                        reader.cancelled = abort
+                        statistics = reader.extract(output)
+                    else:
+                        statistics = copy(src, output, on_copy_progress, abort)
+            except CopyAborted:
+                if failed.is_set() and not cancelled():
+                    # log failure of metadata-stage
+                    self._complete_stages(preparation_config, progress, stages)
+                    return None
+                report.data.success = False
+                progress.log(
+                    LoggingContext.ERROR,
+                    body="Preparing IP from "
+                    + f"'{preparation_config.target.path}'"
+                    + " has been aborted during copy.",
+                )
+                return None
+            self.metrics.copied_files.inc(statistics.files)
+            self.metrics.copied_bytes.inc(statistics.bytes_)
+            self.metrics.linked_files.inc(statistics.linked_files)
+            self.metrics.linked_bytes.inc(statistics.linked_bytes)
+            progress.flush(copy=statistics.json)
+
+            # verify payload of the copy
+            if verification is not VerificationLevel.NONE and not self._verify(
+                output,
+                verification,
+                self._expected_oxum(src, reader, src_baginfo),
+                progress,
+                timings,
+                throttle,
+            ):
+                return statistics
+
+            # apply results of metadata-stages to the copy
+            if not self._complete_stages(preparation_config, progress, stages):
+                return statistics
+
+        # Collect baginfo
+        report.data.baginfo_metadata = self.load_baginfo(bag)
+
+        # Generate new tag-manifest files
+        report.progress.verbose = "generating tag-manifests"
+        progress.push()
+        with self._measure("tagManifests", timings):
+            tag_manifests = self.tag_manifests(
+                {
+                    file.relative_to(output).as_posix(): file
+                    for file in self.list_tag_files(output)
+                    if not file.name.startswith("tagmanifest-")
+                },
+                throttle,
+            )
+            for file in output.glob("tagmanifest-*.txt"):
+                file.unlink()
+            for name, content in tag_manifests.items():
+                (output / name).write_bytes(content)
+
+        report.data.success = True
+        return statistics
+
+    @staticmethod
+    def _expected_oxum(
+        src: Path, reader: Optional[ArchiveReader], baginfo: dict
+    ) -> tuple[int, int]:
+        """
+        Returns expected payload bytes and files for the target `src`
+        (from its 'Payload-Oxum' or, if not available, the payload of
+        the target).
+        """
+        oxum = FixityVerifier.parse_oxum(
+            (baginfo.get("Payload-Oxum") or [None])[0]
+        )
+        if oxum is not None:
+            return oxum
+        if reader is None:
+            payload = FixityVerifier.list_payload(src)
+            return sum(payload.values()), len(payload)
+        payload = [name for name in reader.names if name.startswith("data/")]
+        return sum(reader.size(name) for name in payload), len(payload)
+
+    def _verify(
+        self,
+        output: Path,
+        level: VerificationLevel,
+        expected_oxum: tuple[int, int],
+        progress: ProgressPublisher,
+        timings: dict[str, float],
+        throttle: Optional[IOThrottle] = None,
+    ) -> bool:
+        """
+        Verifies the payload in `output` and records the result in the
+        report. Returns `False` if the verification failed.
+        """
+        report = progress.report
+        report.progress.verbose = f"verifying IP in '{output}'"
+        progress.flush()
+        with self._measure("verification", timings):
+            time0 = perf_counter()
+            result = self.verifier.verify(
+                output,
+                level.value,
+                expected_oxum,
+                None if throttle is None else throttle.consume,
+            )
+            if result.algorithms:
+                self.metrics.hash_duration.observe(perf_counter() - time0)
+                self.metrics.hashed_bytes.inc(
+                    len(result.algorithms) * expected_oxum[0]
+                )
+        report.data.verification = result
+        if result.success:
+            progress.log(
+                LoggingContext.INFO,
+                body=f"Verified payload in '{output}' (level "
+                + f"'{level.value}', Payload-Oxum '{result.payload_oxum}').",
+            )
+            return True
+        report.data.success = False
+        progress.log(
+            LoggingContext.ERROR,
+            body=f"Verification (level '{level.value}') of payload in "
+            + f"'{output}' failed: "
+            + " ".join(result.errors),
+        )
+        return False
+
+    def _prepare_overlay(
+        self,
+        preparation_config: PreparationConfig,
+        output: Path,
+        progress: ProgressPublisher,
+        cancelled: Callable[[], bool],
+        timings: dict[str, float],
+        throttle: Optional[IOThrottle] = None,
+    ) -> Optional[CopyStatistics]:
+        """
+        Prepares IP as tag-overlay in the staging directory `output`,
+        i.e., only tag files are written and the payload is referenced
+        (see `OverlayResolver`). Returns the `CopyStatistics` or `None`
+        if the copy has been aborted. The result is indicated by
+        `progress.report.data.success`.
+        """
+        if preparation_config.target.path.is_file():
+            progress.report.data.success = False
+            progress.log(
+                LoggingContext.ERROR,
+                body=f"Output format '{OutputFormat.OVERLAY.value}' "
+                + "requires a directory as target.",
+            )
+            return None
+        statistics = self._copy_and_process(
+            preparation_config,
+            None,
+            output,
+            progress,
+            cancelled,
+            timings,
+            copy=self.copy_tags,
+            throttle=throttle,
+        )
+        if statistics is not None and progress.report.data.success:
+            OverlayResolver.write_reference(
+                output, preparation_config.target.path
+            )
+        return statistics
+
+    def _prepare_archive(
+        self,
+        preparation_config: PreparationConfig,
+        output: Path,
+        format_: str,
+        progress: ProgressPublisher,
+        cancelled: Callable[[], bool],
+        timings: dict[str, float],
+        throttle: Optional[IOThrottle] = None,
+    ) -> Optional[CopyStatistics]:
+        """
+        Prepares IP by streaming it directly into the archive file
+        `output` (no intermediate directory is created; modified tag
+        files and tag-manifests are generated in memory). Returns the
+        `CopyStatistics` or `None` if writing has been aborted. The
+        result is indicated by `progress.report.data.success`.
+
+        The metadata-stages are run concurrently with writing the
+        payload; tag files and tag-manifests are appended afterwards.
+        """
+        if not preparation_config.target.path.is_file():
+            return self._write_archive(
+                preparation_config,
+                None,
+                output,
+                format_,
+                progress,
+                cancelled,
+                timings,
+                throttle,
+            )
+        with ArchiveReader(
+            preparation_config.target.path, self.config.COPY_CHUNK_SIZE
+        ) as reader:
+            return self._write_archive(
+                preparation_config,
+                reader,
+                output,
+                format_,
+                progress,
+                cancelled,
+                timings,
+                throttle,
+            )
+
+    def _write_archive(
+        self,
+        preparation_config: PreparationConfig,
+        reader: Optional[ArchiveReader],
+        output: Path,
+        format_: str,
+        progress: ProgressPublisher,
+        cancelled: Callable[[], bool],
+        timings: dict[str, float],
+        throttle: Optional[IOThrottle] = None,
+    ) -> Optional[CopyStatistics]:
+        """
+        Implementation of `_prepare_archive` for a directory-target
+        (`reader` is `None`) or an archive-target (read via `reader`).
+        """
+        # heavy imports are deferred until the first job
+        # pylint: disable=import-outside-toplevel
+        from lxml import etree as ET
+        from bagit_utils import Bag
+
+        report = progress.report
+        src = preparation_config.target.path
+        sig_prop_name = Path(self.config.SIGPROP_FILE_PATH).as_posix()
+        if reader is None:
+            tag_files: dict[str, Path | bytes] = {
+                file.relative_to(src).as_posix(): file
+                for file in self.list_tag_files(src)
+                if not file.name.startswith("tagmanifest-")
+            }
+        else:
+            tag_files = {
+                name: reader.read(name)
+                for name in reader.names
+                if not name.startswith("data/")
+                and not name.rsplit("/", 1)[-1].startswith("tagmanifest-")
+            }
+        bag = Bag(src)
+        if reader is not None:
+            bag.set_baginfo(
+                self.parse_baginfo(tag_files.get("bag-info.txt", b"")),
+                write_to_disk=False,
+            )
+        sig_prop_et = self._load_sig_prop_et(tag_files.get(sig_prop_name))
+
+        # prepare metadata (results are kept in memory)
+        def apply_baginfo(result: ProcessResult) -> None:
+            self.apply_baginfo(bag, result, write_to_disk=False)
+            tag_files["bag-info.txt"] = self.serialize_baginfo(bag.baginfo)
+
+        def apply_significant_properties(result: ProcessResult) -> None:
+            self.apply_significant_properties(
+                None,
+                sig_prop_et,
+                self.config.SIGPROP_PREMIS_NAMESPACE,
+                result,
+            )
+            if result.metadata:
+                tag_files[sig_prop_name] = ET.tostring(
+                    sig_prop_et, pretty_print=True
+                )
+
+        # write archive
+        on_progress = self._copy_progress(
+            "writing", output, progress, throttle
+        )
+
+        # a failed metadata-stage aborts writing the payload as well
+        failed = Event()
+
+        def abort() -> bool:
+            return failed.is_set() or cancelled()
+
+        root = output.name.removeprefix(OutputStaging.PREFIX).removesuffix(
+            f".{format_}"
+        )
+        with TrackedThreadPoolExecutor(max_workers=2) as executor:
+            stages = self._submit_stages(
+                executor,
+                [
+                    (
+                        "bagInfoOperations",
+                        self.load_baginfo(bag),
+                        preparation_config.baginfo_operations,
+                        apply_baginfo,
+                    ),
+                    (
+                        "sigPropOperations",
+                        self.load_significant_properties_from_tree(
+                            sig_prop_et,
+                            self.config.SIGPROP_PREMIS_NAMESPACE,
+                        ),
+                        preparation_config.sig_prop_operations,
+                        apply_significant_properties,
+                    ),
+                ],
+                timings,
+                failed,
+            )
+            try:
+                with self._measure("archive", timings), ArchiveWriter(
+                    output,
+                    format_,
+                    self.config.COPY_CHUNK_SIZE,
+                    on_progress,
+                    abort,
+                ) as writer:
+                    # payload
+                    if reader is None:
+                        writer.add_tree(f"{root}/data", src / "data")
+                    else:
+                        for name in reader.names:
+                            if not name.startswith("data/"):
+                                continue
+                            with reader.open_file(name) as file:
+                                writer.add_fileobj(
+                                    f"{root}/{name}",
+                                    file,
+                                    reader.size(name),
+                                    reader.mtime(name),
+                                )
+
+                    # apply results of metadata-stages
+                    if not self._complete_stages(
+                        preparation_config, progress, stages
+                    ):
+                        return None
+
+                    # Collect baginfo
+                    report.data.baginfo_metadata = self.load_baginfo(bag)
+
+                    # Generate new tag-manifests
+                    report.progress.verbose = "generating tag-manifests"
+                    progress.push()
+                    with self._measure("tagManifests", timings):
+                        tag_manifests = self.tag_manifests(
+                            tag_files, throttle
+                        )
+
+                    # tag files
+                    for name, content in sorted(tag_files.items()):
+                        if isinstance(content, Path):
+                            writer.add_file(f"{root}/{name}", content)
+                        else:
+                            writer.add_bytes(f"{root}/{name}", content)
+                    for name, content in tag_manifests.items():
+                        writer.add_bytes(f"{root}/{name}", content)
+            except CopyAborted:
+                if failed.is_set() and not cancelled():
+                    # log failure of metadata-stage
+                    self._complete_stages(preparation_config, progress, stages)
+                    return None
+                report.data.success = False
+                progress.log(
+                    LoggingContext.ERROR,
+                    body="Preparing IP from "
+                    + f"'{preparation_config.target.path}'"
+                    + " has been aborted while writing the archive.",
+                )
+                return None
+        statistics = writer.statistics
+        self.metrics.copied_files.inc(statistics.files)
+        self.metrics.copied_bytes.inc(statistics.bytes_)
+        progress.flush(copy=statistics.json)
+
+        report.data.success = True
+        return statistics
@@ -15,7 +15,10 @@ from dcm_preparation_module.models import (
     FindAndReplaceOperation,
     FindAndReplaceLiteralOperation,
     OperationType,
+    OutputFormat,
+    VerificationLevel,
 )
+from dcm_preparation_module.components import ArchiveReader
 
 
 class DPOperationType(String):
@@ -41,6 +44,53 @@ class DPOperationType(String):
         return operation_type, msg, status
 
 
+class DPOutputFormat(String):
+    def make(self, json, loc):
+        output_format, msg, status = super().make(json, loc)
+        if status == Responses.GOOD.status:
+            return OutputFormat(output_format), msg, status
+        return output_format, msg, status
+
+
+class DPVerificationLevel(String):
+    def make(self, json, loc):
+        level, msg, status = super().make(json, loc)
+        if status == Responses.GOOD.status:
+            return VerificationLevel(level), msg, status
+        return level, msg, status
+
+
+class DPTargetPath(TargetPath):
+    """
+    `TargetPath` that accepts directories and (tar- or zip-)archive
+    files.
+    """
+
+    def __init__(self, cwd: Path, **kwargs):
+        super().__init__(_relative_to=cwd, cwd=cwd, **kwargs)
+        self._target_cwd = cwd
+
+    def make(self, json, loc):
+        path, msg, status = super().make(json, loc)
+        if status == Responses.GOOD.status and not (
+            (self._target_cwd / path).is_dir()
+            or ArchiveReader.is_archive(self._target_cwd / path)
+        ):
+            return (
+                None,
+                f"Argument '{loc}' has to be a directory or a tar- or "
+                + "zip-archive.",
+                Responses().BAD_VALUE.status,
+            )
+        return path, msg, status
+
+
+progress_handler = Object(
+    properties={Property("token", required=True): String()},
+    accept_only=["token"],
+).assemble()
+
+
 def get_preparation_handler(cwd: Path):
     """
     Returns parameterized handler (based on cwd from app_config)
@@ -149,8 +199,8 @@ def get_preparation_handler(cwd: Path):
                     Property("target", required=True): Object(
                         model=Target,
                         properties={
-                            Property("path", required=True): TargetPath(
-                                _relative_to=cwd, cwd=cwd, is_dir=True
+                            Property("path", required=True): DPTargetPath(
+                                cwd
                             )
                         },
                         accept_only=["path"],
@@ -179,11 +229,21 @@ def get_preparation_handler(cwd: Path):
                         | find_and_replace_operation_object
                         | find_and_replace_literal_operation_object
                     ),
+                    Property(
+                        "outputFormat", "output_format", required=False
+                    ): DPOutputFormat(enum=[f.value for f in OutputFormat]),
+                    Property("verification", required=False): (
+                        DPVerificationLevel(
+                            enum=[level.value for level in VerificationLevel]
+                        )
+                    ),
                 },
                 accept_only=[
                     "target",
                     "bagInfoOperations",
                     "sigPropOperations",
+                    "outputFormat",
+                    "verification",
                 ],
             ),
             Property("token"): UUID(),
@@ -10,7 +10,14 @@ from .operations import (
     FindAndReplaceLiteralOperationItem,
     FindAndReplaceLiteralOperation,
 )
-from .preparation_config import PreparationConfig
+from .preparation_config import (
+    OutputFormat,
+    VerificationLevel,
+    PreparationConfig,
+)
+from .callback_status import CallbackStatus
+from .verification_result import VerificationResult
+from .resource_usage import ResourceUsage
 from .report import Report
 from .preparation_result import PreparationResult
 
@@ -26,7 +33,12 @@ __all__ = [
     "FindAndReplaceOperation",
     "FindAndReplaceLiteralOperationItem",
     "FindAndReplaceLiteralOperation",
+    "OutputFormat",
+    "VerificationLevel",
     "PreparationConfig",
+    "CallbackStatus",
+    "VerificationResult",
+    "ResourceUsage",
     "Report",
     "PreparationResult",
 ]
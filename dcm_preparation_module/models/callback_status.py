@@ -0,0 +1,37 @@
+"""
+CallbackStatus data-model definition
+"""
+
+from typing import Optional
+from dataclasses import dataclass
+
+from dcm_common.models import DataModel
+
+
+@dataclass
+class CallbackStatus(DataModel):
+    """
+    CallbackStatus `DataModel`
+
+    Keyword arguments:
+    url -- callback url
+    status -- delivery status; one of "pending", "delivered", "failed"
+              (default "pending")
+    attempts -- number of delivery attempts
+                (default 0)
+    error -- error message of the latest failed attempt
+             (default None)
+    """
+
+    url: str
+    status: str = "pending"
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @DataModel.serialization_handler("error")
+    @classmethod
+    def error_serialization_handler(cls, value):
+        """Performs `error`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
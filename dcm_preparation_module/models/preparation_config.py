@@ -4,6 +4,7 @@ ValidationConfig data-model definition
 
 from typing import Optional
 from dataclasses import dataclass
+from enum import Enum
 
 from dcm_common.models import DataModel, JSONObject
 
@@ -11,6 +12,23 @@ from .target import Target
 from .operations import BaseOperation, OPERATIONS_INDEX
 
 
+class OutputFormat(Enum):
+    """Enum class for the output format of a prepared IP."""
+
+    DIRECTORY = "directory"
+    TAR = "tar"
+    ZIP = "zip"
+    OVERLAY = "overlay"
+
+
+class VerificationLevel(Enum):
+    """Enum class for the fixity verification level of a prepared IP."""
+
+    NONE = "none"
+    OXUM = "oxum"
+    FULL = "full"
+
+
 @dataclass
 class PreparationConfig(DataModel):
     """
@@ -25,11 +43,20 @@ class PreparationConfig(DataModel):
                            on the significant properties/PREMIS metadata
                            of the target
                            (default None)
+    output_format -- output format of the prepared IP; `None`
+                     corresponds to `OutputFormat.DIRECTORY`
+                     (default None)
+    verification -- fixity verification level for the payload of the
+                    prepared IP; `None` corresponds to the level
+                    configured via `VERIFICATION_LEVEL`
+                    (default None)
     """
 
     target: Target
     baginfo_operations: Optional[list[BaseOperation]] = None
     sig_prop_operations: Optional[list[BaseOperation]] = None
+    output_format: Optional[OutputFormat] = None
+    verification: Optional[VerificationLevel] = None
 
     @DataModel.serialization_handler(
         "baginfo_operations", "bagInfoOperations"
@@ -51,6 +78,22 @@ class PreparationConfig(DataModel):
             DataModel.skip()
         return [operation.json for operation in value]
 
+    @DataModel.serialization_handler("output_format", "outputFormat")
+    @classmethod
+    def output_format_serialization_handler(cls, value):
+        """Performs `output_format`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value.value
+
+    @DataModel.serialization_handler("verification")
+    @classmethod
+    def verification_serialization_handler(cls, value):
+        """Performs `verification`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value.value
+
     @classmethod
     def from_json(cls, json: JSONObject):
         """
@@ -60,6 +103,10 @@ class PreparationConfig(DataModel):
         "operations"-type attributes.
         """
         kwargs = {"target": Target(json["target"]["path"])}
+        if json.get("outputFormat") is not None:
+            kwargs["output_format"] = OutputFormat(json["outputFormat"])
+        if json.get("verification") is not None:
+            kwargs["verification"] = VerificationLevel(json["verification"])
 
         for name, json_name in [
             ("baginfo_operations", "bagInfoOperations"),
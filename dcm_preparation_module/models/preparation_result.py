@@ -8,6 +8,10 @@ from dataclasses import dataclass
 
 from dcm_common.models import DataModel
 
+from .callback_status import CallbackStatus
+from .verification_result import VerificationResult
+from .resource_usage import ResourceUsage
+
 
 @dataclass
 class PreparationResult(DataModel):
@@ -18,11 +22,18 @@ class PreparationResult(DataModel):
     path -- path to output directory relative to shared file system
     success -- overall success of the job
     baginfo_metadata -- metadata collected from bag-info.txt
+    callback -- delivery status of the callback (if requested)
+    verification -- result of the fixity verification of the payload
+                    (if enabled)
+    resources -- resources used by the job
     """
 
     path: Optional[Path] = None
     success: Optional[bool] = None
     baginfo_metadata: dict[str, list[str]] = None
+    callback: Optional[CallbackStatus] = None
+    verification: Optional[VerificationResult] = None
+    resources: Optional[ResourceUsage] = None
 
     @DataModel.serialization_handler("path")
     @classmethod
@@ -55,3 +66,51 @@ class PreparationResult(DataModel):
         if value is None:
             DataModel.skip()
         return value
+
+    @DataModel.serialization_handler("callback")
+    @classmethod
+    def callback_serialization_handler(cls, value):
+        """Performs `callback`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value.json
+
+    @DataModel.deserialization_handler("callback")
+    @classmethod
+    def callback_deserialization(cls, value):
+        """Performs `callback`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return CallbackStatus.from_json(value)
+
+    @DataModel.serialization_handler("verification")
+    @classmethod
+    def verification_serialization_handler(cls, value):
+        """Performs `verification`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value.json
+
+    @DataModel.deserialization_handler("verification")
+    @classmethod
+    def verification_deserialization(cls, value):
+        """Performs `verification`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return VerificationResult.from_json(value)
+
+    @DataModel.serialization_handler("resources")
+    @classmethod
+    def resources_serialization_handler(cls, value):
+        """Performs `resources`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value.json
+
+    @DataModel.deserialization_handler("resources")
+    @classmethod
+    def resources_deserialization(cls, value):
+        """Performs `resources`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return ResourceUsage.from_json(value)
@@ -0,0 +1,175 @@
+"""
+ResourceUsage data-model definition
+"""
+
+from typing import Optional
+from dataclasses import dataclass
+
+from dcm_common.models import DataModel
+
+
+@dataclass
+class ResourceUsage(DataModel):
+    """
+    ResourceUsage `DataModel`
+
+    The value `max_rss` is collected for the entire process, i.e., it
+    is a process gauge that can include other jobs.
+
+    Keyword arguments:
+    duration -- wall-clock time of the job in seconds
+                (default None)
+    cpu_user -- CPU time of the job spent in user mode in seconds
+                (default None)
+    cpu_system -- CPU time of the job spent in system mode in seconds
+                  (default None)
+    max_rss -- peak resident set size of the process (up to the end of
+               the job) in bytes
+               (default None)
+    read_bytes -- number of bytes read by the job via system calls
+                  (default None)
+    write_bytes -- number of bytes written by the job via system calls
+                   (default None)
+    files -- number of files copied
+             (default None)
+    bytes_ -- number of bytes copied
+              (default None)
+    """
+
+    duration: Optional[float] = None
+    cpu_user: Optional[float] = None
+    cpu_system: Optional[float] = None
+    max_rss: Optional[int] = None
+    read_bytes: Optional[int] = None
+    write_bytes: Optional[int] = None
+    files: Optional[int] = None
+    bytes_: Optional[int] = None
+
+    @DataModel.serialization_handler("duration")
+    @classmethod
+    def duration_serialization_handler(cls, value):
+        """Performs `duration`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.deserialization_handler("duration")
+    @classmethod
+    def duration_deserialization(cls, value):
+        """Performs `duration`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.serialization_handler("cpu_user", "cpuUser")
+    @classmethod
+    def cpu_user_serialization_handler(cls, value):
+        """Performs `cpu_user`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.deserialization_handler("cpu_user", "cpuUser")
+    @classmethod
+    def cpu_user_deserialization(cls, value):
+        """Performs `cpu_user`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.serialization_handler("cpu_system", "cpuSystem")
+    @classmethod
+    def cpu_system_serialization_handler(cls, value):
+        """Performs `cpu_system`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.deserialization_handler("cpu_system", "cpuSystem")
+    @classmethod
+    def cpu_system_deserialization(cls, value):
+        """Performs `cpu_system`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.serialization_handler("max_rss", "maxRss")
+    @classmethod
+    def max_rss_serialization_handler(cls, value):
+        """Performs `max_rss`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.deserialization_handler("max_rss", "maxRss")
+    @classmethod
+    def max_rss_deserialization(cls, value):
+        """Performs `max_rss`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.serialization_handler("read_bytes", "readBytes")
+    @classmethod
+    def read_bytes_serialization_handler(cls, value):
+        """Performs `read_bytes`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.deserialization_handler("read_bytes", "readBytes")
+    @classmethod
+    def read_bytes_deserialization(cls, value):
+        """Performs `read_bytes`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.serialization_handler("write_bytes", "writeBytes")
+    @classmethod
+    def write_bytes_serialization_handler(cls, value):
+        """Performs `write_bytes`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.deserialization_handler("write_bytes", "writeBytes")
+    @classmethod
+    def write_bytes_deserialization(cls, value):
+        """Performs `write_bytes`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.serialization_handler("files")
+    @classmethod
+    def files_serialization_handler(cls, value):
+        """Performs `files`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.deserialization_handler("files")
+    @classmethod
+    def files_deserialization(cls, value):
+        """Performs `files`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.serialization_handler("bytes_", "bytes")
+    @classmethod
+    def bytes__serialization_handler(cls, value):
+        """Performs `bytes_`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.deserialization_handler("bytes_", "bytes")
+    @classmethod
+    def bytes__deserialization(cls, value):
+        """Performs `bytes_`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
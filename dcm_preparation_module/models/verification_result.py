@@ -0,0 +1,64 @@
+"""
+VerificationResult data-model definition
+"""
+
+from typing import Optional
+from dataclasses import dataclass
+
+from dcm_common.models import DataModel
+
+
+@dataclass
+class VerificationResult(DataModel):
+    """
+    VerificationResult `DataModel`
+
+    Keyword arguments:
+    level -- verification level; one of "oxum", "full"
+    success -- whether the payload of the prepared IP matches the
+               source
+    payload_oxum -- Payload-Oxum ("<bytes>.<files>") of the prepared IP
+                    (default None)
+    algorithms -- hash algorithms used for the manifest verification
+                  (default None)
+    errors -- list of detected problems
+              (default None)
+    """
+
+    level: str
+    success: bool
+    payload_oxum: Optional[str] = None
+    algorithms: Optional[list[str]] = None
+    errors: Optional[list[str]] = None
+
+    @DataModel.serialization_handler("payload_oxum", "payloadOxum")
+    @classmethod
+    def payload_oxum_serialization_handler(cls, value):
+        """Performs `payload_oxum`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.deserialization_handler("payload_oxum", "payloadOxum")
+    @classmethod
+    def payload_oxum_deserialization(cls, value):
+        """Performs `payload_oxum`-deserialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.serialization_handler("algorithms")
+    @classmethod
+    def algorithms_serialization_handler(cls, value):
+        """Performs `algorithms`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
+
+    @DataModel.serialization_handler("errors")
+    @classmethod
+    def errors_serialization_handler(cls, value):
+        """Performs `errors`-serialization."""
+        if value is None:
+            DataModel.skip()
+        return value
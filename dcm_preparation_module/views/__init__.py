@@ -1,5 +1,9 @@
 from .preparation import PreparationView
+from .metrics import MetricsView
+from .statistics import StatisticsView
 
 __all__ = [
-    "PreparationView"
+    "PreparationView",
+    "MetricsView",
+    "StatisticsView",
 ]
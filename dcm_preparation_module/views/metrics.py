@@ -0,0 +1,37 @@
+"""
+Metrics View-class definition
+"""
+
+from flask import Blueprint, Response
+from dcm_common import services
+
+from dcm_preparation_module.config import AppConfig
+from dcm_preparation_module.components import ServiceMetrics
+
+
+class MetricsView(services.View):
+    """
+    View-class for exposing service metrics in the Prometheus text
+    format.
+
+    Keyword arguments:
+    config -- app config
+    metrics -- `ServiceMetrics` that are exposed
+    """
+
+    NAME = "metrics"
+
+    def __init__(
+        self, config: AppConfig, metrics: ServiceMetrics, *args, **kwargs
+    ) -> None:
+        super().__init__(config, *args, **kwargs)
+        self.metrics = metrics
+
+    def configure_bp(self, bp: Blueprint, *args, **kwargs) -> None:
+        @bp.route("/metrics", methods=["GET"])
+        def metrics():
+            """Returns service metrics."""
+            return Response(
+                self.metrics.render(),
+                content_type="text/plain; version=0.0.4",
+            )
@@ -3,43 +3,191 @@ Preparation View-class definition
 """
 
 from typing import Optional
-from shutil import copytree
 from pathlib import Path
 from functools import partial
+from time import perf_counter, monotonic
+from threading import BoundedSemaphore, Lock
 import os
+import json
+from queue import Empty
 from uuid import uuid4
 
-from lxml import etree as ET
-from bagit_utils import Bag
 from flask import Blueprint, jsonify, Response, request
 from data_plumber_http.decorators import flask_handler, flask_args, flask_json
 from dcm_common import LoggingContext
-from dcm_common.util import get_output_path
 from dcm_common.orchestra import JobConfig, JobContext, JobInfo
 from dcm_common import services
 
 from dcm_preparation_module.config import AppConfig
-from dcm_preparation_module.models import PreparationConfig, Report
-from dcm_preparation_module.handlers import get_preparation_handler
-from dcm_preparation_module.components import MetadataOperator, ProcessResult
+from dcm_preparation_module.models import (
+    PreparationConfig,
+    Report,
+    CallbackStatus,
+    OutputFormat,
+    VerificationLevel,
+)
+from dcm_preparation_module.handlers import (
+    get_preparation_handler,
+    progress_handler,
+)
+from dcm_preparation_module.components import (
+    MetadataOperator,
+    ProgressPublisher,
+    ProgressBroker,
+    CancellationRegistry,
+    CallbackDispatcher,
+    ServiceMetrics,
+    ObjectStore,
+    AdmissionController,
+    OutputCollector,
+    OutputSelector,
+    ResourceStatistics,
+)
+from dcm_preparation_module.engine import PreparationEngine
 
 
 class PreparationView(services.OrchestratedView):
     """View-class for ip-preparation."""
 
     NAME = "ip-preparation"
+    # job types per lane (small jobs keep the original job type)
+    LANES = {"small": NAME, "large": f"{NAME}-large"}
 
     def __init__(self, config: AppConfig, *args, **kwargs) -> None:
         super().__init__(config, *args, **kwargs)
 
+        # initialize metrics
+        self.metrics = ServiceMetrics(
+            queue_ttl=self.config.ADMISSION_RESERVATION_TTL
+        )
+        self.resource_statistics = ResourceStatistics()
+
         # initialize MetadataOperator
-        self.metadata_operator = MetadataOperator()
+        self.metadata_operator = MetadataOperator(
+            on_regex_evaluation=self.metrics.regex_duration.observe
+        )
 
-    def register_job_types(self):
-        self.config.worker_pool.register_job_type(
-            self.NAME, self.prepare, Report
+        # initialize broker for progress-streams
+        self.progress_broker = ProgressBroker(
+            max_idle=self.config.PROGRESS_CHANNEL_MAX_IDLE
+        )
+        # every open stream occupies a server thread
+        self.progress_streams = (
+            BoundedSemaphore(self.config.PROGRESS_MAX_STREAMS)
+            if self.config.PROGRESS_MAX_STREAMS > 0
+            else None
+        )
+
+        # initialize asynchronous callback delivery
+        if self.config.CALLBACK_WORKERS > 0:
+            self.callback_dispatcher = CallbackDispatcher(
+                workers=self.config.CALLBACK_WORKERS,
+                queue_size=self.config.CALLBACK_QUEUE_SIZE,
+                max_retries=self.config.CALLBACK_MAX_RETRIES,
+                backoff=self.config.CALLBACK_BACKOFF,
+                timeout=self.config.CALLBACK_TIMEOUT,
+            )
+            self.metrics.callbacks_pending.function = (
+                lambda: self.callback_dispatcher.pending
+            )
+        else:
+            self.callback_dispatcher = None
+
+        # initialize content-addressed store for payload files
+        self.object_store = None
+        if self.config.PREPARED_IP_STORE is not None:
+            self.object_store = ObjectStore(
+                self.config.FS_MOUNT_POINT / self.config.PREPARED_IP_STORE
+            )
+        self._object_store_lock = Lock()
+        self._object_store_collected = monotonic()
+
+        # initialize engine for the job instructions
+        self.engine = PreparationEngine(
+            self.config,
+            metrics=self.metrics,
+            metadata_operator=self.metadata_operator,
+            object_store=self.object_store,
         )
 
+        # output roots (relative to FS_MOUNT_POINT)
+        self.output_roots = self.config.PREPARED_IP_OUTPUT_ROOTS or [
+            self.config.PREPARED_IP_OUTPUT
+        ]
+
+        # initialize cancellation-flags for running jobs (shared via
+        # markers in the output roots)
+        self.cancellation = CancellationRegistry(
+            [self.config.FS_MOUNT_POINT / root for root in self.output_roots],
+            ttl=self.config.ADMISSION_RESERVATION_TTL,
+        )
+
+        # initialize garbage collection for the output directories
+        self.output_collector = OutputCollector(
+            [self.config.FS_MOUNT_POINT / root for root in self.output_roots],
+            retention=self.config.PREPARED_IP_RETENTION,
+            staging_retention=self.config.OUTPUT_STAGING_RETENTION,
+            rate=self.config.OUTPUT_GC_RATE,
+            is_active=self.cancellation.__contains__,
+            exclude=(
+                None
+                if self.object_store is None
+                else [self.object_store.root]
+            ),
+        )
+
+        # initialize admission control
+        self.admission = None
+        if self.config.ADMISSION_CONTROL:
+            self.admission = AdmissionController(
+                self.config.FS_MOUNT_POINT / self.output_roots[0],
+                min_free_space=self.config.ADMISSION_MIN_FREE_SPACE,
+                max_queue=self.config.ADMISSION_MAX_QUEUE,
+                retry_after=self.config.ADMISSION_RETRY_AFTER,
+                reservation_ttl=self.config.ADMISSION_RESERVATION_TTL,
+                queue_depth=self.metrics.queue_depth.get,
+            )
+            self.metrics.reserved_bytes.function = (
+                lambda: self.admission.reserved
+            )
+
+        # initialize selection of output roots
+        self.output_selector = OutputSelector(
+            self.output_roots,
+            cwd=self.config.FS_MOUNT_POINT,
+            reserved=(
+                None
+                if self.admission is None
+                else lambda root: self.admission.reserved_for(
+                    self.config.FS_MOUNT_POINT / root
+                )
+            ),
+        )
+
+    def register_job_types(self):
+        for lane in self.config.PREPARATION_LANES:
+            if lane not in self.LANES:
+                raise ValueError(
+                    f"Unknown preparation lane '{lane}' (expected one of "
+                    + f"{list(self.LANES)})."
+                )
+            self.config.worker_pool.register_job_type(
+                self.LANES[lane], self.prepare, Report
+            )
+
+    def select_lane(self, size: Optional[int]) -> str:
+        """
+        Returns the lane for a job with an estimated IP-size of `size`
+        bytes.
+        """
+        if (
+            size is not None
+            and self.config.PREPARATION_LANE_THRESHOLD > 0
+            and size > self.config.PREPARATION_LANE_THRESHOLD
+        ):
+            return "large"
+        return "small"
+
     def configure_bp(self, bp: Blueprint, *args, **kwargs) -> None:
 
         @bp.route("/prepare", methods=["POST"])
@@ -57,16 +205,61 @@ class PreparationView(services.OrchestratedView):
             callback_url: Optional[str] = None,
         ):
             """Prepare IP for SIP-transformation."""
+            if preparation.verification not in (
+                None,
+                VerificationLevel.NONE,
+            ) and preparation.output_format not in (
+                None,
+                OutputFormat.DIRECTORY,
+            ):
+                return Response(
+                    "Submission rejected: Fixity verification is not "
+                    + "supported for output format "
+                    + f"'{preparation.output_format.value}'.",
+                    mimetype="text/plain",
+                    status=422,
+                )
+            token = token or str(uuid4())
+            size = None
+            if (
+                self.admission is not None
+                or self.config.PREPARATION_LANE_THRESHOLD > 0
+            ):
+                try:
+                    size = AdmissionController.estimate(
+                        self.config.FS_MOUNT_POINT / preparation.target.path
+                    )
+                except OSError:
+                    pass
+            output = self.output_selector.select(
+                preparation.target.path, size or 0
+            )
+            if self.admission is not None:
+                rejection = self.admission.admit(
+                    token, size or 0, self.config.FS_MOUNT_POINT / output
+                )
+                if rejection is not None:
+                    self.metrics.jobs_rejected.inc()
+                    return Response(
+                        f"Submission rejected: {rejection[1]}",
+                        mimetype="text/plain",
+                        status=rejection[0],
+                        headers={
+                            "Retry-After": str(self.admission.retry_after)
+                        },
+                    )
+            lane = self.select_lane(size)
             try:
                 token = self.config.controller.queue_push(
-                    token or str(uuid4()),
+                    token,
                     JobInfo(
                         JobConfig(
-                            self.NAME,
+                            self.LANES[lane],
                             original_body=request.json,
                             request_body={
                                 "preparation": preparation.json,
                                 "callback_url": callback_url,
+                                "output": str(output),
                             },
                         ),
                         report=Report(
@@ -76,302 +269,279 @@ class PreparationView(services.OrchestratedView):
                 )
             # pylint: disable=broad-exception-caught
             except Exception as exc_info:
+                if self.admission is not None:
+                    self.admission.release(token)
+                self.metrics.jobs_rejected.inc()
                 return Response(
                     f"Submission rejected: {exc_info}",
                     mimetype="text/plain",
                     status=500,
                 )
+            self.metrics.jobs_submitted.inc()
+            self.metrics.queued(token.value)
+            self.metrics.lane_submissions.inc(lane=lane)
 
             return jsonify(token.json), 201
 
-        self._register_abort_job(bp, "/prepare")
-
-    @staticmethod
-    def load_baginfo(bag: Bag) -> dict:
-        """
-        Returns contents of 'bag-info.txt'.
-        """
-        return bag.baginfo
-
-    def apply_baginfo(self, bag: Bag, result: ProcessResult) -> dict:
-        """
-        Updates contents of `bag.info`.
-        """
-        bag.set_baginfo(result.metadata)
-
-    @classmethod
-    def load_significant_properties(cls, path: Path, ns: str) -> dict:
-        """
-        Returns existing 'significant_properties.xml'-metadata as dictionary or
-        an empty dict if not existing.
-        """
+        @bp.before_request
+        def cancel_job():
+            """
+            Sets cancellation-flag of jobs (in this process directly,
+            in other processes via markers in the output roots if the
+            job is queued or running here) and removes queued jobs from
+            queue depth and admission before forwarding abort-requests.
+            """
+            if (
+                request.method == "DELETE"
+                and request.path.rstrip("/").endswith("/prepare")
+                and request.args.get("token") is not None
+            ):
+                token = request.args["token"]
+                queued = self.metrics.dequeued(token)
+                if queued and self.admission is not None:
+                    self.admission.release(token)
+                self.cancellation.cancel(
+                    token, shared=queued or token in self.cancellation
+                )
 
-        # check conditions
-        if not path.is_file():
-            return {}
+        self._register_abort_job(bp, "/prepare")
 
-        # parse
-        et = ET.fromstring(path.read_text(encoding="utf-8"))
-        return cls.load_significant_properties_from_tree(et, ns)
+        @bp.route("/progress", methods=["GET"])
+        @flask_handler(
+            handler=progress_handler,
+            json=flask_args,
+        )
+        def progress(token: str):
+            """Stream progress of a job as server-sent events."""
+            if (
+                self.progress_streams is not None
+                and not self.progress_streams.acquire(blocking=False)
+            ):
+                return Response(
+                    "Too many open progress-streams "
+                    + f"({self.config.PROGRESS_MAX_STREAMS}).",
+                    mimetype="text/plain",
+                    status=503,
+                    headers={
+                        "Retry-After": str(
+                            max(int(self.config.PROGRESS_STREAM_HEARTBEAT), 1)
+                        )
+                    },
+                )
+            queue = self.progress_broker.subscribe(token)
+            if queue is None:
+                if self.progress_streams is not None:
+                    self.progress_streams.release()
+                return Response(
+                    f"No running job with token '{token}' in this instance.",
+                    mimetype="text/plain",
+                    status=404,
+                )
 
-    @staticmethod
-    def load_significant_properties_from_tree(
-        sig_prop_et: ET._Element, ns: str
-    ) -> dict:
-        """
-        Returns 'significant_properties.xml'-metadata as dictionary.
-        """
-        # parse
-        try:
-            significant_properties = sig_prop_et.find(f"{ns}object").findall(
-                f"{ns}significantProperties"
+            def stream():
+                # heartbeats detect clients that have hung up (the
+                # generator is closed on the failed write)
+                heartbeat = self.config.PROGRESS_STREAM_HEARTBEAT
+                end = monotonic() + self.config.PROGRESS_STREAM_MAX_DURATION
+                try:
+                    while True:
+                        timeout = min(heartbeat, end - monotonic())
+                        if timeout <= 0:
+                            yield "event: timeout\ndata: {}\n\n"
+                            return
+                        try:
+                            message = queue.get(timeout=timeout)
+                        except Empty:
+                            self.progress_broker.expire()
+                            yield ": heartbeat\n\n"
+                            continue
+                        if message is None:
+                            return
+                        event = (
+                            "complete"
+                            if message.get("complete")
+                            else "progress"
+                        )
+                        yield (
+                            f"event: {event}\n"
+                            + f"data: {json.dumps(message)}\n\n"
+                        )
+                finally:
+                    self.progress_broker.unsubscribe(token, queue)
+
+            response = Response(
+                stream(),
+                mimetype="text/event-stream",
+                headers={
+                    "Cache-Control": "no-cache",
+                    "X-Accel-Buffering": "no",
+                },
             )
-        except AttributeError:
-            return {}
-        result = {}
-        for p in significant_properties:
-            type_ = p.find(f"{ns}significantPropertiesType")
-            value = p.find(f"{ns}significantPropertiesValue")
-            if type_ is None or value is None:
-                continue
-            result[type_.text] = value.text
-        return result
-
-    def apply_significant_properties(
-        self,
-        path: Path,
-        sig_prop_et: ET._Element,
-        ns: str,
-        result: ProcessResult
+
+            def release():
+                # also runs if the stream has never been started
+                self.progress_broker.unsubscribe(token, queue)
+                if self.progress_streams is not None:
+                    self.progress_streams.release()
+
+            response.call_on_close(release)
+            return response
+
+    # metadata-helpers have moved to the `PreparationEngine`; aliases
+    # are kept for compatibility
+    list_tag_files = staticmethod(PreparationEngine.list_tag_files)
+    load_baginfo = staticmethod(PreparationEngine.load_baginfo)
+    load_significant_properties = (
+        PreparationEngine.load_significant_properties
+    )
+    load_significant_properties_from_tree = staticmethod(
+        PreparationEngine.load_significant_properties_from_tree
+    )
+
+    def _complete(
+        self, context: JobContext, info: JobInfo, **data
     ) -> None:
         """
-        Updates significant properties metadata and writes the xml file.
+        Completes job by closing the progress-stream and making the
+        callback.
+
+        If a `CallbackDispatcher` is available, the callback is
+        delivered by the dispatcher (with retries) without blocking the
+        job. The final delivery status is recorded in the report and
+        pushed to the controller by the dispatcher's completion hook.
+        Otherwise, or if the dispatcher's queue is exhausted, the
+        callback is made directly.
         """
-        # check conditions
-        if not result.metadata:
-            return
-
-        # replace values for existing types
-        existing_types = []
-        for p in sig_prop_et.find(f"{ns}object").findall(
-            f"{ns}significantProperties"
-        ):
-            type_ = p.find(f"{ns}significantPropertiesType")
-            value = p.find(f"{ns}significantPropertiesValue")
-            if type_ is None or value is None:
-                continue
-            existing_types.append(type_.text)
-            value.text = (
-                result.metadata[type_.text]
-                if isinstance(result.metadata[type_.text], str)
-                else result.metadata[type_.text][0]
-            )
-
-        # add values for new types
-        new_types = list(
-            filter(
-                lambda x: x in result.metadata and x not in existing_types,
-                self.config.SIGPROP_TYPES,
-            )
+        info.report.progress.complete()
+        self.progress_broker.close(
+            info.token.value,
+            {
+                "progress": info.report.progress.verbose,
+                "log": [],
+                "data": data | {"success": info.report.data.success},
+                "complete": True,
+            },
         )
-        if new_types:
-            # find the parent and add new elements
-            if (parent_el := sig_prop_et.find(
-                f"{ns}{self.config.SIGPROP_PREMIS_SIGNIFICANT_PROPERTY_PARENT}"
-            )) is not None:
-                # --- Adjust indentation after manually adding elements ---
-                # lxml does not automatically reindent when elements are
-                # appended to an existing tree. This ensures pretty-printed
-                # structure for the new elements when the tree is serialized.
-
-                def set_indent(
-                    target_el: ET._Element,
-                    depth: int,
-                    in_text: bool = False,
-                ):
-                    """
-                    Set indentation for XML nodes by inserting line breaks and
-                    spaces using `.text` and `.tail`.
-
-                    Keyword arguments:
-                    target_el -- target element to set indentation on
-                    depth -- indentation depth
-                    in_text -- If True, set the `.text` attribute.
-                               Otherwise set the `.tail` attribute.
-                               (default False)
-                    """
-                    indent = "\n" + "  " * depth
-                    if in_text:
-                        target_el.text = indent
-                    else:
-                        target_el.tail = indent
-
-                # determine parent depth (number of ancestor levels)
-                depth = len(parent_el.xpath("ancestor::*"))
-                # --- Fix indentation for the opening tag ---
-                if len(siblings := parent_el.getchildren()) > 0:
-                    # in the tail of the last existing sibling
-                    set_indent(siblings[-1], depth + 1)
-                else:
-                    # in the text of the parent element (no prior siblings)
-                    set_indent(parent_el, depth + 1, in_text=True)
-                # create and append new elements
-                last_index = len(new_types) - 1
-                for i, type_ in enumerate(new_types):
-                    # create new element from XML string template
-                    new_element_str = self.config.SIGPROP_PREMIS_SIGNIFICANT_PROPERTY_TEMPLATE.format(
-                        type_=type_,
-                        value=(
-                            result.metadata[type_]
-                            if isinstance(result.metadata[type_], str)
-                            else result.metadata[type_][0]
-                        ),
-                    )
-                    # parse string into an ET._Element
-                    new_element = ET.fromstring(new_element_str)
-                    # --- Fix indentation after each new element ---
-                    # Use deeper indent if another element follows,
-                    # otherwise apply parent-level indent.
-                    set_indent(
-                        new_element, depth + (0 if (i == last_index) else 1)
+
+        callback_url = info.config.request_body.get("callback_url")
+        time0 = perf_counter()
+        if callback_url is not None and self.callback_dispatcher is not None:
+            info.report.data.callback = CallbackStatus(callback_url)
+            context.push()
+
+            def on_done(status: CallbackStatus) -> None:
+                self.metrics.callback_duration.observe(perf_counter() - time0)
+                info.report.data.callback = status
+                if status.status == "failed":
+                    info.report.log.log(
+                        LoggingContext.ERROR,
+                        body=f"Failed callback to '{callback_url}' after "
+                        + f"{status.attempts} attempt(s): {status.error}",
                     )
-                    # append element
-                    parent_el.append(new_element)
+                context.push()
 
-        # write to file
-        path.write_text(
-            ET.tostring(sig_prop_et, pretty_print=True).decode("utf-8"),
-            encoding="utf-8",
-        )
+            if self.callback_dispatcher.submit(
+                callback_url, info.token.json, on_done
+            ):
+                return
+            info.report.data.callback = None
+
+        # make callback; rely on _run_callback to push progress-update
+        self._run_callback(context, info, callback_url)
+        if callback_url is not None:
+            self.metrics.callback_duration.observe(perf_counter() - time0)
 
     def prepare(self, context: JobContext, info: JobInfo):
         """Job instructions for the '/prepare' endpoint."""
+        self.progress_broker.open(info.token.value)
+        self.cancellation.register(info.token.value)
+        self.metrics.dequeued(info.token.value)
+        self.metrics.jobs_started.inc()
+        self.metrics.jobs_running.inc()
+        time0 = perf_counter()
+        try:
+            self._prepare(context, info)
+        finally:
+            # no-op if already closed via `_complete`
+            self.progress_broker.close(info.token.value)
+            self.cancellation.release(info.token.value)
+            if self.admission is not None:
+                self.admission.release(info.token.value)
+            self.metrics.jobs_running.dec()
+            self.metrics.job_duration.observe(perf_counter() - time0)
+            if info.report.data.success:
+                self.metrics.jobs_succeeded.inc()
+            else:
+                self.metrics.jobs_failed.inc()
+            if info.report.data.resources is not None:
+                self.resource_statistics.add(info.report.data.resources)
+
+    def collect_objects(
+        self, force: bool = False
+    ) -> Optional[tuple[int, int]]:
+        """
+        Runs the garbage collection of the `ObjectStore` if enabled and
+        if `PREPARED_IP_STORE_GC_INTERVAL` has elapsed since the last
+        run (or `force`). Returns the number of removed objects and
+        bytes or `None` if the collection has been skipped.
+        """
+        if self.object_store is None:
+            return None
+        if not self._object_store_lock.acquire(blocking=False):
+            return None
+        try:
+            if (
+                not force
+                and monotonic() - self._object_store_collected
+                < self.config.PREPARED_IP_STORE_GC_INTERVAL
+            ):
+                return None
+            self._object_store_collected = monotonic()
+            return self.object_store.collect()
+        finally:
+            self._object_store_lock.release()
+
+    def _prepare(self, context: JobContext, info: JobInfo):
+        """Implementation of the job instructions for `prepare`."""
         os.chdir(self.config.FS_MOUNT_POINT)
         preparation_config = PreparationConfig.from_json(
             info.config.request_body["preparation"]
         )
         info.report.log.set_default_origin("Preparation Module")
-
-        # set progress info
-        info.report.progress.verbose = (
-            f"preparing IP from '{preparation_config.target.path}'"
+        progress = ProgressPublisher(
+            context, info.report, self.config.PROGRESS_PUSH_INTERVAL
         )
-        info.report.log.log(
-            LoggingContext.INFO,
-            body=f"Preparing IP from '{preparation_config.target.path}'.",
+        progress.subscribe(
+            partial(self.progress_broker.publish, info.token.value)
         )
-        context.push()
-
-        # Create path for the prepared IP or exit if not successful
-        info.report.data.path = get_output_path(self.config.PREPARED_IP_OUTPUT)
-        if info.report.data.path is None:
-            info.report.data.success = False
-            info.report.log.log(
-                LoggingContext.ERROR,
-                body="Unable to generate output directory in "
-                + f"'{self.config.FS_MOUNT_POINT / self.config.PREPARED_IP_OUTPUT}'"
-                + "(maximum retries exceeded).",
-            )
-            context.push()
-            # make callback; rely on _run_callback to push progress-update
-            info.report.progress.complete()
-            self._run_callback(
-                context, info, info.config.request_body.get("callback_url")
-            )
-            return
-        info.report.log.log(
-            LoggingContext.INFO,
-            body=f"Preparing IP at '{info.report.data.path}'.",
-        )
-        context.push()
-
-        # copy target IP to output path
-        copytree(
-            preparation_config.target.path,
-            info.report.data.path,
-            dirs_exist_ok=True,
-        )
-        bag = Bag(info.report.data.path)
-
-        # create significant properties ET
-        sig_prop_file = (info.report.data.path / self.config.SIGPROP_FILE_PATH)
-        if sig_prop_file.is_file():
-            # parse existing file
-            sig_prop_et = ET.fromstring(
-                sig_prop_file.read_text(encoding="utf-8")
-            )
-        else:
-            # create empty tree from template
-            sig_prop_et = ET.fromstring(self.config.SIGPROP_PREMIS_TEMPLATE)
-
-        # prepare IP
-        for stage, src_md, operations, apply in [
-            (
-                "bagInfoOperations",
-                self.load_baginfo(bag),
-                preparation_config.baginfo_operations,
-                partial(self.apply_baginfo, bag),
+        if self.admission is not None:
+            # shrink reservation while the job writes its output
+            def update_reservation(delta: dict) -> None:
+                copy = delta["data"].get("copy")
+                if copy is not None:
+                    self.admission.update(info.token.value, copy["bytes"])
+
+            progress.subscribe(update_reservation)
+
+        outcome = self.engine.prepare(
+            preparation_config,
+            Path(
+                info.config.request_body.get("output")
+                or self.config.PREPARED_IP_OUTPUT
             ),
-            (
-                "sigPropOperations",
-                self.load_significant_properties_from_tree(
-                    sig_prop_et,
-                    self.config.SIGPROP_PREMIS_NAMESPACE,
-                ),
-                preparation_config.sig_prop_operations,
-                partial(
-                    self.apply_significant_properties,
-                    info.report.data.path / self.config.SIGPROP_FILE_PATH,
-                    sig_prop_et,
-                    self.config.SIGPROP_PREMIS_NAMESPACE,
-                ),
+            token=info.token.value,
+            progress=progress,
+            cancelled=partial(
+                self.cancellation.is_cancelled, info.token.value
             ),
-        ]:
-            # continue if no operations are requested
-            if len(operations) == 0:
-                continue
-            # process on metadata
-            operator_result = self.metadata_operator.process(
-                source_metadata=src_md,
-                operations=operations,
-            )
-            info.report.log.merge(operator_result.log)
-            context.push()
-
-            # exit if preparation failed
-            if LoggingContext.ERROR in info.report.log:
-                info.report.data.success = False
-                info.report.log.log(
-                    LoggingContext.ERROR,
-                    body=f"Preparing IP from '{preparation_config.target.path}'"
-                    + f" failed during stage '{stage}'.",
-                )
-                context.push()
-                # make callback; rely on _run_callback to push progress-update
-                info.report.progress.complete()
-                self._run_callback(
-                    context, info, info.config.request_body.get("callback_url")
-                )
-                return
-
-            apply(operator_result)
-
-        # Collect baginfo
-        info.report.data.baginfo_metadata = self.load_baginfo(bag)
-
-        # Generate new tag-manifest files
-        bag.set_tag_manifests()
-
-        # set success and log
-        info.report.data.success = True
-        info.report.log.log(
-            LoggingContext.INFO,
-            body=f"Successfully prepared IP at '{info.report.data.path}'.",
         )
-        context.push()
 
-        # make callback; rely on _run_callback to push progress-update
-        info.report.progress.complete()
-        self._run_callback(
-            context, info, info.config.request_body.get("callback_url")
+        self._complete(
+            context,
+            info,
+            **(
+                {}
+                if outcome.statistics is None
+                else {"copy": outcome.statistics.json}
+            ),
         )
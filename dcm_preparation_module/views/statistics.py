@@ -0,0 +1,38 @@
+"""
+Statistics View-class definition
+"""
+
+from flask import Blueprint, jsonify
+from dcm_common import services
+
+from dcm_preparation_module.config import AppConfig
+from dcm_preparation_module.components import ResourceStatistics
+
+
+class StatisticsView(services.View):
+    """
+    View-class for exposing the aggregated resource usage of the jobs
+    that have been completed by this service instance.
+
+    Keyword arguments:
+    config -- app config
+    statistics -- `ResourceStatistics` that are exposed
+    """
+
+    NAME = "statistics"
+
+    def __init__(
+        self,
+        config: AppConfig,
+        statistics: ResourceStatistics,
+        *args,
+        **kwargs,
+    ) -> None:
+        super().__init__(config, *args, **kwargs)
+        self.statistics = statistics
+
+    def configure_bp(self, bp: Blueprint, *args, **kwargs) -> None:
+        @bp.route("/statistics", methods=["GET"])
+        def statistics():
+            """Returns aggregated resource usage of completed jobs."""
+            return jsonify(self.statistics.json), 200
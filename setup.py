@@ -10,6 +10,7 @@ setup(
         "flask==3.*",
         "PyYAML==6.*",
         "lxml==5.*",
+        "requests==2.*",
         "bagit-utils>=1.2.0,<2.0.0",
         "data-plumber-http>=1.0.0,<2",
         "dcm-common[services, orchestra]>=4.0.0,<5",
@@ -21,6 +22,12 @@ setup(
         "dcm_preparation_module.views",
         "dcm_preparation_module.components"
     ],
+    entry_points={
+        "console_scripts": [
+            "dcm-preparation-batch = dcm_preparation_module.cli:main",
+            "dcm-preparation-resolve = dcm_preparation_module.cli:resolve_main",
+        ],
+    },
     extras_require={
         "cors": ["Flask-CORS==4"],
     },
@@ -0,0 +1,133 @@
+"""Test module for the regression gate of the benchmark suite."""
+
+import json
+
+import pytest
+
+from benchmarks.compare import compare, main, DEFAULT_BASELINE
+
+
+@pytest.fixture(name="baseline")
+def _baseline():
+    return {
+        "results": {
+            "import": {"import_seconds": 1.0},
+            "prepare/smoke": {
+                "copy_throughput_bytes_per_second": 100.0,
+                "manifest_seconds": 1.0,
+                "seconds": 1.0,
+            },
+        }
+    }
+
+
+@pytest.mark.parametrize(
+    ("current", "regressions"),
+    [
+        ({"import": {"import_seconds": 1.1}}, []),
+        ({"import": {"import_seconds": 1.5}}, ["import_seconds"]),
+        (
+            {"prepare/smoke": {"copy_throughput_bytes_per_second": 90.0}},
+            [],
+        ),
+        (
+            {"prepare/smoke": {"copy_throughput_bytes_per_second": 50.0}},
+            ["copy_throughput_bytes_per_second"],
+        ),
+        ({"prepare/smoke": {"manifest_seconds": 0.1}}, []),
+        ({"prepare/smoke": {"seconds": 100.0}}, []),  # not gated
+    ],
+)
+def test_compare(baseline, current, regressions):
+    """Test detection of regressions in `compare`."""
+    comparisons, _ = compare({"results": current}, baseline, 0.2)
+    assert [c.metric for c in comparisons if c.regression] == regressions
+
+
+def test_compare_tolerances(baseline):
+    """Test metric-specific tolerances in `compare`."""
+    current = {"results": {"import": {"import_seconds": 1.5}}}
+    comparisons, _ = compare(
+        current, baseline, 0.2, {"import_seconds": 1.0}
+    )
+    assert not comparisons[0].regression
+    comparisons, _ = compare(
+        current, baseline | {"tolerances": {"import_seconds": 1.0}}, 0.2
+    )
+    assert not comparisons[0].regression
+
+
+def test_compare_missing(baseline):
+    """Test reporting of missing metrics in `compare`."""
+    _, missing = compare({"results": {}}, baseline)
+    assert "import:import_seconds" in missing
+
+    # missing in baseline
+    _, missing = compare(
+        {"results": {"metadata_operator/smoke": {"operations_per_second": 1}}},
+        baseline,
+    )
+    assert "metadata_operator/smoke:operations_per_second" in missing
+
+    # not gated
+    _, missing = compare(
+        {"results": {"metadata_operator/smoke": {"operations_per_second": 1}}},
+        baseline | {"ungated": ["metadata_operator/*"]},
+    )
+    assert not [item for item in missing if "metadata_operator" in item]
+
+
+def test_main(tmp_path, baseline):
+    """Test exit codes and baseline-update of `main`."""
+    baseline_file = tmp_path / "baseline.json"
+    baseline_file.write_text(json.dumps(baseline), encoding="utf-8")
+    results_file = tmp_path / "results.json"
+
+    results_file.write_text(
+        json.dumps({"results": {"import": {"import_seconds": 2.0}}}),
+        encoding="utf-8",
+    )
+    assert main([str(results_file), "--baseline", str(baseline_file)]) == 1
+
+    # gated metrics of 'prepare/smoke' missing
+    results_file.write_text(
+        json.dumps({"results": {"import": {"import_seconds": 1.0}}}),
+        encoding="utf-8",
+    )
+    assert main([str(results_file), "--baseline", str(baseline_file)]) == 1
+
+    assert (
+        main(
+            [
+                str(results_file),
+                "--baseline",
+                str(baseline_file),
+                "--update-baseline",
+            ]
+        )
+        == 0
+    )
+    assert main([str(results_file), "--baseline", str(baseline_file)]) == 0
+
+
+def test_default_baseline_is_valid():
+    """Test that the checked-in baseline can be loaded."""
+    assert "results" in json.loads(DEFAULT_BASELINE.read_text("utf-8"))
+
+
+def test_default_baseline_full_run():
+    """
+    Test that the checked-in baseline does not fail the gate for a full
+    set of results due to missing baseline values.
+    """
+    _, missing = compare(
+        {
+            "results": {
+                "import": {"import_seconds": 0.01},
+                "prepare/smoke": {"throughput_bytes_per_second": 1.0},
+                "metadata_operator/smoke": {"operations_per_second": 1.0},
+            }
+        },
+        json.loads(DEFAULT_BASELINE.read_text("utf-8")),
+    )
+    assert not missing
@@ -0,0 +1,28 @@
+"""Test module for the synthetic IP generator of the benchmark suite."""
+
+from uuid import uuid4
+
+import pytest
+from bagit_utils import Bag
+
+from benchmarks.generator import IPShape, generate_ip, count_files
+
+
+@pytest.mark.parametrize(
+    "shape",
+    [
+        IPShape(files=5, file_size=100, depth=3),
+        IPShape(files=1, file_size=0, depth=0),
+        IPShape(baginfo_fields=10, baginfo_values=3, sigprop_entries=20),
+    ],
+)
+def test_generate_ip(file_storage, shape):
+    """Test that generated IPs are valid bags of the requested shape."""
+    ip = generate_ip(file_storage / str(uuid4()), shape)
+
+    bag = Bag(ip)
+    assert bag.validate_format().valid
+    assert count_files(ip / "data") == (shape.files, shape.payload_bytes)
+    assert bag.baginfo["Payload-Oxum"] == [
+        f"{shape.payload_bytes}.{shape.files}"
+    ]
@@ -0,0 +1,93 @@
+"""
+Test module for the command-line batch preparer.
+"""
+
+from pathlib import Path
+from shutil import copytree
+from uuid import uuid4
+import json
+
+from bagit_utils import Bag
+
+from dcm_preparation_module import cli
+
+
+def test_main(fixtures, file_storage):
+    """Test batch preparation of multiple targets."""
+    targets = file_storage / str(uuid4())
+    for name in ["ip-1", "ip-2"]:
+        copytree(fixtures / "test_ip", targets / name)
+    config = file_storage / f"{uuid4()}.json"
+    config.write_text(
+        json.dumps(
+            {
+                "bagInfoOperations": [
+                    {"type": "set", "targetField": "a", "value": "value"}
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    output = file_storage / str(uuid4())
+    summary = file_storage / f"{uuid4()}.json"
+
+    assert (
+        cli.main(
+            [
+                str(targets),
+                "--config",
+                str(config),
+                "--output",
+                str(output),
+                "--workers",
+                "2",
+                "--summary",
+                str(summary),
+                "--quiet",
+            ]
+        )
+        == 0
+    )
+
+    result = json.loads(summary.read_text(encoding="utf-8"))
+    assert result["targets"] == 2
+    assert result["succeeded"] == 2
+    assert result["failed"] == 0
+    assert result["resources"]["jobs"] == 2
+    for job in result["results"]:
+        bag = Bag(Path(job["path"]))
+        assert bag.validate().valid
+        assert bag.baginfo["a"] == ["value"]
+        assert job["resources"]["files"] > 0
+
+
+def test_main_invalid_config(fixtures, file_storage):
+    """Test batch preparation with invalid `PreparationConfig`."""
+    targets = file_storage / str(uuid4())
+    copytree(fixtures / "test_ip", targets / "ip")
+    config = file_storage / f"{uuid4()}.json"
+    config.write_text(
+        json.dumps({"bagInfoOperations": [{"type": "unknown"}]}),
+        encoding="utf-8",
+    )
+    summary = file_storage / f"{uuid4()}.json"
+
+    assert (
+        cli.main(
+            [
+                str(targets),
+                "--config",
+                str(config),
+                "--output",
+                str(file_storage / str(uuid4())),
+                "--summary",
+                str(summary),
+                "--quiet",
+            ]
+        )
+        == 1
+    )
+
+    result = json.loads(summary.read_text(encoding="utf-8"))
+    assert result["failed"] == 1
+    assert result["results"][0]["errors"]
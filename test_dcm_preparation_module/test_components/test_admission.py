@@ -0,0 +1,84 @@
+"""Test module for the AdmissionController-component."""
+
+from uuid import uuid4
+
+from dcm_preparation_module.components import AdmissionController
+
+
+def test_estimate(fixtures, file_storage):
+    """Test `AdmissionController.estimate`."""
+    ip = fixtures / "test_ip"
+    assert AdmissionController.estimate(ip) == 48776 + sum(
+        p.stat().st_size for p in ip.iterdir() if p.is_file()
+    )
+
+    # without Payload-Oxum (payload is not scanned)
+    other = file_storage / str(uuid4())
+    (other / "data").mkdir(parents=True)
+    (other / "data" / "file").write_bytes(b"x" * 100)
+    (other / "bag-info.txt").write_text("a: b\n", encoding="utf-8")
+    assert AdmissionController.estimate(other) is None
+
+    # Payload-Oxum is used for payload, tag directories are not scanned
+    (other / "meta").mkdir()
+    (other / "meta" / "file").write_bytes(b"x" * 100)
+    (other / "bag-info.txt").write_text(
+        "Payload-Oxum: 1000.1\n", encoding="utf-8"
+    )
+    assert AdmissionController.estimate(other) == 1021
+
+    # archive
+    (other / "ip.tar").write_bytes(b"x" * 10)
+    assert AdmissionController.estimate(other / "ip.tar") == 10
+
+
+def test_admit_space(file_storage):
+    """Test `AdmissionController.admit` for limited space."""
+    admission = AdmissionController(file_storage / str(uuid4()))
+    free_space = admission.free_space()
+    admission.min_free_space = free_space - 100
+
+    assert admission.admit("a", 60) is None
+    assert admission.reserved == 60
+    status, _ = admission.admit("b", 60)
+    assert status == 503
+
+    admission.update("a", 30)
+    assert admission.reserved == 30
+    admission.release("a")
+    assert admission.reserved == 0
+    assert admission.admit("b", 60) is None
+
+
+def test_admit_expired_reservation(file_storage):
+    """Test expiration of reservations."""
+    admission = AdmissionController(
+        file_storage / str(uuid4()), reservation_ttl=-1
+    )
+    assert admission.admit("a", 60) is None
+    assert admission.reserved == 0
+
+
+def test_admit_queue(file_storage):
+    """Test `AdmissionController.admit` for limited queue."""
+    queue = []
+    admission = AdmissionController(
+        file_storage / str(uuid4()),
+        max_queue=1,
+        queue_depth=lambda: len(queue),
+    )
+    assert admission.admit("a", 0) is None
+    queue.append("a")
+    status, _ = admission.admit("b", 0)
+    assert status == 429
+
+
+def test_admit_multiple_paths(file_storage):
+    """Test reservations for multiple output directories."""
+    a, b = file_storage / "a", file_storage / "b"
+    admission = AdmissionController(a)
+    assert admission.admit("a", 10) is None
+    assert admission.admit("b", 20, b) is None
+    assert admission.reserved == 30
+    assert admission.reserved_for(a) == 10
+    assert admission.reserved_for(b) == 20
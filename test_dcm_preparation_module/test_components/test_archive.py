@@ -0,0 +1,159 @@
+"""Test module for the ArchiveWriter- and ArchiveReader-components."""
+
+from pathlib import Path
+from uuid import uuid4
+from shutil import make_archive
+import tarfile
+import zipfile
+
+import pytest
+
+from dcm_preparation_module.components import (
+    ArchiveWriter,
+    ArchiveReader,
+    CopyAborted,
+)
+
+
+def _read_archive(path, format_):
+    """Returns dictionary of member names and contents."""
+    if format_ == "tar":
+        with tarfile.open(path) as archive:
+            return {
+                m.name: archive.extractfile(m).read()
+                for m in archive.getmembers()
+                if m.isfile()
+            }
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+@pytest.mark.parametrize("format_", ["tar", "zip"])
+def test_write_archive(fixtures, file_storage, format_):
+    """Test writing an archive from a directory and bytes."""
+    src = fixtures / "test_ip"
+    dst = file_storage / f"{uuid4()}.{format_}"
+    updates = []
+    with ArchiveWriter(
+        dst,
+        format_,
+        chunk_size=1024,
+        on_progress=lambda s: updates.append(s.json),
+    ) as writer:
+        writer.add_bytes("ip/extra.txt", b"extra")
+        writer.add_tree("ip", src, exclude=["bag-info.txt"])
+
+    files = [
+        p
+        for p in src.glob("**/*")
+        if p.is_file() and p.name != "bag-info.txt"
+    ]
+    assert writer.statistics.files == len(files) + 1
+    assert writer.statistics.bytes_ == len(b"extra") + sum(
+        p.stat().st_size for p in files
+    )
+    assert updates[-1] == writer.statistics.json
+
+    members = _read_archive(dst, format_)
+    assert members.pop("ip/extra.txt") == b"extra"
+    assert members == {
+        f"ip/{p.relative_to(src).as_posix()}": p.read_bytes() for p in files
+    }
+
+
+@pytest.mark.parametrize("format_", ["tar", "zip"])
+def test_write_archive_cancelled(fixtures, file_storage, format_):
+    """Test cancellation of `ArchiveWriter.add_tree`."""
+    writer = ArchiveWriter(
+        file_storage / f"{uuid4()}.{format_}",
+        format_,
+        cancelled=lambda: writer.statistics.files >= 2,
+    )
+    with pytest.raises(CopyAborted):
+        with writer:
+            writer.add_tree("ip", fixtures / "test_ip")
+    assert writer.statistics.files == 2
+
+
+def test_unknown_format(file_storage):
+    """Test `ArchiveWriter` with unknown format."""
+    with pytest.raises(ValueError):
+        ArchiveWriter(file_storage / "archive.7z", "7z")
+
+
+@pytest.mark.parametrize(
+    ("format_", "nested"),
+    [("zip", True), ("tar", True), ("gztar", False)],
+)
+def test_read_archive(fixtures, file_storage, format_, nested):
+    """Test reading and extracting a bag from an archive."""
+    src = fixtures / "test_ip"
+    archive = Path(
+        make_archive(
+            str(file_storage / str(uuid4())),
+            format_,
+            **(
+                {"root_dir": src.parent, "base_dir": src.name}
+                if nested
+                else {"root_dir": src}
+            ),
+        )
+    )
+    files = {
+        p.relative_to(src).as_posix(): p
+        for p in src.glob("**/*")
+        if p.is_file()
+    }
+    dst = file_storage / str(uuid4())
+
+    assert ArchiveReader.is_archive(archive)
+    with ArchiveReader(archive, chunk_size=1024) as reader:
+        assert sorted(reader.names) == sorted(files)
+        assert reader.read("bagit.txt") == files["bagit.txt"].read_bytes()
+        assert reader.size("bagit.txt") == files["bagit.txt"].stat().st_size
+        statistics = reader.extract(dst)
+
+    assert statistics.files == len(files)
+    for name, file in files.items():
+        assert (dst / name).read_bytes() == file.read_bytes()
+
+
+def test_read_archive_cancelled(fixtures, file_storage):
+    """Test cancellation of `ArchiveReader.extract`."""
+    archive = Path(
+        make_archive(
+            str(file_storage / str(uuid4())),
+            "tar",
+            root_dir=fixtures / "test_ip",
+        )
+    )
+    reader = ArchiveReader(
+        archive,
+        cancelled=lambda: reader.statistics.files >= 2,
+    )
+    with pytest.raises(CopyAborted):
+        with reader:
+            reader.extract(file_storage / str(uuid4()))
+    assert reader.statistics.files == 2
+
+
+def test_read_archive_without_bag(file_storage):
+    """Test `ArchiveReader` for archive without bag."""
+    archive = file_storage / f"{uuid4()}.zip"
+    with zipfile.ZipFile(archive, "w") as file:
+        file.writestr("a/bagit.txt", b"")
+        file.writestr("b/file.txt", b"")
+
+    with pytest.raises(ValueError):
+        ArchiveReader(archive).open()
+
+
+def test_read_archive_unsafe_name(file_storage):
+    """Test `ArchiveReader` for archive with member outside of archive."""
+    archive = file_storage / f"{uuid4()}.zip"
+    with zipfile.ZipFile(archive, "w") as file:
+        file.writestr("bagit.txt", b"")
+        file.writestr("../file.txt", b"")
+
+    with pytest.raises(ValueError):
+        ArchiveReader(archive).open()
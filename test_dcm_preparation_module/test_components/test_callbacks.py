@@ -0,0 +1,83 @@
+"""Test module for the CallbackDispatcher-component."""
+
+from threading import Event
+
+from flask import Flask, request
+
+from dcm_preparation_module.components import CallbackDispatcher
+
+
+def test_submit(run_service):
+    """Test asynchronous delivery of `CallbackDispatcher.submit`."""
+    received = []
+    app = Flask(__name__)
+
+    @app.route("/callback", methods=["POST"])
+    def callback():
+        received.append(request.json)
+        return "OK", 200
+
+    run_service(from_factory=lambda: app, port=8084)
+
+    statuses = []
+    done = Event()
+    dispatcher = CallbackDispatcher(workers=1)
+
+    def on_done(status):
+        statuses.append(status)
+        done.set()
+
+    assert dispatcher.submit(
+        "http://localhost:8084/callback", {"value": "token"}, on_done
+    )
+    assert done.wait(5)
+    assert received == [{"value": "token"}]
+    assert statuses[0].status == "delivered"
+    assert statuses[0].attempts == 1
+
+
+def test_deliver_retries():
+    """Test retries of `CallbackDispatcher.deliver` on failure."""
+    status = CallbackDispatcher(
+        max_retries=2, backoff=0, timeout=0.1
+    ).deliver("http://localhost:8085/callback", {"value": "token"})
+
+    assert status.status == "failed"
+    assert status.attempts == 3
+    assert status.error is not None
+
+
+def test_submit_error():
+    """
+    Test that hooks of `CallbackDispatcher.submit` are executed for
+    unexpected errors and that errors in hooks do not stop delivery.
+    """
+
+    class FailingDispatcher(CallbackDispatcher):
+        def deliver(self, url, json):
+            raise RuntimeError("unexpected")
+
+    statuses = []
+    done = Event()
+    dispatcher = FailingDispatcher(workers=1)
+
+    def on_done(status):
+        statuses.append(status)
+        if len(statuses) == 1:
+            raise ValueError("error in hook")
+        done.set()
+
+    assert dispatcher.submit("http://localhost:8085/callback", {}, on_done)
+    assert dispatcher.submit("http://localhost:8085/callback", {}, on_done)
+    assert done.wait(5)
+    assert [status.status for status in statuses] == ["failed", "failed"]
+    assert statuses[0].error == "unexpected"
+
+
+def test_submit_queue_full():
+    """Test `CallbackDispatcher.submit` for exhausted queue."""
+    dispatcher = CallbackDispatcher(workers=0, queue_size=1)
+
+    assert dispatcher.submit("http://localhost:8085/callback", {})
+    assert not dispatcher.submit("http://localhost:8085/callback", {})
+    assert dispatcher.pending == 1
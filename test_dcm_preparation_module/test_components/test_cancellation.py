@@ -0,0 +1,81 @@
+"""Test module for the CancellationRegistry-component."""
+
+import os
+from time import time
+
+from dcm_preparation_module.components import CancellationRegistry
+
+
+def test_cancellation_registry():
+    """Test basic functionality of `CancellationRegistry`."""
+    registry = CancellationRegistry()
+
+    assert not registry.cancel("token")
+
+    assert "token" not in registry
+    event = registry.register("token")
+    assert "token" in registry
+    assert registry.register("token") is event
+    assert not event.is_set()
+    assert registry.cancel("token")
+    assert event.is_set()
+
+    registry.release("token")
+    assert "token" not in registry
+    assert not registry.cancel("token")
+
+
+def test_cancellation_registry_markers(tmp_path):
+    """Test cancellation via markers in `CancellationRegistry`."""
+    local = CancellationRegistry([tmp_path], interval=0)
+    remote = CancellationRegistry([tmp_path], interval=0)
+
+    local.register("token")
+    assert not local.is_cancelled("token")
+    assert not remote.cancel("token")
+    marker = CancellationRegistry.marker(tmp_path, "token")
+    assert marker.is_file()
+    assert local.is_cancelled("token")
+    assert local.register("token").is_set()
+
+    local.release("token")
+    assert not marker.exists()
+
+    remote.cancel("token", shared=False)
+    assert not marker.exists()
+
+
+def test_cancellation_registry_purge(tmp_path):
+    """Test removal of stale markers in `CancellationRegistry`."""
+    registry = CancellationRegistry([tmp_path], ttl=3600)
+    stale = CancellationRegistry.marker(tmp_path, "stale")
+    stale.touch()
+    os.utime(stale, (time() - 7200, time() - 7200))
+    (tmp_path / "other.cancel").touch()
+    os.utime(tmp_path / "other.cancel", (time() - 7200, time() - 7200))
+
+    assert registry.purge() == 0
+    registry.cancel("token")
+    assert registry.purge(force=True) == 1
+    assert not stale.exists()
+    assert CancellationRegistry.marker(tmp_path, "token").is_file()
+    assert (tmp_path / "other.cancel").is_file()
+
+
+def test_cancellation_registry_marker_interval(tmp_path):
+    """Test rate-limited checks for markers in `CancellationRegistry`."""
+    registry = CancellationRegistry([tmp_path], interval=3600)
+
+    assert not registry.is_cancelled("token")
+    CancellationRegistry.marker(tmp_path, "token").touch()
+    assert not registry.is_cancelled("token")
+
+
+def test_cancellation_registry_invalid_token(tmp_path):
+    """Test that tokens are not used as paths if invalid."""
+    registry = CancellationRegistry([tmp_path / "root"])
+    (tmp_path / "root").mkdir()
+
+    assert CancellationRegistry.marker(tmp_path, "../token") is None
+    registry.cancel("../token")
+    assert list(tmp_path.glob("**/*")) == [tmp_path / "root"]
@@ -0,0 +1,65 @@
+"""Test module for the CopyCheckpoint-component."""
+
+from uuid import uuid4
+from shutil import copy2
+
+import pytest
+
+from dcm_preparation_module.components import CopyCheckpoint
+
+
+@pytest.fixture(name="files")
+def _files(file_storage):
+    src = file_storage / str(uuid4())
+    src.mkdir(parents=True)
+    (src / "file").write_text("data", encoding="utf-8")
+    dst = file_storage / str(uuid4())
+    dst.mkdir(parents=True)
+    copy2(src / "file", dst / "file")
+    return src / "file", dst / "file"
+
+
+def test_add_and_load(file_storage, files):
+    """Test persistence of `CopyCheckpoint`-entries."""
+    src, dst = files
+    path = file_storage / f"{uuid4()}.checkpoint"
+    checkpoint = CopyCheckpoint(path)
+    assert len(checkpoint) == 0
+    assert not checkpoint.is_complete("file", src, dst)
+
+    checkpoint.add("file", src.stat().st_size, src.stat().st_mtime_ns)
+    checkpoint.close()
+    assert checkpoint.is_complete("file", src, dst)
+
+    checkpoint = CopyCheckpoint(path)
+    assert len(checkpoint) == 1
+    assert checkpoint.is_complete("file", src, dst)
+
+    checkpoint.remove()
+    assert not path.exists()
+    assert len(checkpoint) == 0
+
+
+def test_is_complete_modified(file_storage, files):
+    """Test `CopyCheckpoint.is_complete` for modified files."""
+    src, dst = files
+    checkpoint = CopyCheckpoint(file_storage / f"{uuid4()}.checkpoint")
+    checkpoint.add("file", src.stat().st_size, src.stat().st_mtime_ns)
+
+    dst.write_text("more data", encoding="utf-8")
+    assert not checkpoint.is_complete("file", src, dst)
+    dst.unlink()
+    assert not checkpoint.is_complete("file", src, dst)
+
+
+def test_load_truncated(file_storage):
+    """Test loading a checkpoint with a truncated last line."""
+    path = file_storage / f"{uuid4()}.checkpoint"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        '{"path": "a", "size": 1, "mtime": 1}\n{"path": "b", "si',
+        encoding="utf-8",
+    )
+    checkpoint = CopyCheckpoint(path)
+    assert len(checkpoint) == 1
+    assert checkpoint.get("a") == {"path": "a", "size": 1, "mtime": 1}
@@ -0,0 +1,103 @@
+"""Test module for the OutputCollector-component."""
+
+from uuid import uuid4
+from time import time, sleep
+import os
+
+import pytest
+
+from dcm_preparation_module.components import OutputCollector, OutputStaging
+
+
+@pytest.fixture(name="output")
+def _output(file_storage):
+    output = file_storage / str(uuid4())
+    output.mkdir(parents=True)
+    return output
+
+
+def make_output(path, age=0):
+    """Creates output directory at `path` with modification time."""
+    (path / "data").mkdir(parents=True)
+    (path / "data" / "file").touch()
+    os.utime(path, (time() - age, time() - age))
+    return path
+
+
+def test_collect_staging(output):
+    """Test collection of orphaned staging directories."""
+    staging = OutputStaging(output)
+    old, _ = staging.create("old")
+    make_output(old, 100)
+    OutputStaging.checkpoint(old).touch()
+    os.utime(OutputStaging.checkpoint(old), (time() - 100, time() - 100))
+    new, _ = staging.create("new")
+    make_output(new)
+    active, _ = staging.create("active")
+    make_output(active, 100)
+    orphan = OutputStaging.checkpoint(output / ".staging-orphan")
+    orphan.touch()
+    os.utime(orphan, (time() - 100, time() - 100))
+    prepared = make_output(output / "prepared", 100)
+
+    assert OutputCollector(
+        [output], staging_retention=10, is_active=lambda t: t == "active"
+    ).collect() == (3, 5)
+    assert not old.exists()
+    assert not OutputStaging.checkpoint(old).exists()
+    assert not orphan.exists()
+    assert new.is_dir()
+    assert active.is_dir()
+    assert prepared.is_dir()
+
+
+def test_collect_retention(output):
+    """Test collection of prepared IPs after retention."""
+    old = make_output(output / str(uuid4()), 100)
+    new = make_output(output / str(uuid4()))
+    archive = output / f"{uuid4()}.tar"
+    archive.touch()
+    os.utime(archive, (time() - 100, time() - 100))
+
+    assert OutputCollector([output]).collect() == (0, 0)
+    assert OutputCollector([output], retention=10).collect() == (2, 4)
+    assert not old.exists()
+    assert not archive.exists()
+    assert new.is_dir()
+
+
+def test_collect_retention_other_entries(output):
+    """
+    Test that entries which are not outputs of jobs are not collected
+    after retention.
+    """
+    other = make_output(output / "other", 100)
+    store = make_output(output / str(uuid4()), 100)
+
+    assert OutputCollector(
+        [output], retention=10, exclude=[store]
+    ).collect() == (0, 0)
+    assert other.is_dir()
+    assert store.is_dir()
+
+
+def test_collect_rate_limit(output):
+    """Test rate-limited collection."""
+    make_output(output / str(uuid4()), 100)
+    time0 = time()
+    assert OutputCollector([output], retention=10, rate=20).collect() == (1, 3)
+    assert time() - time0 >= 0.09
+
+
+def test_start_stop(output):
+    """Test background collection."""
+    old = make_output(output / str(uuid4()), 100)
+    cycles = []
+    collector = OutputCollector([output], retention=10)
+    collector.start(0.01, on_cycle=lambda: cycles.append(1))
+    assert collector.running
+    while not cycles:
+        sleep(0.01)
+    collector.stop()
+    assert not collector.running
+    assert not old.exists()
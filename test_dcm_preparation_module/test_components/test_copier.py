@@ -0,0 +1,92 @@
+"""Test module for the Copier-component."""
+
+from uuid import uuid4
+
+import pytest
+
+from dcm_preparation_module.components import (
+    Copier,
+    CopyAborted,
+    CopyCheckpoint,
+)
+
+
+def test_copy(fixtures, file_storage):
+    """Test `Copier.copy` for test-IP."""
+    src = fixtures / "test_ip"
+    dst = file_storage / str(uuid4())
+    updates = []
+    statistics = Copier(
+        chunk_size=1024, on_progress=lambda s: updates.append(s.json)
+    ).copy(src, dst)
+
+    files = [p for p in src.glob("**/*") if p.is_file()]
+    assert statistics.files == len(files)
+    assert statistics.bytes_ == sum(p.stat().st_size for p in files)
+    assert updates[-1] == statistics.json
+    for file in files:
+        assert (dst / file.relative_to(src)).read_bytes() == file.read_bytes()
+        assert (
+            (dst / file.relative_to(src)).stat().st_mtime
+            == file.stat().st_mtime
+        )
+
+
+def test_copy_cancelled(fixtures, file_storage):
+    """Test cancellation of `Copier.copy` between files."""
+    src = fixtures / "test_ip"
+    dst = file_storage / str(uuid4())
+    copier = Copier(cancelled=lambda: copier.statistics.files >= 2)
+
+    with pytest.raises(CopyAborted):
+        copier.copy(src, dst)
+    assert copier.statistics.files == 2
+
+
+def test_copy_cancelled_between_chunks(file_storage):
+    """Test cancellation of `Copier.copy` between chunks of a file."""
+    src = file_storage / str(uuid4())
+    src.mkdir(parents=True)
+    (src / "file").write_bytes(b"x" * 10000)
+    copier = Copier(
+        chunk_size=1000, cancelled=lambda: copier.statistics.bytes_ >= 3000
+    )
+
+    with pytest.raises(CopyAborted):
+        copier.copy(src, file_storage / str(uuid4()))
+    assert copier.statistics.bytes_ == 3000
+    assert copier.statistics.files == 0
+
+
+def test_copy_resume(fixtures, file_storage):
+    """Test resuming an interrupted `Copier.copy` from a checkpoint."""
+    src = fixtures / "test_ip"
+    dst = file_storage / str(uuid4())
+    checkpoint = file_storage / f"{uuid4()}.checkpoint"
+    copier = Copier(
+        cancelled=lambda: copier.statistics.files >= 2,
+        checkpoint=CopyCheckpoint(checkpoint),
+    )
+    with pytest.raises(CopyAborted):
+        copier.copy(src, dst)
+
+    statistics = Copier(checkpoint=CopyCheckpoint(checkpoint)).copy(src, dst)
+    files = [p for p in src.glob("**/*") if p.is_file()]
+    assert statistics.skipped_files == 2
+    assert statistics.files == len(files) - 2
+    assert statistics.bytes_ + statistics.skipped_bytes == sum(
+        p.stat().st_size for p in files
+    )
+    for file in files:
+        assert (dst / file.relative_to(src)).read_bytes() == file.read_bytes()
+    assert len(CopyCheckpoint(checkpoint)) == len(files)
+
+
+def test_copy_checkpoint_digest(fixtures, file_storage):
+    """Test recording digests in checkpoint during `Copier.copy`."""
+    src = fixtures / "test_ip"
+    checkpoint = CopyCheckpoint(file_storage / f"{uuid4()}.checkpoint")
+    Copier(checkpoint=checkpoint, digest="sha256").copy(
+        src, file_storage / str(uuid4())
+    )
+    assert checkpoint.get("bagit.txt")["digest"].startswith("sha256:")
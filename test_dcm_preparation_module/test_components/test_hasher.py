@@ -0,0 +1,104 @@
+"""Test module for the MultiHasher-component."""
+
+from io import BytesIO
+import hashlib
+
+import pytest
+
+from dcm_preparation_module.components import MultiHasher
+
+
+ALGORITHMS = ["md5", "sha256", "sha512"]
+
+
+def _expected(data):
+    return {a: hashlib.new(a, data).hexdigest() for a in ALGORITHMS}
+
+
+@pytest.mark.parametrize(
+    "hasher",
+    [
+        MultiHasher(buffer_size=7),
+        MultiHasher(buffer_size=7, mmap_threshold=1),
+        MultiHasher(workers=1),
+    ],
+    ids=["buffered", "mmap", "sequential"],
+)
+def test_hash_all(fixtures, hasher):
+    """Test `MultiHasher.hash_all` for files and bytes."""
+    files = {
+        p.relative_to(fixtures).as_posix(): p
+        for p in (fixtures / "test_ip").glob("**/*")
+        if p.is_file()
+    }
+    digests = hasher.hash_all(files | {"bytes": b"data"}, ALGORITHMS)
+
+    assert digests.pop("bytes") == _expected(b"data")
+    assert digests == {
+        name: _expected(file.read_bytes()) for name, file in files.items()
+    }
+
+
+def test_hash_fileobj():
+    """Test `MultiHasher.hash_fileobj`."""
+    data = b"a" * 1000
+    assert MultiHasher(buffer_size=64).hash_fileobj(
+        BytesIO(data), ALGORITHMS
+    ) == _expected(data)
+
+
+def test_hash_empty_file(file_storage):
+    """Test `MultiHasher.hash` for an empty file with mmap enabled."""
+    file = file_storage / "empty.txt"
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_bytes(b"")
+    assert MultiHasher(mmap_threshold=1).hash(
+        file, ALGORITHMS
+    ) == _expected(b"")
+
+
+def test_hash_all_function():
+    """Test `MultiHasher.hash_all` with custom function."""
+    assert MultiHasher().hash_all(
+        {"a": b"a", "b": b"b"},
+        ALGORITHMS,
+        lambda content, algorithms: {a: content.decode() for a in algorithms},
+    ) == {
+        "a": {a: "a" for a in ALGORITHMS},
+        "b": {a: "b" for a in ALGORITHMS},
+    }
+
+
+@pytest.mark.parametrize(
+    "hasher",
+    [MultiHasher(buffer_size=7), MultiHasher(buffer_size=7, mmap_threshold=1)],
+    ids=["buffered", "mmap"],
+)
+def test_hash_all_throttle(fixtures, hasher):
+    """Test `MultiHasher.hash_all` with throttle."""
+    files = {
+        p.relative_to(fixtures).as_posix(): p
+        for p in (fixtures / "test_ip").glob("**/*")
+        if p.is_file()
+    }
+    throttled = []
+    hasher.hash_all(
+        files | {"bytes": b"data"}, ALGORITHMS, throttle=throttled.append
+    )
+
+    assert max(throttled) <= 7
+    assert sum(throttled) == sum(p.stat().st_size for p in files.values())
+
+
+def test_hash_all_function_throttle(fixtures):
+    """Test `MultiHasher.hash_all` with custom function and throttle."""
+    file = fixtures / "test_ip" / "bag-info.txt"
+    throttled = []
+    MultiHasher().hash_all(
+        {"a": file, "b": b"b"},
+        ALGORITHMS,
+        lambda content, algorithms: {},
+        throttled.append,
+    )
+
+    assert throttled == [file.stat().st_size]
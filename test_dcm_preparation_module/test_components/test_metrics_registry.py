@@ -0,0 +1,82 @@
+"""Test module for the metrics-components."""
+
+import pytest
+
+from dcm_preparation_module.components import MetricsRegistry, ServiceMetrics
+
+
+def test_counter():
+    """Test `Counter` with and without labels."""
+    registry = MetricsRegistry(prefix="test_")
+    counter = registry.counter("counter_total", "description")
+
+    assert "test_counter_total 0" in registry.render()
+
+    counter.inc()
+    counter.inc(2, stage="a")
+    counter.inc(3, stage="a")
+
+    assert counter.get() == 1
+    assert counter.get(stage="a") == 5
+    rendered = registry.render()
+    assert "# TYPE test_counter_total counter" in rendered
+    assert 'test_counter_total{stage="a"} 5' in rendered
+
+
+def test_gauge():
+    """Test `Gauge`."""
+    registry = MetricsRegistry()
+    gauge = registry.gauge("gauge", "description")
+    gauge.inc(3)
+    gauge.dec()
+    assert gauge.get() == 2
+
+    registry.gauge("function", "description", lambda: 5)
+    assert "function 5" in registry.render()
+
+
+def test_histogram():
+    """Test `Histogram`."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("histogram", "description", (1, 10))
+    histogram.observe(0.5)
+    histogram.observe(1)
+    histogram.observe(20)
+
+    assert histogram.count() == 3
+    assert histogram.sum() == 21.5
+    rendered = registry.render()
+    assert 'histogram_bucket{le="1"} 2' in rendered
+    assert 'histogram_bucket{le="10"} 2' in rendered
+    assert 'histogram_bucket{le="+Inf"} 3' in rendered
+    assert "histogram_count 3" in rendered
+
+
+def test_duplicate_metric():
+    """Test registering metrics with identical names."""
+    registry = MetricsRegistry()
+    registry.counter("metric", "description")
+    with pytest.raises(ValueError):
+        registry.gauge("metric", "description")
+
+
+def test_service_metrics_queue_depth():
+    """Test queue depth of `ServiceMetrics`."""
+    metrics = ServiceMetrics()
+    metrics.queued("a")
+    metrics.queued("b")
+    metrics.queued("c")
+    assert metrics.queue_depth.get() == 3
+
+    assert metrics.dequeued("a")  # started
+    assert metrics.dequeued("b")  # aborted
+    assert not metrics.dequeued("b")
+    assert metrics.queue_depth.get() == 1
+
+
+def test_service_metrics_queue_ttl():
+    """Test expiration of queued jobs in `ServiceMetrics`."""
+    metrics = ServiceMetrics(queue_ttl=0)
+    metrics.queued("a")
+
+    assert metrics.queue_depth.get() == 0
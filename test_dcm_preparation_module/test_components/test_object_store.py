@@ -0,0 +1,158 @@
+"""Test module for the ObjectStore-component."""
+
+from uuid import uuid4
+from hashlib import sha256
+
+import pytest
+
+from dcm_preparation_module.components import (
+    ObjectStore,
+    Copier,
+    CopyCheckpoint,
+)
+
+
+@pytest.fixture(name="store")
+def _store(file_storage):
+    return ObjectStore(file_storage / str(uuid4()))
+
+
+@pytest.fixture(name="file")
+def _file(file_storage):
+    file = file_storage / str(uuid4())
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_bytes(b"data")
+    return file, f"sha256:{sha256(b'data').hexdigest()}"
+
+
+def test_path(store):
+    """Test `ObjectStore.path`."""
+    value = "ab" + "0" * 62
+    assert store.path(f"sha256:{value}") == (
+        store.root / "sha256" / "ab" / value
+    )
+    with pytest.raises(ValueError):
+        store.path("sha256:../../abcd")
+
+
+@pytest.mark.parametrize(
+    ("key", "valid"),
+    [
+        ("sha256:" + "0" * 64, True),
+        ("sha512:" + "0" * 128, True),
+        ("sha256:" + "0" * 63, False),
+        ("sha512:" + "0" * 64, False),
+        ("md5:" + "0" * 32, False),
+        ("sha1:" + "0" * 40, False),
+    ],
+)
+def test_is_key(key, valid):
+    """Test `ObjectStore.is_key`."""
+    assert ObjectStore.is_key(key) is valid
+
+
+def test_add_link_and_collect(store, file, file_storage):
+    """Test adding, linking, and collecting objects."""
+    src, key = file
+    assert store.refcount(key) == 0
+    # `src` has been copied from `original` (and verified)
+    original = file_storage / str(uuid4())
+    original.write_bytes(b"data")
+    assert store.add(key, src, original.stat())
+    assert not store.add(key, src)
+    assert store.refcount(key) == 1
+    assert store.verified(original) == key
+    assert store.verified(src) is None
+
+    dst = file_storage / str(uuid4())
+    dst.write_bytes(b"other data")
+    assert not store.link(key, dst, dst)
+    assert store.link(key, dst, original)
+    assert dst.read_bytes() == b"data"
+    assert store.refcount(key) == 2
+    assert not store.link("sha256:" + "0" * 64, dst)
+
+    assert store.collect() == (0, 0)
+    src.unlink()
+    dst.unlink()
+    assert store.collect() == (1, 4)
+    assert not store.path(key).exists()
+    assert not list((store.root / store.SOURCES).iterdir())
+
+
+def test_load_manifest(fixtures):
+    """Test `ObjectStore.load_manifest` for test-IP."""
+    manifest = ObjectStore.load_manifest(fixtures / "test_ip")
+    assert len(manifest) > 0
+    for path, key in manifest.items():
+        assert path.startswith("data/")
+        assert ObjectStore.is_key(key)
+    assert ObjectStore.load_manifest(fixtures / "test_ip", ["md5"]) == {}
+
+
+def test_copy_with_store(fixtures, file_storage, store):
+    """Test deduplication of payload files in `Copier.copy`."""
+    src = fixtures / "test_ip"
+    manifest = ObjectStore.load_manifest(src)
+
+    # first copy verifies all files and fills store
+    dst0 = file_storage / str(uuid4())
+    statistics = Copier(store=store, manifest=manifest).copy(src, dst0)
+    assert statistics.linked_files == 0
+    for path, key in manifest.items():
+        assert store.refcount(key) >= 1
+        assert store.verified(src / path) == key
+
+    # second copy links payload from store
+    dst1 = file_storage / str(uuid4())
+    statistics = Copier(
+        store=store,
+        manifest=manifest,
+        checkpoint=CopyCheckpoint(file_storage / f"{uuid4()}.checkpoint"),
+    ).copy(src, dst1)
+    assert statistics.linked_files == len(manifest)
+    assert statistics.files == len(
+        [p for p in src.glob("**/*") if p.is_file()]
+    ) - len(manifest)
+    for path in manifest:
+        assert (dst1 / path).read_bytes() == (src / path).read_bytes()
+        assert (dst1 / path).stat().st_ino == (dst0 / path).stat().st_ino
+
+
+def test_copy_with_store_untrusted_manifest(file_storage, store):
+    """
+    Test `Copier.copy` with an object store for manifests that do not
+    match the payload.
+    """
+    # prepare object in store via verified copy
+    src0 = file_storage / str(uuid4())
+    (src0 / "data").mkdir(parents=True)
+    (src0 / "data" / "file").write_bytes(b"secret")
+    key = f"sha256:{sha256(b'secret').hexdigest()}"
+    Copier(store=store, manifest={"data/file": key}).copy(
+        src0, file_storage / str(uuid4())
+    )
+    assert store.refcount(key) == 1
+
+    # other IP claims the digest of that object for a different file
+    src1 = file_storage / str(uuid4())
+    (src1 / "data").mkdir(parents=True)
+    (src1 / "data" / "file").write_bytes(b"public")
+    dst = file_storage / str(uuid4())
+    statistics = Copier(store=store, manifest={"data/file": key}).copy(
+        src1, dst
+    )
+    assert statistics.linked_files == 0
+    assert statistics.files == 1
+    assert (dst / "data" / "file").read_bytes() == b"public"
+    assert store.refcount(key) == 1
+    assert store.verified(src1 / "data" / "file") is None
+
+    # source file is changed after verification
+    (src0 / "data" / "file").write_bytes(b"secreT")
+    dst = file_storage / str(uuid4())
+    statistics = Copier(store=store, manifest={"data/file": key}).copy(
+        src0, dst
+    )
+    assert statistics.linked_files == 0
+    assert (dst / "data" / "file").read_bytes() == b"secreT"
@@ -0,0 +1,54 @@
+"""Test module for the OutputSelector-component."""
+
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from dcm_preparation_module.components import OutputSelector
+
+
+def test_select_single_root():
+    """Test `OutputSelector.select` for a single root."""
+    assert OutputSelector([Path("a")]).select() == Path("a")
+
+
+def test_select_no_roots():
+    """Test `OutputSelector` without roots."""
+    with pytest.raises(ValueError):
+        OutputSelector([])
+
+
+def test_select_reserved(file_storage):
+    """Test `OutputSelector.select` based on reserved space."""
+    reserved = {Path("a"): 0, Path("b"): 1}
+    selector = OutputSelector(
+        [Path("a"), Path("b")],
+        cwd=file_storage,
+        reserved=lambda root: reserved[root],
+    )
+    assert selector.available(Path("a")) == selector.available(Path("b")) + 1
+    assert selector.select() == Path("a")
+    reserved[Path("a")] = 2
+    assert selector.select() == Path("b")
+
+
+def test_select_insufficient_space(file_storage):
+    """Test `OutputSelector.select` prefers roots with sufficient space."""
+    selector = OutputSelector(
+        [Path("a"), Path("b")],
+        cwd=file_storage,
+        reserved=lambda root: 0 if root == Path("a") else 2**62,
+    )
+    assert selector.select(size=1) == Path("a")
+
+
+def test_select_same_filesystem(file_storage):
+    """Test `OutputSelector.select` prefers the target's filesystem."""
+    target = file_storage / str(uuid4())
+    target.mkdir(parents=True)
+    selector = OutputSelector([Path("a"), Path("b")], cwd=file_storage)
+    selector.device = lambda path: (
+        1 if path in (target, Path("b")) else 2
+    )
+    assert selector.select(target) == Path("b")
@@ -0,0 +1,65 @@
+"""Test module for the OverlayResolver-component."""
+
+from shutil import copytree
+from uuid import uuid4
+import json
+
+import pytest
+from bagit_utils import Bag
+
+from dcm_preparation_module.components import OverlayResolver
+
+
+@pytest.fixture(name="overlay")
+def _overlay(fixtures, file_storage):
+    """Returns tuple of source IP and tag-overlay."""
+    source = file_storage / str(uuid4())
+    copytree(fixtures / "test_ip", source)
+    overlay = file_storage / str(uuid4())
+    copytree(
+        source,
+        overlay,
+        ignore=lambda directory, names: ["data"] if "data" in names else [],
+    )
+    OverlayResolver.write_reference(overlay, source)
+    return source, overlay
+
+
+def test_resolve(overlay, file_storage):
+    """Test materializing a tag-overlay."""
+    source, overlay = overlay
+    dst = file_storage / str(uuid4())
+
+    assert OverlayResolver.is_overlay(overlay)
+    assert OverlayResolver().source(overlay) == source
+    statistics = OverlayResolver().resolve(overlay, dst)
+
+    assert statistics.files == len(
+        [p for p in source.glob("**/*") if p.is_file()]
+    )
+    assert not (dst / OverlayResolver.REFERENCE).exists()
+    assert Bag(dst).validate().valid
+
+
+def test_resolve_cwd(overlay):
+    """Test materializing a tag-overlay with relative reference."""
+    source, overlay = overlay
+    reference = OverlayResolver.load_reference(overlay)
+    reference["source"] = source.name
+    (overlay / OverlayResolver.REFERENCE).write_text(
+        json.dumps(reference), encoding="utf-8"
+    )
+
+    assert OverlayResolver(source.parent).source(overlay) == source
+
+
+def test_resolve_changed_source(overlay, file_storage):
+    """Test materializing a tag-overlay with modified source IP."""
+    source, overlay = overlay
+    manifest = next(source.glob("manifest-*.txt"))
+    manifest.write_text(
+        manifest.read_text(encoding="utf-8") + "\n", encoding="utf-8"
+    )
+
+    with pytest.raises(ValueError):
+        OverlayResolver().resolve(overlay, file_storage / str(uuid4()))
@@ -0,0 +1,194 @@
+"""Test module for the ProgressPublisher- and ProgressBroker-components."""
+
+import pytest
+from dcm_common import LoggingContext, Logger
+
+from dcm_preparation_module.models import Report
+from dcm_preparation_module.components import (
+    ProgressPublisher,
+    ProgressBroker,
+)
+
+
+class FakeContext:
+    """Minimal stand-in for a `JobContext`."""
+
+    def __init__(self):
+        self.pushes = 0
+
+    def push(self):
+        self.pushes += 1
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+@pytest.fixture(name="clock")
+def _clock():
+    return FakeClock()
+
+
+@pytest.fixture(name="context")
+def _context():
+    return FakeContext()
+
+
+def test_push_rate_limited(context, clock):
+    """Test rate-limiting of `ProgressPublisher.push`."""
+    publisher = ProgressPublisher(
+        context, Report(host=""), interval=1.0, clock=clock
+    )
+
+    assert publisher.push()
+    assert not publisher.push()
+    assert context.pushes == 1
+
+    clock.time = 1.5
+    assert publisher.push()
+    assert not publisher.push()
+    assert context.pushes == 2
+
+
+def test_flush_ignores_rate_limit(context, clock):
+    """Test that `ProgressPublisher.flush` always pushes."""
+    publisher = ProgressPublisher(
+        context, Report(host=""), interval=1.0, clock=clock
+    )
+
+    publisher.push()
+    publisher.flush()
+    publisher.flush()
+    assert context.pushes == 3
+
+
+def test_subscriber_receives_deltas(context, clock):
+    """Test that subscribers only receive new log entries."""
+    report = Report(host="")
+    publisher = ProgressPublisher(context, report, interval=1.0, clock=clock)
+    deltas = []
+    publisher.subscribe(deltas.append)
+
+    report.progress.verbose = "stage 1"
+    publisher.log(LoggingContext.INFO, body="message 1")
+    publisher.push()
+    log = Logger(default_origin="test")
+    log.log(LoggingContext.WARNING, body="message 2")
+    log.log(LoggingContext.INFO, body="message 3")
+    publisher.merge(log)
+    publisher.push(value=1)
+    clock.time = 1.5
+    publisher.push()
+    publisher.flush()
+
+    assert context.pushes == 3
+    assert len(deltas) == 3
+    assert deltas[0]["progress"] == "stage 1"
+    assert deltas[0]["log"] == [
+        {"context": "INFO"} | report.log.json["INFO"][0]
+    ]
+    assert sorted(entry["body"] for entry in deltas[1]["log"]) == [
+        "message 2",
+        "message 3",
+    ]
+    assert deltas[1]["data"] == {"value": 1}
+    assert deltas[2]["log"] == []
+    assert deltas[2]["data"] == {}
+    assert LoggingContext.WARNING in report.log
+
+
+def test_subscriber_rate_limited(context, clock):
+    """Test that data of non-forwarded pushes is coalesced."""
+    publisher = ProgressPublisher(
+        context, Report(host=""), interval=1.0, clock=clock
+    )
+    deltas = []
+    publisher.subscribe(deltas.append)
+
+    publisher.push(copy=1)
+    for i in range(2, 100):
+        publisher.push(copy=i, other=i)
+    assert len(deltas) == 1
+    clock.time = 1.5
+    publisher.push(copy=100)
+
+    assert len(deltas) == 2
+    assert deltas[0]["data"] == {"copy": 1}
+    assert deltas[1]["data"] == {"copy": 100, "other": 99}
+
+
+def test_broker_subscribe_unknown_token():
+    """Test `ProgressBroker.subscribe` for unknown token."""
+    assert ProgressBroker().subscribe("unknown") is None
+
+
+def test_broker_publish_and_close():
+    """Test message distribution of `ProgressBroker`."""
+    broker = ProgressBroker()
+    broker.open("token")
+    queue = broker.subscribe("token")
+
+    broker.publish("token", {"progress": "a", "log": [], "data": {"x": 1}})
+    broker.close("token", {"progress": "b", "complete": True})
+
+    assert queue.get_nowait()["progress"] == "a"
+    assert queue.get_nowait()["complete"]
+    assert queue.get_nowait() is None
+    assert broker.subscribe("token") is None
+
+
+def test_broker_late_subscriber_receives_state():
+    """Test that late subscribers receive the latest state first."""
+    broker = ProgressBroker()
+    broker.open("token")
+    broker.publish("token", {"progress": "a", "log": [], "data": {"x": 1}})
+    broker.publish("token", {"progress": "b", "log": [], "data": {"y": 2}})
+
+    state = broker.subscribe("token").get_nowait()
+    assert state["progress"] == "b"
+    assert state["data"] == {"x": 1, "y": 2}
+
+
+def test_broker_bounded_queue():
+    """Test that slow subscribers lose the oldest messages."""
+    broker = ProgressBroker(queue_size=2)
+    broker.open("token")
+    queue = broker.subscribe("token")
+    for i in range(5):
+        broker.publish("token", {"progress": str(i)})
+
+    assert queue.get_nowait()["progress"] == "3"
+    assert queue.get_nowait()["progress"] == "4"
+
+
+def test_broker_publish_without_channel():
+    """Test that publishing to a closed channel does not reopen it."""
+    broker = ProgressBroker()
+    broker.open("token")
+    broker.close("token")
+    broker.publish("token", {"progress": "a"})
+
+    assert broker.subscribe("token") is None
+
+
+def test_broker_expire(clock):
+    """Test expiration of idle channels in `ProgressBroker`."""
+    broker = ProgressBroker(max_idle=10, clock=clock)
+    broker.open("token-0")
+    broker.open("token-1")
+    queue = broker.subscribe("token-0")
+
+    clock.time = 5
+    broker.publish("token-1", {"progress": "a"})
+    clock.time = 11
+    broker.expire()
+
+    assert queue.get_nowait() is None
+    assert broker.subscribe("token-0") is None
+    assert broker.subscribe("token-1") is not None
@@ -0,0 +1,105 @@
+"""Test module for the ResourceMonitor- and ResourceStatistics-components."""
+
+from uuid import uuid4
+
+import pytest
+
+from dcm_preparation_module.models import ResourceUsage
+from dcm_preparation_module.components import (
+    CopyStatistics,
+    ResourceMonitor,
+    TrackedThreadPoolExecutor,
+    ResourceStatistics,
+)
+
+
+def test_resource_monitor(file_storage):
+    """Test `ResourceMonitor` with fake I/O-statistics."""
+    io = file_storage / str(uuid4())
+    io.parent.mkdir(parents=True, exist_ok=True)
+    io.write_text("rchar: 100\nwchar: 10\nread_bytes: 0\n", encoding="utf-8")
+    monitor = ResourceMonitor(io)
+    monitor.start()
+    io.write_text("rchar: 300\nwchar: 60\nread_bytes: 0\n", encoding="utf-8")
+    usage = monitor.stop(CopyStatistics(files=2, bytes_=50))
+
+    assert usage.duration >= 0
+    assert usage.read_bytes == 200
+    assert usage.write_bytes == 50
+    assert usage.files == 2
+    assert usage.bytes_ == 50
+    if usage.cpu_user is not None:
+        assert usage.cpu_user >= 0
+        assert usage.max_rss > 0
+
+
+def test_resource_monitor_no_io(file_storage):
+    """Test `ResourceMonitor` without I/O-statistics."""
+    monitor = ResourceMonitor(file_storage / str(uuid4()))
+    monitor.start()
+    usage = monitor.stop()
+
+    assert usage.read_bytes is None
+    assert usage.write_bytes is None
+    assert usage.files is None
+
+
+def test_resource_monitor_threads(file_storage):
+    """
+    Test `ResourceMonitor` with tasks in a `TrackedThreadPoolExecutor`
+    (fake I/O-statistics are shared by all threads).
+    """
+    io = file_storage / str(uuid4())
+    io.parent.mkdir(parents=True, exist_ok=True)
+    io.write_text("rchar: 100\nwchar: 10\n", encoding="utf-8")
+
+    def task():
+        assert ResourceMonitor.current() is monitor
+        io.write_text("rchar: 300\nwchar: 60\n", encoding="utf-8")
+
+    monitor = ResourceMonitor(io)
+    assert ResourceMonitor.current() is None
+    monitor.start()
+    assert ResourceMonitor.current() is monitor
+    with TrackedThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(task).result()
+    usage = monitor.stop()
+
+    # changes are counted for the task and the job-thread
+    assert usage.read_bytes == 400
+    assert usage.write_bytes == 100
+    assert ResourceMonitor.current() is None
+
+    # tasks without monitor
+    with TrackedThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(ResourceMonitor.current).result() is None
+
+
+def test_resource_monitor_not_started():
+    """Test `ResourceMonitor.stop` without `start`."""
+    with pytest.raises(RuntimeError):
+        ResourceMonitor().stop()
+
+
+def test_resource_statistics():
+    """Test `ResourceStatistics`."""
+    statistics = ResourceStatistics()
+    assert statistics.json == {"jobs": 0}
+
+    statistics.add(ResourceUsage(duration=1.0, bytes_=100))
+    statistics.add(ResourceUsage(duration=3.0))
+
+    assert statistics.json == {
+        "jobs": 2,
+        "duration": {"total": 4.0, "mean": 2.0, "max": 3.0},
+        "bytes": {"total": 100, "mean": 100, "max": 100},
+    }
+
+
+def test_resource_statistics_peak():
+    """Test `ResourceStatistics` for process peak values."""
+    statistics = ResourceStatistics()
+    statistics.add(ResourceUsage(max_rss=100))
+    statistics.add(ResourceUsage(max_rss=300))
+
+    assert statistics.json == {"jobs": 2, "maxRss": {"max": 300}}
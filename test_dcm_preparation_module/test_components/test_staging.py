@@ -0,0 +1,110 @@
+"""Test module for the OutputStaging-component."""
+
+from uuid import uuid4
+from time import sleep
+import os
+
+import pytest
+
+from dcm_preparation_module.components import OutputStaging
+
+
+@pytest.fixture(name="staging")
+def _staging(file_storage):
+    return OutputStaging(file_storage / str(uuid4()))
+
+
+def test_create_and_publish(staging):
+    """Test creation and publication of a staging directory."""
+    output, target = staging.create()
+    assert output.is_dir()
+    assert OutputStaging.is_staging(output)
+    assert output.parent == target.parent == staging.root
+    assert not target.exists()
+
+    (output / "file").write_text("data", encoding="utf-8")
+    assert staging.publish(output, target) == target
+    assert not output.exists()
+    assert (target / "file").read_text(encoding="utf-8") == "data"
+    assert not OutputStaging.is_staging(target)
+
+
+def test_create_with_name(staging):
+    """Test creation of a staging directory for a given name."""
+    output, target = staging.create("abc")
+    assert target.name == "abc"
+    assert staging.create("abc") == (output, target)
+
+
+def test_publish_existing_target(staging):
+    """Test publication onto an existing, non-empty target."""
+    output, target = staging.create()
+    (output / "file").touch()
+    target.mkdir()
+    (target / "other-file").touch()
+
+    with pytest.raises(OSError):
+        staging.publish(output, target)
+
+
+def test_discard(staging):
+    """Test removal of a staging directory."""
+    output, _ = staging.create()
+    (output / "file").touch()
+    staging.discard(output)
+    assert not output.exists()
+
+
+def test_discard_and_publish_remove_checkpoint(staging):
+    """Test removal of copy-checkpoint with staging directory."""
+    output, target = staging.create()
+    OutputStaging.checkpoint(output).touch()
+    staging.discard(output)
+    assert not OutputStaging.checkpoint(output).exists()
+
+    output, target = staging.create()
+    OutputStaging.checkpoint(output).touch()
+    staging.publish(output, target)
+    assert not OutputStaging.checkpoint(output).exists()
+
+
+def test_create_and_publish_file(staging):
+    """Test creation and publication of a staging file."""
+    output, target = staging.create_file("abc", ".tar")
+    assert staging.root.is_dir()
+    assert not output.exists()
+    assert OutputStaging.is_staging(output)
+    assert target.name == "abc.tar"
+
+    output.write_bytes(b"data")
+    assert staging.publish(output, target) == target
+    assert not output.exists()
+    assert target.read_bytes() == b"data"
+
+
+def test_publish_file_existing_target(staging):
+    """Test publication of a staging file onto an existing target."""
+    output, target = staging.create_file(suffix=".zip")
+    output.write_bytes(b"data")
+    target.write_bytes(b"other data")
+
+    with pytest.raises(OSError):
+        staging.publish(output, target)
+    assert target.read_bytes() == b"other data"
+
+    staging.discard(output)
+    assert not output.exists()
+
+
+def test_heartbeat(staging):
+    """Test `OutputStaging.heartbeat`."""
+    staging_path, _ = staging.create()
+    os.utime(staging_path, (0, 0))
+
+    with OutputStaging.heartbeat(staging_path, 0.01):
+        sleep(0.1)
+
+    mtime = staging_path.stat().st_mtime
+    assert mtime > 0
+    sleep(0.1)
+    assert staging_path.stat().st_mtime == mtime
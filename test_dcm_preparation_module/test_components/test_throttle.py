@@ -0,0 +1,84 @@
+"""Test module for the TokenBucket- and IOThrottle-components."""
+
+import pytest
+
+from dcm_preparation_module.components import TokenBucket, IOThrottle
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        """Advances clock by `seconds`."""
+        self.now += seconds
+
+
+def test_token_bucket_reserve():
+    """Test `TokenBucket.reserve`."""
+    clock = FakeClock()
+    bucket = TokenBucket(100, clock=clock)
+
+    assert bucket.reserve(100) == 0.0  # initial burst
+    assert bucket.reserve(50) == pytest.approx(0.5)
+    assert bucket.reserve(50) == pytest.approx(1.0)  # queued behind
+    clock.sleep(1.0)
+    assert bucket.reserve(0) == 0.0
+    clock.sleep(10.0)
+    assert bucket.reserve(150) == pytest.approx(0.5)  # capped at burst
+
+
+def test_token_bucket_bad_rate():
+    """Test `TokenBucket` with non-positive rate."""
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_io_throttle_consume():
+    """Test `IOThrottle.consume` with global and job bucket."""
+    clock = FakeClock()
+    global_bucket = TokenBucket(1000, burst=0, clock=clock)
+    throttle = IOThrottle(
+        [global_bucket, TokenBucket(100, burst=0, clock=clock), None],
+        clock=clock,
+        sleep_=clock.sleep,
+    )
+    assert throttle.limit == 100
+
+    for _ in range(10):
+        throttle.consume(50)
+
+    assert clock.now == pytest.approx(5.0)
+    assert throttle.rate == pytest.approx(100)
+    assert throttle.json == {"rate": 100, "limit": 100}
+
+    # the global bucket has been charged as well
+    assert global_bucket.reserve(0) == 0.0
+    assert global_bucket.reserve(1000) == pytest.approx(1.0)
+
+
+def test_io_throttle_unlimited():
+    """Test `IOThrottle` without buckets."""
+    clock = FakeClock()
+    throttle = IOThrottle([None], clock=clock, sleep_=clock.sleep)
+    clock.sleep(2.0)
+    throttle.consume(1000)
+
+    assert clock.now == 2.0
+    assert throttle.limit is None
+    assert throttle.json == {"rate": 500, "limit": None}
+
+
+def test_io_throttle_window():
+    """Test effective rate of `IOThrottle` after idle time."""
+    clock = FakeClock()
+    throttle = IOThrottle([], window=1.0, clock=clock, sleep_=clock.sleep)
+    throttle.consume(1000)
+    clock.sleep(2.0)
+
+    assert throttle.rate == 0.0
@@ -0,0 +1,111 @@
+"""Test module for the FixityVerifier-component."""
+
+from shutil import copytree
+from uuid import uuid4
+
+import pytest
+
+from dcm_preparation_module.components import FixityVerifier
+
+
+@pytest.fixture(name="bag")
+def _bag(fixtures, file_storage):
+    """Returns path to a copy of the test-IP."""
+    bag = file_storage / str(uuid4())
+    copytree(fixtures / "test_ip", bag)
+    return bag
+
+
+def _first_file(bag):
+    return sorted(p for p in (bag / "data").glob("**/*") if p.is_file())[0]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("48776.10", (48776, 10)),
+        (" 1.2 ", (1, 2)),
+        ("1", None),
+        ("a.b", None),
+        (None, None),
+    ],
+)
+def test_parse_oxum(value, expected):
+    """Test `FixityVerifier.parse_oxum`."""
+    assert FixityVerifier.parse_oxum(value) == expected
+
+
+@pytest.mark.parametrize("level", ["oxum", "full"])
+def test_verify(bag, level):
+    """Test `FixityVerifier.verify` for an intact bag."""
+    result = FixityVerifier().verify(bag, level, (48776, 10))
+
+    assert result.success
+    assert result.level == level
+    assert result.payload_oxum == "48776.10"
+    assert result.errors is None
+    if level == "full":
+        assert result.algorithms == ["sha256", "sha512"]
+    else:
+        assert result.algorithms is None
+
+
+@pytest.mark.parametrize("level", ["oxum", "full"])
+def test_verify_truncated(bag, level):
+    """Test `FixityVerifier.verify` for a truncated payload file."""
+    file = _first_file(bag)
+    file.write_bytes(file.read_bytes()[:-1])
+
+    result = FixityVerifier().verify(bag, level, (48776, 10))
+
+    assert not result.success
+    assert "Payload-Oxum mismatch" in result.errors[0]
+
+
+def test_verify_corrupted(bag):
+    """
+    Test `FixityVerifier.verify` for a corrupted payload file of same
+    size.
+    """
+    file = _first_file(bag)
+    data = bytearray(file.read_bytes())
+    data[0] = (data[0] + 1) % 256
+    file.write_bytes(bytes(data))
+
+    assert FixityVerifier().verify(bag, "oxum", (48776, 10)).success
+    result = FixityVerifier().verify(bag, "full", (48776, 10))
+    assert not result.success
+    name = file.relative_to(bag).as_posix()
+    assert result.errors == [
+        f"Bad sha256-checksum for '{name}'.",
+        f"Bad sha512-checksum for '{name}'.",
+    ]
+
+
+def test_verify_missing_and_unlisted(bag):
+    """Test `FixityVerifier.verify` for missing and unlisted files."""
+    file = _first_file(bag)
+    file.rename(file.parent / "renamed")
+
+    result = FixityVerifier().verify(bag, "full", None)
+
+    assert not result.success
+    assert result.errors == [
+        f"Missing payload file '{file.relative_to(bag).as_posix()}'.",
+        "Payload file '"
+        + f"{(file.parent / 'renamed').relative_to(bag).as_posix()}' is "
+        + "not listed.",
+    ]
+
+
+def test_verify_max_errors(bag):
+    """Test `FixityVerifier.verify` with limited number of errors."""
+    for file in (bag / "data").glob("**/*"):
+        if file.is_file():
+            file.write_bytes(b"")
+
+    result = FixityVerifier(max_errors=2).verify(bag, "full", None)
+
+    assert not result.success
+    assert len(result.errors) == 3
+    assert result.errors[-1] == "(18 more errors)"
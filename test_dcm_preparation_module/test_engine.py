@@ -0,0 +1,350 @@
+"""Test module for the `PreparationEngine`."""
+
+from pathlib import Path
+from shutil import copytree, make_archive, unpack_archive
+from time import sleep
+from uuid import uuid4
+
+import pytest
+from bagit_utils import Bag
+from dcm_common import LoggingContext, Logger
+
+from dcm_preparation_module.config import AppConfig
+from dcm_preparation_module.models import (
+    Target,
+    SetOperation,
+    OutputFormat,
+    PreparationConfig,
+    VerificationLevel,
+    Report,
+)
+from dcm_preparation_module.components import (
+    CopyAborted,
+    CopyStatistics,
+    ProcessResult,
+    OverlayResolver,
+    MultiHasher,
+    ProgressPublisher,
+)
+from dcm_preparation_module.engine import PreparationEngine
+
+
+@pytest.fixture(name="engine")
+def _engine():
+    return PreparationEngine(AppConfig)
+
+
+def test_prepare(engine, fixtures, file_storage):
+    """Test `PreparationEngine.prepare` for a directory."""
+    output = file_storage / str(uuid4())
+    outcome = engine.prepare(
+        PreparationConfig(
+            Target(fixtures / "test_ip"),
+            baginfo_operations=[
+                SetOperation(target_field="a", value="value")
+            ],
+            verification=VerificationLevel.OXUM,
+        ),
+        output,
+        token="ip",
+    )
+
+    assert outcome.success
+    assert outcome.result.path == output / "ip"
+    assert outcome.result.baginfo_metadata["a"] == ["value"]
+    assert outcome.statistics.files > 0
+    assert set(outcome.timings) == {
+        "copy",
+        "bagInfoOperations",
+        "tagManifests",
+        "verification",
+    }
+    assert outcome.result.verification.success
+    assert outcome.result.resources.files == outcome.statistics.files
+    assert outcome.result.resources.duration > 0
+    bag = Bag(outcome.result.path)
+    assert bag.validate().valid
+    assert bag.baginfo["a"] == ["value"]
+    assert not list(output.glob(".staging-*"))
+
+
+def test_prepare_archive(engine, fixtures, file_storage):
+    """Test `PreparationEngine.prepare` with archive output format."""
+    outcome = engine.prepare(
+        PreparationConfig(
+            Target(fixtures / "test_ip"), output_format=OutputFormat.ZIP
+        ),
+        file_storage / str(uuid4()),
+    )
+
+    assert outcome.success
+    assert outcome.result.path.is_file()
+    assert "archive" in outcome.timings
+    extracted = outcome.result.path.with_name(str(uuid4()))
+    unpack_archive(outcome.result.path, extracted)
+    assert Bag(
+        extracted / outcome.result.path.name.removesuffix(".zip")
+    ).validate().valid
+
+
+def test_prepare_archive_verification(fixtures, file_storage):
+    """
+    Test `PreparationEngine.prepare` with archive output format and
+    configured fixity verification.
+    """
+
+    class VerificationConfig(AppConfig):
+        VERIFICATION_LEVEL = "oxum"
+
+    outcome = PreparationEngine(VerificationConfig).prepare(
+        PreparationConfig(
+            Target(fixtures / "test_ip"), output_format=OutputFormat.TAR
+        ),
+        file_storage / str(uuid4()),
+    )
+
+    assert outcome.success
+    assert outcome.result.verification is None
+    assert any(
+        "not supported" in msg["body"]
+        for msg in outcome.log.json["WARNING"]
+    )
+
+
+def test_prepare_overlay(engine, fixtures, file_storage):
+    """Test `PreparationEngine.prepare` with tag-overlay output format."""
+    outcome = engine.prepare(
+        PreparationConfig(
+            Target(fixtures / "test_ip"),
+            baginfo_operations=[
+                SetOperation(target_field="a", value="value")
+            ],
+            output_format=OutputFormat.OVERLAY,
+        ),
+        file_storage / str(uuid4()),
+    )
+
+    assert outcome.success
+    assert not (outcome.result.path / "data").exists()
+    assert OverlayResolver.is_overlay(outcome.result.path)
+
+    bag = file_storage / str(uuid4())
+    OverlayResolver().resolve(outcome.result.path, bag)
+    assert Bag(bag).validate().valid
+    assert Bag(bag).baginfo["a"] == ["value"]
+
+
+def test_prepare_overlay_archive_target(engine, fixtures, file_storage):
+    """
+    Test `PreparationEngine.prepare` with tag-overlay output format for
+    an archive-target.
+    """
+    archive = Path(
+        make_archive(
+            str(file_storage / str(uuid4())),
+            "zip",
+            root_dir=fixtures / "test_ip",
+        )
+    )
+    outcome = engine.prepare(
+        PreparationConfig(
+            Target(archive), output_format=OutputFormat.OVERLAY
+        ),
+        file_storage / str(uuid4()),
+    )
+
+    assert not outcome.success
+    assert outcome.result.path is None
+
+
+def test_prepare_strategies(fixtures, file_storage):
+    """Test `PreparationEngine.prepare` with custom strategies."""
+    copied = []
+    hashed = []
+
+    def copy_strategy(src, dst, on_progress, cancelled):
+        copied.append(src)
+        copytree(src, dst, dirs_exist_ok=True)
+        statistics = CopyStatistics(files=1)
+        on_progress(statistics)
+        return statistics
+
+    def hash_strategy(content, algorithms):
+        hashed.append(content)
+        return MultiHasher().hash(content, algorithms)
+
+    outcome = PreparationEngine(
+        AppConfig, copy_strategy=copy_strategy, hash_strategy=hash_strategy
+    ).prepare(
+        PreparationConfig(Target(fixtures / "test_ip")),
+        file_storage / str(uuid4()),
+    )
+
+    assert outcome.success
+    assert copied == [fixtures / "test_ip"]
+    assert outcome.statistics.files == 1
+    assert len(hashed) == len(set(hashed))
+    assert "bag-info.txt" in [p.name for p in hashed]
+    assert Bag(outcome.result.path).validate().valid
+
+
+def test_prepare_cancelled(engine, fixtures, file_storage):
+    """Test `PreparationEngine.prepare` with cancellation."""
+    output = file_storage / str(uuid4())
+    outcome = engine.prepare(
+        PreparationConfig(Target(fixtures / "test_ip")),
+        output,
+        cancelled=lambda: True,
+    )
+
+    assert not outcome.success
+    assert outcome.result.path is None
+    assert "ERROR" in outcome.log.json
+    assert not list(output.glob("*"))
+
+
+@pytest.mark.parametrize(
+    ("error", "cancelled", "kept"),
+    [
+        (KeyboardInterrupt, False, True),
+        (KeyboardInterrupt, True, False),
+        (RuntimeError, False, False),
+    ],
+)
+def test_prepare_interrupted(fixtures, file_storage, error, cancelled, kept):
+    """
+    Test that `PreparationEngine.prepare` keeps the staging directory
+    of interrupted jobs for resumption but not of failed or cancelled
+    jobs.
+    """
+
+    def copy_strategy(src, dst, on_progress, cancelled):
+        copytree(src, dst, dirs_exist_ok=True)
+        raise error()
+
+    output = file_storage / str(uuid4())
+    with pytest.raises(error):
+        PreparationEngine(AppConfig, copy_strategy=copy_strategy).prepare(
+            PreparationConfig(Target(fixtures / "test_ip")),
+            output,
+            token="ip",
+            cancelled=lambda: cancelled,
+        )
+
+    assert (output / ".staging-ip").is_dir() is kept
+
+
+def test_prepare_failed_stage_aborts_copy(fixtures, file_storage):
+    """
+    Test `PreparationEngine.prepare` with a metadata-stage that fails
+    while the copy is running.
+    """
+
+    class FailingOperator:
+        """Operator that always fails."""
+
+        def process(self, source_metadata, operations):
+            """Returns result with error."""
+            log = Logger()
+            log.log(LoggingContext.ERROR, body="Operation failed.")
+            return ProcessResult(source_metadata, log)
+
+    def copy_strategy(src, dst, on_progress, cancelled):
+        for _ in range(1000):
+            if cancelled():
+                raise CopyAborted()
+            sleep(0.01)
+        return CopyStatistics()
+
+    output = file_storage / str(uuid4())
+    outcome = PreparationEngine(
+        AppConfig,
+        metadata_operator=FailingOperator(),
+        copy_strategy=copy_strategy,
+    ).prepare(
+        PreparationConfig(
+            Target(fixtures / "test_ip"),
+            baginfo_operations=[
+                SetOperation(target_field="a", value="value")
+            ],
+        ),
+        output,
+    )
+
+    assert not outcome.success
+    assert outcome.statistics is None
+    assert outcome.timings["copy"] < 5
+    assert any(
+        "failed during stage 'bagInfoOperations'" in msg["body"]
+        for msg in outcome.log.json["ERROR"]
+    )
+    assert not list(output.glob("*"))
+
+
+@pytest.mark.parametrize(
+    ("verification", "success"),
+    [
+        (VerificationLevel.NONE, True),
+        (VerificationLevel.OXUM, False),
+        (VerificationLevel.FULL, False),
+    ],
+)
+def test_prepare_verification(
+    fixtures, file_storage, verification, success
+):
+    """Test `PreparationEngine.prepare` with incomplete copy."""
+
+    def copy_strategy(src, dst, on_progress, cancelled):
+        copytree(src, dst, dirs_exist_ok=True)
+        file = sorted(p for p in (dst / "data").glob("**/*") if p.is_file())[0]
+        file.write_bytes(file.read_bytes()[:-1])
+        return CopyStatistics()
+
+    outcome = PreparationEngine(
+        AppConfig, copy_strategy=copy_strategy
+    ).prepare(
+        PreparationConfig(
+            Target(fixtures / "test_ip"), verification=verification
+        ),
+        file_storage / str(uuid4()),
+    )
+
+    assert outcome.success is success
+    if verification is VerificationLevel.NONE:
+        assert outcome.result.verification is None
+    else:
+        assert outcome.result.verification.level == verification.value
+        assert not outcome.result.verification.success
+        assert "Payload-Oxum mismatch" in (
+            outcome.result.verification.errors[0]
+        )
+
+
+def test_prepare_throttled(fixtures, file_storage):
+    """Test `PreparationEngine.prepare` with I/O-limit per job."""
+
+    class ThrottledConfig(AppConfig):
+        IO_RATE_LIMIT_JOB = 20000
+
+    assert PreparationEngine(AppConfig).throttle() is None
+    engine = PreparationEngine(ThrottledConfig)
+    assert engine.throttle().limit == 20000
+
+    messages = []
+    progress = ProgressPublisher(None, Report(host=""), interval=0)
+    progress.subscribe(messages.append)
+    outcome = engine.prepare(
+        PreparationConfig(Target(fixtures / "test_ip")),
+        file_storage / str(uuid4()),
+        progress=progress,
+    )
+
+    assert outcome.success
+    # payload of ~48kB with a burst of 20kB
+    assert outcome.timings["copy"] > 1
+    throttle = [
+        m["data"]["throttle"] for m in messages if "throttle" in m["data"]
+    ]
+    assert throttle
+    assert all(t["limit"] == 20000 for t in throttle)
+    assert throttle[-1]["rate"] > 0
@@ -2,6 +2,10 @@
 Test module for the `dcm_preparation_module/handlers.py`.
 """
 
+from pathlib import Path
+from shutil import make_archive
+from uuid import uuid4
+
 import pytest
 from data_plumber_http.settings import Responses
 
@@ -659,6 +663,24 @@ def _preparation_handler(fixtures):
                 },
                 Responses.GOOD.status,
             ),
+            (  # verification
+                {
+                    "preparation": {
+                        "target": {"path": "test_ip"},
+                        "verification": "full",
+                    },
+                },
+                Responses.GOOD.status,
+            ),
+            (
+                {
+                    "preparation": {
+                        "target": {"path": "test_ip"},
+                        "verification": "unknown",
+                    },
+                },
+                422,
+            ),
             (  # token
                 {
                     "preparation": {
@@ -704,3 +726,34 @@ def test_preparation_handler(preparation_handler, json, status, fixtures):
             fixtures
             not in output.data.value["preparation"].target.path.parents
         )
+
+
+@pytest.mark.parametrize("format_", ["zip", "tar"])
+def test_preparation_handler_archive_target(fixtures, file_storage, format_):
+    "Test `get_preparation_handler` for archive-targets."
+    archive = Path(
+        make_archive(
+            str(file_storage / str(uuid4())),
+            format_,
+            root_dir=fixtures / "test_ip",
+        )
+    )
+
+    output = handlers.get_preparation_handler(file_storage).run(
+        json={"preparation": {"target": {"path": archive.name}}}
+    )
+
+    assert output.last_status == Responses.GOOD.status
+    assert output.data.value["preparation"].target.path == Path(archive.name)
+
+
+def test_preparation_handler_file_target(file_storage):
+    "Test `get_preparation_handler` for target that is no archive."
+    file = file_storage / str(uuid4())
+    file.write_text("data", encoding="utf-8")
+
+    output = handlers.get_preparation_handler(file_storage).run(
+        json={"preparation": {"target": {"path": file.name}}}
+    )
+
+    assert output.last_status == Responses().BAD_VALUE.status
@@ -0,0 +1,140 @@
+"""
+Test module for the import-time of the package `dcm_preparation_module`.
+"""
+
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from dcm_preparation_module.config import AppConfig, load_api_document
+
+
+# modules that are expensive to import and should only be loaded when
+# needed (absolute import times are tracked by the benchmark suite, see
+# `benchmarks.run.benchmark_import`)
+HEAVY_MODULES = (
+    "flask",
+    "lxml",
+    "yaml",
+    "bagit_utils",
+    "dcm_preparation_module.handlers",
+    "dcm_preparation_module.views",
+    "dcm_preparation_module.engine",
+)
+
+
+@pytest.fixture(name="api_cache")
+def _api_cache(tmp_path):
+    return tmp_path / "cache" / "openapi.json"
+
+
+def _imported_in_subprocess(
+    statement: str, cache: Path, setup: str = ""
+) -> list[str]:
+    """
+    Runs `setup` and `statement` in a fresh interpreter (using `cache`
+    as API-document cache) and returns the `HEAVY_MODULES` that have
+    been loaded by `statement`.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, json\n"
+            + f"{setup}\n"
+            + "before = set(sys.modules)\n"
+            + f"{statement}\n"
+            + "print(json.dumps([\n"
+            + f"    m for m in {HEAVY_MODULES!r}\n"
+            + "    if m in sys.modules and m not in before\n"
+            + "]))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=os.environ
+        | {
+            "API_DOCUMENT_CACHE": str(cache),
+            "FS_MOUNT_POINT": str(cache.parent.parent),
+            "ORCHESTRA_AT_STARTUP": "0",
+        },
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_package(api_cache):
+    """Test that importing the package does not load heavy modules."""
+    assert (
+        _imported_in_subprocess("import dcm_preparation_module", api_cache)
+        == []
+    )
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import dcm_preparation_module.config",
+        "import dcm_preparation_module.views",
+    ],
+)
+def test_import_defers_heavy_modules(statement, api_cache):
+    """Test that heavy dependencies are not imported eagerly."""
+    modules = _imported_in_subprocess(statement, api_cache)
+    assert "lxml" not in modules
+    assert "bagit_utils" not in modules
+
+
+def test_app_factory_cached_api_document(api_cache):
+    """
+    Test that the API-document is loaded from the pre-parsed cache
+    (populated by `app_factory`) without parsing the YAML-document.
+    """
+    setup = (
+        "from dcm_preparation_module import app_factory\n"
+        + "from dcm_preparation_module.config import AppConfig"
+    )
+    # populate cache
+    _imported_in_subprocess("app_factory(AppConfig())", api_cache, setup)
+    assert api_cache.is_file()
+    cached = api_cache.stat().st_mtime_ns
+
+    assert _imported_in_subprocess("AppConfig.API", api_cache, setup) == []
+    assert api_cache.stat().st_mtime_ns == cached
+
+
+def test_load_api_document_cache(api_cache):
+    """Test pre-parsed cache of `load_api_document`."""
+    document = load_api_document.__wrapped__(AppConfig.API_DOCUMENT, api_cache)
+
+    assert api_cache.is_file()
+    assert api_cache.stat().st_mode & 0o077 == 0
+    assert api_cache.parent.stat().st_mode & 0o077 == 0
+    assert (
+        load_api_document.__wrapped__(AppConfig.API_DOCUMENT, api_cache)
+        == document
+    )
+    assert AppConfig.API == document
+    assert AppConfig().API["info"]["version"] == document["info"]["version"]
+
+
+def test_load_api_document_untrusted_cache(api_cache):
+    """Test that `load_api_document` ignores caches writable by others."""
+    document = load_api_document.__wrapped__(AppConfig.API_DOCUMENT, api_cache)
+    cached = json.loads(api_cache.read_text(encoding="utf-8"))
+    api_cache.write_text(
+        json.dumps({"key": cached["key"], "document": {}}), encoding="utf-8"
+    )
+
+    assert (
+        load_api_document.__wrapped__(AppConfig.API_DOCUMENT, api_cache)
+        == {}
+    )
+    api_cache.chmod(0o666)
+    assert (
+        load_api_document.__wrapped__(AppConfig.API_DOCUMENT, api_cache)
+        == document
+    )
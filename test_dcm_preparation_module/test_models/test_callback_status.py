@@ -0,0 +1,14 @@
+"""Test module for the `CallbackStatus` data model."""
+
+from dcm_common.models.data_model import get_model_serialization_test
+
+from dcm_preparation_module.models import CallbackStatus
+
+
+test_callback_status_json = get_model_serialization_test(
+    CallbackStatus, (
+        (("https://host/callback",), {}),
+        (("https://host/callback", "delivered", 1), {}),
+        (("https://host/callback", "failed", 4, "error message"), {}),
+    )
+)
@@ -5,6 +5,8 @@ from dcm_common.models.data_model import get_model_serialization_test
 from dcm_preparation_module.models import (
     Target,
     PreparationConfig,
+    OutputFormat,
+    VerificationLevel,
     ComplementOperation,
     OverwriteExistingOperation,
     FindAndReplaceOperation,
@@ -17,6 +19,18 @@ test_preparation_config_json = get_model_serialization_test(
         ((), {"target": Target(".")}),
         ((), {"target": Target("."), "baginfo_operations": []}),
         ((), {"target": Target("."), "sig_prop_operations": []}),
+        ((), {"target": Target("."), "output_format": OutputFormat.TAR}),
+        (
+            (),
+            {"target": Target("."), "output_format": OutputFormat.OVERLAY},
+        ),
+        (
+            (),
+            {
+                "target": Target("."),
+                "verification": VerificationLevel.FULL,
+            },
+        ),
         (
             (),
             {
@@ -4,7 +4,12 @@ from pathlib import Path
 
 from dcm_common.models.data_model import get_model_serialization_test
 
-from dcm_preparation_module.models import PreparationResult
+from dcm_preparation_module.models import (
+    PreparationResult,
+    CallbackStatus,
+    VerificationResult,
+    ResourceUsage,
+)
 
 test_build_result_json = get_model_serialization_test(
     PreparationResult, (
@@ -14,5 +19,8 @@ test_build_result_json = get_model_serialization_test(
         ((Path("."), True), {}),
         ((Path("."), True, {"d": ["1", "2"]}), {}),
         ((), {"success": True, "baginfo_metadata": {"d": ["1", "2"]},}),
+        ((), {"callback": CallbackStatus("https://host/callback")}),
+        ((), {"verification": VerificationResult("oxum", True, "1.1")}),
+        ((), {"resources": ResourceUsage(duration=1.0, files=1)}),
     )
 )
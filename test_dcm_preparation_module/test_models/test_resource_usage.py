@@ -0,0 +1,23 @@
+"""Test module for the `ResourceUsage` data model."""
+
+from dcm_common.models.data_model import get_model_serialization_test
+
+from dcm_preparation_module.models import ResourceUsage
+
+
+test_resource_usage_json = get_model_serialization_test(
+    ResourceUsage, (
+        ((), {}),
+        ((1.0,), {}),
+        ((1.0, 0.5, 0.1, 1024, 2048, 4096, 2, 100), {}),
+        ((), {"read_bytes": 1, "bytes_": 1}),
+        ((), {"duration": 1.0, "files": 1}),
+    )
+)
+
+
+def test_resource_usage_from_json_null():
+    """Test deserialization of `ResourceUsage` with null-values."""
+    assert ResourceUsage.from_json(
+        {"duration": None, "cpuUser": None, "files": None, "bytes": None}
+    ) == ResourceUsage()
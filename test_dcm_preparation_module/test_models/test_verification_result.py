@@ -0,0 +1,15 @@
+"""Test module for the `VerificationResult` data model."""
+
+from dcm_common.models.data_model import get_model_serialization_test
+
+from dcm_preparation_module.models import VerificationResult
+
+
+test_verification_result_json = get_model_serialization_test(
+    VerificationResult, (
+        (("oxum", True), {}),
+        (("oxum", True, "1.1"), {}),
+        (("full", True, "1.1", ["sha256", "sha512"]), {}),
+        (("full", False, "1.1", ["sha256"], ["Bad checksum."]), {}),
+    )
+)
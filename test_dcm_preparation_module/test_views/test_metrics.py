@@ -0,0 +1,45 @@
+"""Test-module for metrics-endpoint."""
+
+from dcm_preparation_module import app_factory
+
+
+def test_metrics(testing_config):
+    """Test metrics after running a job."""
+
+    app = app_factory(testing_config())
+    client = app.test_client()
+
+    response = client.post(
+        "/prepare",
+        json={
+            "preparation": {
+                "target": {"path": "test_ip"},
+                "bagInfoOperations": [
+                    {
+                        "type": "findAndReplace",
+                        "targetField": "Source-Organization",
+                        "items": [{"regex": r".*", "value": "value"}],
+                    }
+                ],
+            }
+        },
+    )
+    assert response.status_code == 201
+
+    # wait until job is completed
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    metrics = response.text
+    assert "dcm_preparation_jobs_submitted_total 1" in metrics
+    assert "dcm_preparation_jobs_started_total 1" in metrics
+    assert "dcm_preparation_jobs_succeeded_total 1" in metrics
+    assert "dcm_preparation_jobs_failed_total 0" in metrics
+    assert "dcm_preparation_queue_depth 0" in metrics
+    assert 'dcm_preparation_stage_duration_seconds_count{stage="copy"} 1' in (
+        metrics
+    )
+    assert "dcm_preparation_regex_evaluation_seconds_count 1" in metrics
+    assert "dcm_preparation_copied_bytes_total 0" not in metrics
@@ -1,12 +1,15 @@
 """Test-module for preparation-endpoint."""
 
-from shutil import copytree
+from pathlib import Path
+from shutil import copytree, make_archive, unpack_archive
 from uuid import uuid4
 
 import pytest
+from flask import Flask
 from bagit_utils import Bag
 
 from dcm_preparation_module import app_factory
+from dcm_preparation_module.views import PreparationView
 
 
 @pytest.fixture(name="minimal_request_body")
@@ -44,6 +47,12 @@ def test_prepare_minimal(
     assert Bag(
         testing_config.FS_MOUNT_POINT / json["data"]["path"]
     ).validate_format().valid
+    # no staging directories left behind
+    assert not list(
+        (
+            testing_config.FS_MOUNT_POINT / testing_config.PREPARED_IP_OUTPUT
+        ).glob(".staging-*")
+    )
 
 
 # details of bagInfoOperations are tested in component-tests, here we
@@ -352,3 +361,266 @@ def test_prepare_with_sig_prop_missing_file(
         / json["data"]["path"]
         / "tagmanifest-sha256.txt"
     ).read_text(encoding="utf-8")
+
+
+def test_prepare_with_object_store(testing_config, minimal_request_body):
+    """
+    Test /prepare-POST endpoint with content-addressed object store
+    (repeated preparation links payload files).
+    """
+
+    class StoreConfig(testing_config):
+        PREPARED_IP_STORE = testing_config.PREPARED_IP_OUTPUT.with_name(
+            str(uuid4())
+        )
+
+    app = app_factory(StoreConfig())
+    client = app.test_client()
+
+    tokens = []
+    for _ in range(2):
+        tokens.append(
+            client.post("/prepare", json=minimal_request_body).json["value"]
+        )
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+    reports = [client.get(f"/report?token={t}").json for t in tokens]
+
+    assert all(report["data"]["success"] for report in reports)
+    ips = [
+        StoreConfig.FS_MOUNT_POINT / report["data"]["path"]
+        for report in reports
+    ]
+    for path in (ips[0] / "data").glob("**/*"):
+        if path.is_file():
+            assert (
+                path.stat().st_ino
+                == (ips[1] / path.relative_to(ips[0])).stat().st_ino
+            )
+    assert (
+        "dcm_preparation_linked_files_total 0\n"
+        not in client.get("/metrics").text
+    )
+
+
+def test_prepare_admission_rejected(testing_config, minimal_request_body):
+    """
+    Test /prepare-POST endpoint for insufficient space in the output
+    directory.
+    """
+
+    class AdmissionConfig(testing_config):
+        ADMISSION_CONTROL = True
+        ADMISSION_MIN_FREE_SPACE = 2**62
+        ADMISSION_RETRY_AFTER = 10
+
+    app = app_factory(AdmissionConfig())
+    client = app.test_client()
+
+    response = client.post("/prepare", json=minimal_request_body)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "10"
+    assert (
+        "dcm_preparation_jobs_rejected_total 1"
+        in client.get("/metrics").text
+    )
+
+
+@pytest.mark.parametrize(
+    ("threshold", "lane"),
+    [(0, "small"), (1024**3, "small"), (1, "large")],
+    ids=["disabled", "small", "large"],
+)
+def test_prepare_lanes(testing_config, minimal_request_body, threshold, lane):
+    """Test lane-selection of /prepare-POST endpoint."""
+
+    class LaneConfig(testing_config):
+        PREPARATION_LANES = ["small", "large"]
+        PREPARATION_LANE_THRESHOLD = threshold
+
+    app = app_factory(LaneConfig())
+    client = app.test_client()
+
+    token = client.post("/prepare", json=minimal_request_body).json["value"]
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+
+    assert client.get(f"/report?token={token}").json["data"]["success"]
+    assert (
+        f'dcm_preparation_lane_submissions_total{{lane="{lane}"}} 1'
+        in client.get("/metrics").text
+    )
+
+
+def test_prepare_unknown_lane(testing_config):
+    """Test app-creation with unknown lane."""
+
+    class LaneConfig(testing_config):
+        PREPARATION_LANES = ["medium"]
+
+    with pytest.raises(ValueError):
+        app_factory(LaneConfig())
+
+
+def test_prepare_output_roots(testing_config, minimal_request_body):
+    """Test /prepare-POST endpoint with multiple output roots."""
+
+    class RootsConfig(testing_config):
+        PREPARED_IP_OUTPUT_ROOTS = [Path(str(uuid4())), Path(str(uuid4()))]
+
+    app = app_factory(RootsConfig())
+    client = app.test_client()
+
+    token = client.post("/prepare", json=minimal_request_body).json["value"]
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+    json = client.get(f"/report?token={token}").json
+
+    assert json["data"]["success"]
+    assert Path(json["data"]["path"]).parent in (
+        RootsConfig.PREPARED_IP_OUTPUT_ROOTS
+    )
+    assert (RootsConfig.FS_MOUNT_POINT / json["data"]["path"]).is_dir()
+
+
+@pytest.mark.parametrize("output_format", ["tar", "zip"])
+def test_prepare_archive(testing_config, minimal_request_body, output_format):
+    """Test /prepare-POST endpoint with archive output format."""
+
+    app = app_factory(testing_config())
+    client = app.test_client()
+
+    minimal_request_body["preparation"]["outputFormat"] = output_format
+    minimal_request_body["preparation"]["bagInfoOperations"] = [
+        {"type": "set", "targetField": "a", "value": "value"}
+    ]
+    token = client.post("/prepare", json=minimal_request_body).json["value"]
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+    json = client.get(f"/report?token={token}").json
+
+    assert json["data"]["success"]
+    assert json["data"]["bagInfoMetadata"]["a"] == ["value"]
+    archive = testing_config.FS_MOUNT_POINT / json["data"]["path"]
+    assert archive.is_file()
+    assert archive.name == f"{token}.{output_format}"
+
+    # archive contains valid bag with updated metadata and tag-manifests
+    extracted = archive.with_name(str(uuid4()))
+    unpack_archive(archive, extracted)
+    bag = Bag(extracted / token)
+    assert bag.validate().valid
+    assert bag.baginfo["a"] == ["value"]
+    # no staging files left behind
+    assert not list(archive.parent.glob(".staging-*"))
+
+
+@pytest.mark.parametrize("output_format", ["tar", "zip", "overlay"])
+def test_prepare_verification_unsupported(
+    testing_config, minimal_request_body, output_format
+):
+    """
+    Test /prepare-POST endpoint with fixity verification for an output
+    format that does not support it.
+    """
+
+    app = app_factory(testing_config())
+    client = app.test_client()
+
+    minimal_request_body["preparation"]["outputFormat"] = output_format
+    minimal_request_body["preparation"]["verification"] = "oxum"
+    response = client.post("/prepare", json=minimal_request_body)
+    assert response.status_code == 422
+    assert "not supported" in response.text
+
+
+@pytest.mark.parametrize("output_format", ["directory", "tar"])
+def test_prepare_archive_target(
+    testing_config, fixtures, minimal_request_body, output_format
+):
+    """Test /prepare-POST endpoint with archive-target."""
+
+    archive = Path(
+        make_archive(
+            str(testing_config.FS_MOUNT_POINT / str(uuid4())),
+            "zip",
+            root_dir=fixtures,
+            base_dir="test_ip",
+        )
+    )
+
+    app = app_factory(testing_config())
+    client = app.test_client()
+
+    minimal_request_body["preparation"]["target"]["path"] = archive.name
+    minimal_request_body["preparation"]["outputFormat"] = output_format
+    minimal_request_body["preparation"]["bagInfoOperations"] = [
+        {"type": "set", "targetField": "a", "value": "value"}
+    ]
+    token = client.post("/prepare", json=minimal_request_body).json["value"]
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+    json = client.get(f"/report?token={token}").json
+
+    assert json["data"]["success"]
+    output = testing_config.FS_MOUNT_POINT / json["data"]["path"]
+    if output_format == "tar":
+        extracted = output.with_name(str(uuid4()))
+        unpack_archive(output, extracted)
+        output = extracted / token
+    bag = Bag(output)
+    assert bag.validate().valid
+    assert bag.baginfo["a"] == ["value"]
+
+
+def test_prepare_callback_non_blocking(testing_config, minimal_request_body):
+    """
+    Test /prepare-POST endpoint with a callback that cannot be
+    delivered (the job is completed without waiting for the delivery).
+    """
+
+    class CallbackConfig(testing_config):
+        CALLBACK_WORKERS = 1
+        CALLBACK_MAX_RETRIES = 3
+        CALLBACK_BACKOFF = 60.0
+
+    app = app_factory(CallbackConfig())
+    client = app.test_client()
+
+    minimal_request_body["callbackUrl"] = "http://localhost:1/callback"
+    token = client.post("/prepare", json=minimal_request_body).json["value"]
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+    json = client.get(f"/report?token={token}").json
+
+    assert json["data"]["success"]
+    assert json["data"]["callback"]["url"] == minimal_request_body[
+        "callbackUrl"
+    ]
+    assert json["data"]["callback"]["status"] == "pending"
+
+
+def test_progress_stream_limits(testing_config):
+    """
+    Test limits for the number and lifetime of streams of the
+    /progress-GET endpoint.
+    """
+
+    class StreamConfig(testing_config):
+        PROGRESS_MAX_STREAMS = 1
+        PROGRESS_STREAM_MAX_DURATION = 0.1
+
+    view = PreparationView(StreamConfig())
+    app = Flask(__name__)
+    app.register_blueprint(view.get_blueprint(), url_prefix="/")
+    client = app.test_client()
+    view.progress_broker.open("token")
+
+    # unknown job does not occupy a stream
+    assert client.get("/progress?token=unknown").status_code == 404
+
+    stream = client.get("/progress?token=token", buffered=False)
+    assert stream.status_code == 200
+    response = client.get("/progress?token=token")
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+    # closing the stream releases it
+    stream.close()
+    response = client.get("/progress?token=token")
+    assert response.status_code == 200
+    assert "event: timeout" in response.text
@@ -0,0 +1,35 @@
+"""Test-module for statistics-endpoint."""
+
+from dcm_preparation_module import app_factory
+
+
+def test_statistics(testing_config):
+    """Test statistics after running a job."""
+
+    app = app_factory(testing_config())
+    client = app.test_client()
+
+    response = client.get("/statistics")
+    assert response.status_code == 200
+    assert response.json == {"jobs": 0}
+
+    response = client.post(
+        "/prepare", json={"preparation": {"target": {"path": "test_ip"}}}
+    )
+    assert response.status_code == 201
+    token = response.json["value"]
+
+    # wait until job is completed
+    app.extensions["orchestra"].stop(stop_on_idle=True)
+
+    report = client.get(f"/report?token={token}").json
+    assert report["data"]["resources"]["files"] > 0
+
+    response = client.get("/statistics")
+    assert response.status_code == 200
+    statistics = response.json
+    assert statistics["jobs"] == 1
+    assert statistics["files"]["total"] == (
+        report["data"]["resources"]["files"]
+    )
+    assert statistics["duration"]["max"] > 0